@@ -0,0 +1,96 @@
+# Import necessary libraries
+import threading  # For sharing one scaler between inference workers
+
+
+# Define a controller that picks the detection resolution from measured latency
+class AdaptiveScaler:
+    def __init__(self, initial_scale=0.25, min_scale=0.15, max_scale=1.0, target_latency=0.08,
+                 min_face_pixels=40, expected_face_size=160, smoothing=0.2, step=1.15):
+        """
+        Initialize the AdaptiveScaler class.
+
+        Parameters:
+        initial_scale (float): Detection scale used for the first frame.
+        min_scale (float): Smallest scale ever used.
+        max_scale (float): Largest scale ever used.
+        target_latency (float): Detection time per frame (seconds) the scaler aims for.
+        min_face_pixels (int): Smallest face height the detector finds reliably, in
+                               detection-image pixels. The scale never shrinks faces below it.
+        expected_face_size (int): Face height in full-frame pixels assumed until faces are seen.
+        smoothing (float): Weight of the newest measurement in the moving averages.
+        step (float): Multiplicative change applied per adjustment.
+        """
+        self.scale = initial_scale
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.target_latency = target_latency
+        self.min_face_pixels = min_face_pixels
+        self.face_size = float(expected_face_size)  # Moving average of the smallest face seen
+        self.smoothing = smoothing
+        self.step = step
+        self.latency = None  # Moving average of the detection latency
+        self._lock = threading.Lock()
+
+    def update(self, latency, face_heights=()):
+        """
+        Feed the measured detection time and face sizes of a frame back into the scaler.
+
+        Parameters:
+        latency (float): Seconds spent detecting faces on the full frame, or None when
+                         detection only ran on small regions and says nothing about full-frame cost.
+        face_heights (sequence): Heights of the detected faces in full-frame pixels.
+        """
+        with self._lock:
+            a = self.smoothing
+            if face_heights:
+                self.face_size = (1 - a) * self.face_size + a * min(face_heights)
+
+            scale = self.scale
+            if latency is not None:
+                self.latency = latency if self.latency is None else (1 - a) * self.latency + a * latency
+                if self.latency > 1.2 * self.target_latency:
+                    scale /= self.step  # Too slow: detect on a smaller image
+                elif self.latency < 0.6 * self.target_latency:
+                    scale *= self.step  # Headroom left: detect on a larger image
+
+            # Never shrink the expected face below what the detector can find
+            floor = max(self.min_scale, self.min_face_pixels / max(self.face_size, 1.0))
+            self.scale = min(self.max_scale, max(floor, scale))
+
+
+def face_regions(locations, frame_shape, margin=0.75):
+    """
+    Build detection regions around recently seen faces, merging overlapping ones.
+
+    Parameters:
+    locations (list): (top, right, bottom, left) face boxes in full-frame pixels.
+    frame_shape (tuple): Shape of the full frame (height, width, ...).
+    margin (float): Padding added on every side, as a fraction of the face size,
+                    so a moving face stays inside its region.
+
+    Returns:
+    list: (top, right, bottom, left) regions clipped to the frame.
+    """
+    height, width = frame_shape[:2]
+    regions = []
+    for top, right, bottom, left in locations:
+        pad_y = int((bottom - top) * margin)
+        pad_x = int((right - left) * margin)
+        regions.append([max(0, top - pad_y), min(width, right + pad_x),
+                        min(height, bottom + pad_y), max(0, left - pad_x)])
+
+    # Merge overlapping regions so no face is detected twice
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(regions)):
+            for j in range(i + 1, len(regions)):
+                a, b = regions[i], regions[j]
+                if a[3] < b[1] and b[3] < a[1] and a[0] < b[2] and b[0] < a[2]:
+                    regions[i] = [min(a[0], b[0]), max(a[1], b[1]), max(a[2], b[2]), min(a[3], b[3])]
+                    del regions[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return [tuple(region) for region in regions]
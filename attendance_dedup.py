@@ -0,0 +1,63 @@
+# Import necessary libraries
+import threading  # mark_attendance may be called from several inference workers
+from datetime import datetime  # For the date the cache starts on
+
+
+# Define a per-day set of people already marked present
+class DailyAttendanceCache:
+    def __init__(self, store):
+        """
+        Initialize the DailyAttendanceCache class.
+
+        Parameters:
+        store (AttendanceStore): Store the cache is warmed from, now and when the date changes.
+        """
+        self.store = store
+        self.date = None  # Date the cached names belong to
+        self.names = set()  # People already marked present on that date
+        self._lock = threading.Lock()
+        self._roll_over(self.today())  # Warm from the store so restarts know who is already present
+
+    @staticmethod
+    def today():
+        """str: Current date (YYYY-MM-DD)."""
+        return datetime.now().strftime('%Y-%m-%d')
+
+    def _roll_over(self, date):
+        """
+        Switch the cache to a new date, loading who is already present from the store.
+        """
+        self.date = date
+        self.names = set(self.store.names_on(date))
+
+    def present_today(self):
+        """
+        Return the names marked present today, rolling the cache over after midnight.
+
+        Returns:
+        set: Copy of today's names.
+        """
+        with self._lock:
+            date = self.today()
+            if date != self.date:
+                self._roll_over(date)
+            return set(self.names)
+
+    def add(self, name, date):
+        """
+        Record a person as present, reporting whether this is their first record of the day.
+
+        Parameters:
+        name (str): Name of the recognized person.
+        date (str): Current date (YYYY-MM-DD); a new date rolls the cache over.
+
+        Returns:
+        bool: True if the person had not been marked present on this date yet.
+        """
+        with self._lock:
+            if date != self.date:
+                self._roll_over(date)
+            if name in self.names:
+                return False
+            self.names.add(name)
+            return True
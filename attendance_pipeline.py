@@ -0,0 +1,182 @@
+# Import necessary libraries
+import threading  # For the capture and inference worker threads
+import time  # For timestamps and throughput statistics
+from collections import deque  # Bounded buffer used by the frame queues
+
+
+# Define a bounded queue that drops the oldest item instead of blocking the producer
+class LatestFrameQueue:
+    def __init__(self, maxsize=1):
+        """
+        Initialize the LatestFrameQueue class.
+
+        Parameters:
+        maxsize (int): Number of items kept. With 1 only the newest frame is ever consumed.
+        """
+        self._items = deque(maxlen=max(1, maxsize))
+        self._condition = threading.Condition()
+        self._closed = False
+        self.dropped = 0  # Frames discarded because the consumer fell behind
+
+    def put(self, item):
+        """
+        Add an item, discarding the oldest one when the queue is full.
+        """
+        with self._condition:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Remove and return the oldest queued item.
+
+        Parameters:
+        timeout (float): Seconds to wait for an item. None waits forever.
+
+        Returns:
+        object or None: The item, or None on timeout or when the queue is closed and empty.
+        """
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def close(self):
+        """
+        Wake up all consumers; get() returns None once the queue is drained.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+# Define a staged capture -> inference -> render pipeline for a video source
+class FramePipeline:
+    def __init__(self, capture, analyze, workers=1, display_queue_size=2):
+        """
+        Initialize the FramePipeline class.
+
+        Parameters:
+        capture (cv2.VideoCapture): Opened video source.
+        analyze (callable): Function run on inference workers; receives a frame and
+                            returns the detections to overlay on the preview.
+        workers (int): Number of inference worker threads.
+        display_queue_size (int): Frames buffered for the preview before the oldest is dropped.
+        """
+        self.capture = capture
+        self.analyze = analyze
+        self.workers = max(1, workers)
+        self.display_queue = LatestFrameQueue(display_queue_size)  # Every frame, for the preview
+        self.inference_queue = LatestFrameQueue(1)  # Latest frame wins, so inference never sees stale frames
+        self._stop = threading.Event()
+        self._threads = []
+        self._result_lock = threading.Lock()
+        self._latest_result = (-1, [])  # (frame id, detections) of the newest analyzed frame
+        self.frames_captured = 0
+        self.frames_analyzed = 0
+        self.started_at = None
+
+    def start(self):
+        """
+        Start the capture thread and the inference workers.
+        """
+        self.started_at = time.perf_counter()
+        self._threads = [threading.Thread(target=self._capture_loop, daemon=True)]
+        self._threads += [threading.Thread(target=self._inference_loop, daemon=True) for _ in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def wait(self):
+        """
+        Block until the source has ended and the inference workers have analyzed
+        the last queued frame. Only returns for finite sources such as files.
+        """
+        for thread in self._threads:
+            thread.join()
+
+    def stop(self):
+        """
+        Stop every stage and wait for the worker threads to finish.
+        """
+        self._stop.set()
+        self.display_queue.close()
+        self.inference_queue.close()
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+    def _capture_loop(self):
+        """
+        Read frames at camera speed and hand them to the preview and inference stages.
+        """
+        frame_id = 0
+        while not self._stop.is_set():
+            ret, frame = self.capture.read()
+            if not ret:
+                break  # Source ended or failed
+            item = (frame_id, time.perf_counter(), frame)
+            self.display_queue.put(item)
+            self.inference_queue.put(item)
+            self.frames_captured += 1
+            frame_id += 1
+        self.display_queue.close()
+        self.inference_queue.close()
+
+    def _inference_loop(self):
+        """
+        Analyze the newest available frame whenever the worker is free.
+        """
+        while not self._stop.is_set():
+            item = self.inference_queue.get(timeout=0.1)
+            if item is None:
+                if self.inference_queue.closed:
+                    break
+                continue
+            frame_id, _, frame = item
+            detections = self.analyze(frame)
+            with self._result_lock:
+                # With several workers, results may finish out of order; keep the newest
+                if frame_id > self._latest_result[0]:
+                    self._latest_result = (frame_id, detections)
+                self.frames_analyzed += 1
+
+    def next_frame(self, timeout=0.5):
+        """
+        Return the next preview frame with the most recent detections.
+
+        Parameters:
+        timeout (float): Seconds to wait for a frame.
+
+        Returns:
+        tuple or None: (frame, detections), or None if no frame arrived in time.
+        """
+        item = self.display_queue.get(timeout=timeout)
+        if item is None:
+            return None
+        with self._result_lock:
+            detections = self._latest_result[1]
+        return item[2], detections
+
+    def stats(self):
+        """
+        Report pipeline throughput.
+
+        Returns:
+        dict: Captured and analyzed frame counts, their rates and dropped frame counts.
+        """
+        elapsed = max(time.perf_counter() - (self.started_at or time.perf_counter()), 1e-9)
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_analyzed': self.frames_analyzed,
+            'capture_fps': self.frames_captured / elapsed,
+            'inference_fps': self.frames_analyzed / elapsed,
+            'dropped_preview': self.display_queue.dropped,
+            'dropped_inference': self.inference_queue.dropped,
+        }
@@ -0,0 +1,184 @@
+# Import necessary libraries
+import time  # For batching intervals and write latency metrics
+import queue  # Thread-safe queue between the camera loop and the writer
+import atexit  # Flush pending records when the interpreter exits
+import threading  # Background writer thread
+
+
+# Define an asynchronous sink that batches attendance records on a writer thread
+class AttendanceSink:
+    def __init__(self, backend, batch_size=64, flush_interval=0.5, fsync_interval=2.0, retry_interval=1.0,
+                 close_retries=3):
+        """
+        Initialize the AttendanceSink class.
+
+        Parameters:
+        backend (AttendanceStore): Storage receiving the batches (write_batch, sync, close).
+        batch_size (int): Maximum number of records written at once.
+        flush_interval (float): Seconds a record may wait for more records before being written.
+        fsync_interval (float): Minimum seconds between fsync calls on the backend.
+        retry_interval (float): Seconds between attempts to write records whose write failed.
+        close_retries (int): Extra attempts made by close() before giving up on failed records.
+        """
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.retry_interval = retry_interval
+        self.close_retries = max(0, close_retries)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+        self._failed = []  # Records of failed writes, retried before anything newer
+        self.write_errors = 0
+        self.last_error = None
+        self.records_written = 0
+        self.batches_written = 0
+        self.last_write_latency = 0.0  # Seconds spent writing the last batch
+        self.max_write_latency = 0.0
+        self._total_write_time = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, name, time_now, date_now):
+        """
+        Queue an attendance record; returns immediately.
+
+        Parameters:
+        name (str): Name of the recognized person.
+        time_now (str): Time of recognition (HH:MM:SS).
+        date_now (str): Date of recognition (YYYY-MM-DD).
+
+        Raises:
+        RuntimeError: If the sink has been closed.
+        """
+        if self._closed:
+            raise RuntimeError(f"Attendance sink is closed; the record of {name} was not saved")
+        self._queue.put((name, time_now, date_now))
+
+    def _run(self):
+        """
+        Drain the queue in batches until the sink is closed.
+        """
+        while True:
+            try:
+                first = self._queue.get(timeout=self.retry_interval if self._failed else self.fsync_interval)
+            except queue.Empty:
+                if self._failed:
+                    self._write([])  # Retry the failed records
+                self._sync()
+                continue
+            if first is None:
+                break  # Shutdown sentinel
+
+            # Collect more records for up to flush_interval seconds to build a batch
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    record = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+
+            self._write(batch)
+            if stop:
+                break
+
+        # Write whatever is still queued behind the sentinel
+        remaining = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not None:
+                remaining.append(record)
+        self._write(remaining)
+        for _ in range(self.close_retries):
+            if not self._failed:
+                break
+            time.sleep(self.retry_interval)
+            self._write([])
+        if self._failed:
+            print(f"[ERROR] {len(self._failed)} attendance records could not be written: {self.last_error}")
+        self._sync(force=True)
+
+    def _write(self, batch):
+        """
+        Write one batch, preceded by any records whose write failed, and update the metrics.
+        On failure the records are kept for the next attempt instead of being lost.
+        """
+        batch = self._failed + batch
+        if not batch:
+            return
+        start_time = time.perf_counter()
+        try:
+            self.backend.write_batch(batch)
+        except Exception as e:  # Locked database, full disk, I/O error...
+            self.write_errors += 1
+            self.last_error = repr(e)
+            self._failed = batch
+            print(f"[ERROR] Writing {len(batch)} attendance records failed, will retry: {e!r}")
+            return
+        self._failed = []
+        elapsed = time.perf_counter() - start_time
+        self.records_written += len(batch)
+        self.batches_written += 1
+        self.last_write_latency = elapsed
+        self.max_write_latency = max(self.max_write_latency, elapsed)
+        self._total_write_time += elapsed
+        self._unsynced = True
+        self._sync()
+
+    def _sync(self, force=False):
+        """
+        fsync the backend if records are pending and the fsync interval has passed.
+        """
+        if self._unsynced and (force or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._last_sync = time.monotonic()
+            try:
+                self.backend.sync()
+            except Exception as e:
+                self.last_error = repr(e)
+                print(f"[ERROR] Syncing the attendance records failed: {e!r}")
+                return
+            self._unsynced = False
+
+    def close(self):
+        """
+        Flush every queued record, fsync and close the backend. Safe to call twice.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)  # Do not keep a closed sink alive until the interpreter exits
+        self._queue.put(None)
+        self._thread.join()
+        self.backend.close()
+
+    def stats(self):
+        """
+        Report the writer's queue depth and write latency.
+
+        Returns:
+        dict: Queue depth, records written and pending retry, write errors, last/mean/max write latency.
+        """
+        return {
+            'queue_depth': self._queue.qsize(),
+            'records_written': self.records_written,
+            'records_failed': len(self._failed),
+            'write_errors': self.write_errors,
+            'last_error': self.last_error,
+            'batches_written': self.batches_written,
+            'last_write_latency': self.last_write_latency,
+            'mean_write_latency': self._total_write_time / self.batches_written if self.batches_written else 0.0,
+            'max_write_latency': self.max_write_latency,
+        }
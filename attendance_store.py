@@ -0,0 +1,241 @@
+# Import necessary libraries
+import os  # For locating legacy CSV files
+import re  # For reading the date out of attend_YYYY-MM-DD.csv file names
+import csv  # For importing legacy CSV attendance files
+import glob  # For finding legacy CSV attendance files
+import sqlite3  # SQLite database engine
+import argparse  # Command line interface of the importer
+import threading  # One connection is shared by the writer thread and the GUI
+
+
+# Define the SQLite attendance store
+class AttendanceStore:
+    # Constant SQL strings so sqlite3's statement cache reuses the prepared statements
+    INSERT_SQL = 'INSERT OR IGNORE INTO attendance (name, date, time) VALUES (?, ?, ?)'
+    SCHEMA = [
+        '''CREATE TABLE IF NOT EXISTS attendance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                date TEXT NOT NULL,
+                time TEXT NOT NULL,
+                UNIQUE(name, date)
+            )''',
+        # UNIQUE(name, date) already gives an index usable for lookups by name
+        'CREATE INDEX IF NOT EXISTS idx_attendance_date_time ON attendance (date, time)',
+    ]
+
+    def __init__(self, path='attendance.db'):
+        """
+        Initialize the AttendanceStore class and open its long-lived connection.
+
+        Parameters:
+        path (str): SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self.conn.execute('PRAGMA journal_mode=WAL')  # Readers never block the writer
+        self.conn.execute('PRAGMA synchronous=NORMAL')  # Durable at checkpoints, fast commits
+        with self.conn:
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+
+    def write_batch(self, records):
+        """
+        Insert a batch of (name, time, date) records in one transaction.
+        Duplicates of a person on the same date are ignored by the UNIQUE constraint.
+
+        Parameters:
+        records (list): (name, time, date) tuples, as produced by mark_attendance.
+
+        Returns:
+        int: Number of rows actually inserted.
+        """
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(self.INSERT_SQL, [(name, date, time_) for name, time_, date in records])
+            return self.conn.total_changes - before
+
+    def sync(self):
+        """
+        Checkpoint the write-ahead log into the main database file.
+        """
+        with self._lock:
+            self.conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def query(self, sql, params=()):
+        """
+        Run a read-only query on the shared connection.
+
+        Parameters:
+        sql (str): SELECT statement.
+        params (tuple): Statement parameters.
+
+        Returns:
+        list: All result rows.
+        """
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    SORT_COLUMNS = ('name', 'time', 'date')  # Columns the report may be ordered by
+
+    @staticmethod
+    def where_clause(name=None, date_from=None, date_to=None):
+        """
+        Build the WHERE clause shared by page() and count().
+        """
+        clauses = []
+        params = []
+        if name:
+            clauses.append('name LIKE ?')
+            params.append(f'%{name}%')
+        if date_from:
+            clauses.append('date >= ?')
+            params.append(date_from)
+        if date_to:
+            clauses.append('date <= ?')
+            params.append(date_to)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def count(self, name=None, date_from=None, date_to=None):
+        """
+        Count the records matching the report filters.
+
+        Parameters:
+        name (str): Substring the person's name must contain.
+        date_from (str): First date included (YYYY-MM-DD).
+        date_to (str): Last date included (YYYY-MM-DD).
+        """
+        where, params = self.where_clause(name, date_from, date_to)
+        return self.query('SELECT COUNT(*) FROM attendance' + where, params)[0][0]
+
+    def page(self, offset, limit, sort='date', descending=True, name=None, date_from=None, date_to=None):
+        """
+        Fetch one window of the attendance report, sorted and filtered by the database.
+
+        Parameters:
+        offset (int): Number of matching records to skip.
+        limit (int): Maximum number of records returned.
+        sort (str): Column to order by: 'name', 'time' or 'date'.
+        descending (bool): Newest / last first when True.
+        name (str): Substring the person's name must contain.
+        date_from (str): First date included (YYYY-MM-DD).
+        date_to (str): Last date included (YYYY-MM-DD).
+
+        Returns:
+        list: (name, time, date) rows.
+        """
+        if sort not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort attendance by {sort!r}")
+        direction = 'DESC' if descending else 'ASC'
+        # Secondary keys keep the order stable across pages
+        order = {'date': f'date {direction}, time {direction}',
+                 'time': f'time {direction}, date {direction}',
+                 'name': f'name {direction}, date {direction}'}[sort]
+        where, params = self.where_clause(name, date_from, date_to)
+        sql = f'SELECT name, time, date FROM attendance{where} ORDER BY {order}, id LIMIT ? OFFSET ?'
+        return self.query(sql, params + [limit, offset])
+
+    def iter_query(self, sql, params=(), chunk_size=5000):
+        """
+        Stream the rows of a long-running read in chunks.
+        A separate read-only connection is used, so exports never hold the writer's lock
+        (WAL mode lets the reader and the writer run concurrently).
+
+        Parameters:
+        sql (str): SELECT statement.
+        params (tuple): Statement parameters.
+        chunk_size (int): Rows fetched per chunk.
+
+        Yields:
+        list: Up to chunk_size rows at a time.
+        """
+        path = os.path.abspath(self.path).replace('\\', '/')
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    def names_on(self, date):
+        """
+        Return the names of everyone marked present on a date (one indexed lookup).
+
+        Parameters:
+        date (str): Date in YYYY-MM-DD format.
+        """
+        return [row[0] for row in self.query('SELECT name FROM attendance WHERE date = ?', (date,))]
+
+    def import_csv(self, path, default_date=None):
+        """
+        Import a legacy CSV attendance file.
+
+        Parameters:
+        path (str): CSV file with name,time,date rows (or name,time rows).
+        default_date (str): Date used for rows without a date column.
+
+        Returns:
+        tuple: (rows inserted, rows skipped).
+        """
+        records = []
+        skipped = 0
+        with open(path, newline='') as f:
+            for row in csv.reader(f):
+                row = [value.strip() for value in row]
+                if len(row) >= 3 and row[0] and row[2]:
+                    records.append((row[0], row[1], row[2]))
+                elif len(row) == 2 and row[0] and default_date:
+                    records.append((row[0], row[1], default_date))
+                else:
+                    skipped += 1  # Blank rows or rows whose date is unknown
+        inserted = self.write_batch(records)
+        return inserted, skipped + len(records) - inserted
+
+    def import_legacy(self, root='.'):
+        """
+        One-shot import of attendance.csv and attendance/*.csv into the store.
+        The date of attendance/attend_YYYY-MM-DD.csv rows is taken from the file name.
+
+        Parameters:
+        root (str): Directory containing attendance.csv and the attendance folder.
+
+        Returns:
+        dict: File path -> (rows inserted, rows skipped).
+        """
+        report = {}
+        paths = [os.path.join(root, 'attendance.csv')]
+        paths += sorted(glob.glob(os.path.join(root, 'attendance', '*.csv')))
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            found = re.search(r'(\d{4}-\d{2}-\d{2})', os.path.basename(path))
+            report[path] = self.import_csv(path, default_date=found.group(1) if found else None)
+        return report
+
+
+def main():
+    """
+    Command line entry point: import legacy CSV attendance files into the database.
+    """
+    parser = argparse.ArgumentParser(description="Import legacy CSV attendance files into attendance.db")
+    parser.add_argument('--db', default='attendance.db', help="SQLite database file")
+    parser.add_argument('--root', default='.', help="Directory holding attendance.csv and attendance/")
+    args = parser.parse_args()
+
+    store = AttendanceStore(args.db)
+    for path, (inserted, skipped) in store.import_legacy(args.root).items():
+        print(f"[INFO] {path}: {inserted} imported, {skipped} skipped")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# Import necessary libraries
+import os  # For sizing the worker pool from the CPU count
+import json  # For the summary output
+import time  # For throughput measurement
+import argparse  # Command line interface
+from datetime import datetime, timedelta  # For turning footage offsets into attendance times
+from concurrent.futures import ProcessPoolExecutor  # Parallel processing of video chunks
+from config import load_config  # Central application configuration
+from face_core import FaceRecognitionCore  # Recognition engine
+from frame_sources import open_source, CameraFrameSource, StreamSource  # Pluggable frame sources
+
+_worker_core = None  # Recognition-only engine of a worker process
+
+
+def _init_worker(known_faces, settings):
+    """
+    Build the recognition-only engine of a worker process from the shipped gallery.
+    """
+    global _worker_core
+    _worker_core = FaceRecognitionCore(attendance_db=None, known_faces=known_faces, **settings)
+
+
+def recognize_source(core, spec, step=1, sample_fps=None, start_frame=0, end_frame=None):
+    """
+    Recognize every sampled frame of a source as fast as possible.
+
+    Parameters:
+    core (FaceRecognitionCore): Engine used for recognition; nothing is marked here.
+    spec (int or str): Frame source, see frame_sources.open_source().
+    step, sample_fps, start_frame, end_frame: Frame sampling, see open_source().
+
+    Returns:
+    dict: 'frames' processed and 'sightings' as name -> (first frame index, best distance).
+    """
+    sightings = {}
+    frames = 0
+    stream = core.new_stream()  # Tracks of this chunk only
+    with open_source(spec, step=step, sample_fps=sample_fps, start_frame=start_frame, end_frame=end_frame) as source:
+        if not source.isOpened():
+            raise IOError(f"Unable to open frame source {spec!r}")
+        for index, frame in source:
+            frames += 1
+            for detection in core.recognize_frame(frame, stream):
+                if not detection.matched:
+                    continue
+                first = sightings.get(detection.name)
+                if first is None:
+                    sightings[detection.name] = (index, detection.distance)
+                else:
+                    sightings[detection.name] = (first[0], min(first[1], detection.distance))
+    return {'frames': frames, 'sightings': sightings}
+
+
+def _process_chunk(task):
+    return recognize_source(_worker_core, *task)
+
+
+# Define an offline attendance run over recorded footage
+class BatchAttendance:
+    def __init__(self, core, workers=None, chunk_frames=None, step=1, sample_fps=None):
+        """
+        Initialize the BatchAttendance class.
+
+        Parameters:
+        core (FaceRecognitionCore): Engine whose gallery is matched and whose database records attendance.
+        workers (int): Processes splitting long videos into chunks. Defaults to the number of CPU cores;
+                       1 processes the footage in the calling process.
+        chunk_frames (int): Frames per chunk. Defaults to an equal share per worker.
+        step (int): Process every step-th frame.
+        sample_fps (float): Sampling rate in frames per second of footage; overrides step.
+        """
+        self.core = core
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_frames = chunk_frames
+        self.step = max(1, step)
+        self.sample_fps = sample_fps
+        self.last_stats = {}
+
+    def _settings(self):
+        """
+        Engine settings shipped to the worker processes along with the gallery.
+        """
+        core = self.core
+        return {
+            'tolerance': core.tolerance,
+            'detection_model': core.detection_model,
+            'encoding_model': core.encoding_model,
+            'index_backend': core.index_backend,
+            'index_options': core.index_options,
+            'motion_options': core.motion_options,
+            'scaler_options': core.scaler_options,
+            'full_frame_interval': core.full_frame_interval,
+        }
+
+    def _chunks(self, frame_count, step):
+        """
+        Split [0, frame_count) into frame ranges whose starts keep the sampling grid.
+        """
+        size = self.chunk_frames or -(-frame_count // self.workers)
+        size = max(step, -(-size // step) * step)  # Whole multiples of the sampling step
+        return [(start, min(start + size, frame_count)) for start in range(0, frame_count, size)]
+
+    def run(self, spec, start_time=None, mark=True, verbose=True):
+        """
+        Recognize everyone appearing in a recording and mark their attendance.
+
+        Parameters:
+        spec (int or str): Video file, image directory, stream URL or camera index.
+        start_time (datetime): Wall-clock time of the first frame. Attendance is then recorded at
+                               the time each person first appears; otherwise at the current time.
+        mark (bool): Record attendance in the database.
+        verbose (bool): Print the achieved throughput.
+
+        Returns:
+        dict: Frames processed, seconds, frames/sec, speed relative to real time and the people seen.
+        """
+        start = time.perf_counter()
+        with open_source(spec, step=self.step, sample_fps=self.sample_fps) as probe:
+            if not probe.isOpened():
+                raise IOError(f"Unable to open frame source {spec!r}")
+            fps, frame_count = probe.fps, probe.frame_count
+            step = getattr(probe, 'step', self.step)
+            live = isinstance(probe, (CameraFrameSource, StreamSource))
+
+        if live or not frame_count or self.workers <= 1:
+            # Live sources and unknown lengths cannot be split
+            results = [recognize_source(self.core, spec, self.step, self.sample_fps)]
+            workers = 1
+        else:
+            chunks = self._chunks(frame_count, step)
+            workers = min(self.workers, len(chunks))
+            known_faces = (self.core.gallery.encodings, self.core.gallery.names)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(known_faces, self._settings())) as executor:
+                tasks = [(spec, step, None, first, end) for first, end in chunks]
+                results = list(executor.map(_process_chunk, tasks))
+
+        # Keep the earliest sighting of every person across the chunks
+        sightings = {}
+        frames = 0
+        for result in results:
+            frames += result['frames']
+            for name, (index, distance) in result['sightings'].items():
+                first = sightings.get(name)
+                if first is not None:
+                    index, distance = min(index, first[0]), min(distance, first[1])
+                sightings[name] = (index, distance)
+
+        people = {}
+        for name, (index, distance) in sorted(sightings.items(), key=lambda item: item[1][0]):
+            offset = index / fps if fps else None
+            when = start_time + timedelta(seconds=offset) if start_time is not None and offset is not None else None
+            if mark:
+                self.core.mark_attendance(name, when)
+            people[name] = {'frame': index, 'offset': offset, 'distance': distance,
+                            'time': when.strftime('%Y-%m-%d %H:%M:%S') if when else None}
+
+        elapsed = time.perf_counter() - start
+        footage_seconds = (frame_count / fps) if fps and frame_count else None
+        self.last_stats = {
+            'source': str(spec),
+            'workers': workers,
+            'frames': frames,
+            'seconds': elapsed,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'realtime_factor': footage_seconds / elapsed if footage_seconds and elapsed > 0 else None,
+            'people': people,
+        }
+        if verbose:
+            print(f"[INFO] Processed {frames} frames with {workers} worker(s) in {elapsed:.2f}s "
+                  f"({self.last_stats['fps']:.1f} frames/sec); {len(people)} people recognized")
+        return self.last_stats
+
+
+def main(argv=None):
+    """
+    Command line entry point: offline attendance from recorded footage.
+    """
+    parser = argparse.ArgumentParser(description="Take attendance from a video file, image directory or stream")
+    parser.add_argument('source', help="Video file, image directory, stream URL or camera index")
+    parser.add_argument('--config', help="Configuration file (defaults to $BIOAUTH_CONFIG or config.json)")
+    parser.add_argument('--step', type=int, default=1, help="Process every N-th frame")
+    parser.add_argument('--sample-fps', type=float, help="Frames per second of footage to process (video files)")
+    parser.add_argument('--workers', type=int, help="Processes for chunked video processing (default: all cores)")
+    parser.add_argument('--chunk-frames', type=int, help="Frames per chunk (default: one chunk per worker)")
+    parser.add_argument('--start-time', help="Wall-clock time of the first frame, 'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument('--no-mark', action='store_true', help="Only report who was seen")
+    parser.add_argument('--json', help="Write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    start_time = datetime.strptime(args.start_time, '%Y-%m-%d %H:%M:%S') if args.start_time else None
+    config = load_config(args.config)
+    core = FaceRecognitionCore.from_config(config)
+    try:
+        batch = BatchAttendance(core, workers=args.workers, chunk_frames=args.chunk_frames,
+                                step=args.step, sample_fps=args.sample_fps)
+        summary = batch.run(args.source, start_time=start_time, mark=not args.no_mark)
+    finally:
+        core.close()  # Flush the attendance records
+
+    for name, seen in summary['people'].items():
+        print(f"{name},{seen['time'] or ''},{seen['offset'] if seen['offset'] is not None else ''}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# Import necessary libraries
+import os  # For temporary index files and the CPU count
+import sys  # For the Python version in the report
+import json  # Machine-readable results
+import time  # For timing every measurement
+import argparse  # Command line interface
+import platform  # For describing the machine in the report
+try:
+    import resource  # For the peak resident memory of the process (Unix only)
+except ImportError:
+    resource = None
+try:
+    import psutil  # Optional: process memory where the resource module is missing (Windows)
+except ImportError:
+    psutil = None
+import tempfile  # For the persisted-index load measurement
+from datetime import datetime  # For the report timestamp
+import numpy as np  # NumPy for the synthetic galleries and percentiles
+from gallery import FaceGallery  # Matching path used by the attendance loop
+from gallery_index import make_index  # Exact and approximate search backends
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_BATCH_SIZES = (1, 4, 16)
+
+
+def synthetic_gallery(size, images_per_person=10, dim=128, seed=0):
+    """
+    Generate a gallery shaped like real face encodings: people are random points and
+    their images are scattered around them, about 0.3 apart within a person and
+    about 0.9 apart between people (the scale of dlib face distances).
+
+    Parameters:
+    size (int): Number of encodings.
+    images_per_person (int): Encodings per synthetic person.
+    dim (int): Length of an encoding.
+    seed (int): Random seed, so runs are comparable.
+
+    Returns:
+    tuple: (float32 encodings of shape (size, dim), list of names, person centres).
+    """
+    rng = np.random.default_rng(seed)
+    people = max(1, size // images_per_person)
+    centres = rng.normal(0.0, 0.9 / np.sqrt(2 * dim), (people, dim)).astype(np.float32)
+    person = np.arange(size) % people
+    encodings = centres[person] + rng.normal(0.0, 0.3 / np.sqrt(2 * dim), (size, dim)).astype(np.float32)
+    names = [f'person_{i}' for i in person]
+    return encodings, names, centres
+
+
+def synthetic_queries(centres, count, dim=128, seed=1):
+    """
+    Generate query faces: half are new images of known people, half are strangers.
+    """
+    rng = np.random.default_rng(seed)
+    known = centres[rng.integers(0, len(centres), count - count // 2)]
+    known = known + rng.normal(0.0, 0.3 / np.sqrt(2 * dim), known.shape).astype(np.float32)
+    strangers = rng.normal(0.0, 0.9 / np.sqrt(2 * dim), (count // 2, dim)).astype(np.float32)
+    queries = np.vstack([known, strangers])
+    return queries[rng.permutation(len(queries))]
+
+
+def latency_summary(latencies, faces):
+    """
+    Summarize per-call latencies (seconds) of calls matching `faces` faces in total.
+    """
+    latencies = np.asarray(latencies)
+    total = latencies.sum()
+    return {
+        'calls': len(latencies),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'mean_ms': float(latencies.mean() * 1000),
+        'faces_per_sec': float(faces / total) if total > 0 else 0.0,
+    }
+
+
+def peak_rss_mb():
+    """
+    Peak resident memory of the process in MiB, or None when it cannot be measured.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024  # macOS reports bytes, Linux KiB
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss) / (1 << 20)  # Windows tracks the peak working set
+    return None
+
+
+def gallery_bytes(gallery):
+    """
+    Memory held by the gallery arrays (allocated capacity, not just the rows in use).
+    """
+    matrix, sq_norms, ids, _ = gallery._state
+    return int(matrix.nbytes + sq_norms.nbytes + ids.nbytes)
+
+
+def bench_gallery(encodings, names, queries, backend, batch_sizes, tolerance, index_options):
+    """
+    Build a FaceGallery with one index backend and time its batched match().
+
+    Returns:
+    tuple: (result dict, list of best names per query for recall comparisons).
+    """
+    start = time.perf_counter()
+    gallery = FaceGallery.from_encodings(encodings, names)
+    build_seconds = time.perf_counter() - start
+
+    index = make_index(backend, **index_options)
+    start = time.perf_counter()
+    index.build(gallery.encodings)
+    index_build_seconds = time.perf_counter() - start
+    gallery.index = index
+
+    # Persisted index: what a warm start pays instead of training
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'index.npz')
+        index.save(path, gallery.encodings)
+        start = time.perf_counter()
+        make_index(backend, **index_options).load(path, gallery.encodings)
+        index_load_seconds = time.perf_counter() - start
+
+    gallery.match(queries[:1], tolerance)  # Warm-up
+    per_batch = {}
+    for batch_size in batch_sizes:
+        latencies = []
+        for i in range(0, len(queries) - batch_size + 1, batch_size):
+            start = time.perf_counter()
+            gallery.match(queries[i:i + batch_size], tolerance)
+            latencies.append(time.perf_counter() - start)
+        per_batch[str(batch_size)] = latency_summary(latencies, len(latencies) * batch_size)
+
+    best = [result.name for result in gallery.match(queries, tolerance)]
+    return {
+        'build_seconds': build_seconds,
+        'index_build_seconds': index_build_seconds,
+        'index_load_seconds': index_load_seconds,
+        'gallery_bytes': gallery_bytes(gallery),
+        'index_bytes': index.nbytes,
+        'batches': per_batch,
+    }, best
+
+
+def bench_face_distance(encodings, names, queries, tolerance, max_queries):
+    """
+    Time the matching path the attendance loop used before the gallery matrix:
+    face_recognition.face_distance against a Python list of encodings, one face at a time.
+    """
+    try:
+        import face_recognition  # Optional here: only this baseline needs it
+    except ImportError:
+        return {'skipped': 'face_recognition is not installed'}, None
+
+    known_encodings = list(encodings.astype(np.float64))
+    latencies = []
+    best = []
+    for query in queries[:max_queries]:
+        start = time.perf_counter()
+        distances = face_recognition.face_distance(known_encodings, query)
+        match = np.argmin(distances)
+        latencies.append(time.perf_counter() - start)
+        best.append(names[match] if distances[match] <= tolerance else None)
+    return {'batches': {'1': latency_summary(latencies, len(latencies))}}, best
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, batch_sizes=DEFAULT_BATCH_SIZES, matchers=('exact', 'ivf', 'face_distance'),
+                   queries=256, tolerance=0.5, baseline_max_size=100000, index_options=None, seed=0, verbose=True):
+    """
+    Run the matching benchmark over every gallery size and matcher.
+
+    Parameters:
+    sizes (sequence): Gallery sizes to generate.
+    batch_sizes (sequence): Faces matched per call.
+    matchers (sequence): 'exact' and 'ivf' FaceGallery backends, and the 'face_distance' baseline.
+    queries (int): Query faces per measurement.
+    tolerance (float): Match tolerance.
+    baseline_max_size (int): Largest gallery the slow face_distance baseline runs on.
+    index_options (dict): IVFIndex options, e.g. {'n_probe': 16}.
+    seed (int): Random seed of the synthetic data.
+    verbose (bool): Print a line per measurement.
+
+    Returns:
+    dict: Machine-readable report with the environment and one entry per gallery size.
+    """
+    report = {
+        'benchmark': 'matching',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'parameters': {'queries': queries, 'tolerance': tolerance, 'seed': seed,
+                       'batch_sizes': list(batch_sizes), 'index_options': index_options or {}},
+        'results': [],
+    }
+
+    for size in sizes:
+        start = time.perf_counter()
+        encodings, names, centres = synthetic_gallery(size, seed=seed)
+        query_faces = synthetic_queries(centres, queries, seed=seed + 1)
+        entry = {'size': size, 'people': len(centres),
+                 'generate_seconds': time.perf_counter() - start, 'matchers': {}}
+
+        exact_best = None
+        for matcher in matchers:
+            if matcher == 'face_distance':
+                if size > baseline_max_size:
+                    result, best = {'skipped': f'gallery larger than {baseline_max_size}'}, None
+                else:
+                    result, best = bench_face_distance(encodings, names, query_faces, tolerance, queries)
+            else:
+                result, best = bench_gallery(encodings, names, query_faces, matcher, batch_sizes,
+                                             tolerance, index_options if matcher == 'ivf' else {})
+            if matcher == 'exact':
+                exact_best = best
+            elif best is not None and exact_best is not None:
+                # Fraction of queries given the same answer as the exact scan
+                result['agreement_with_exact'] = float(np.mean([a == b for a, b in zip(best, exact_best)]))
+            entry['matchers'][matcher] = result
+
+            if verbose:
+                if 'skipped' in result:
+                    print(f"[INFO] {size:>8} {matcher:<14} skipped: {result['skipped']}")
+                else:
+                    single = result['batches'].get('1') or next(iter(result['batches'].values()))
+                    print(f"[INFO] {size:>8} {matcher:<14} p50 {single['p50_ms']:.3f} ms  "
+                          f"p99 {single['p99_ms']:.3f} ms  {single['faces_per_sec']:.0f} faces/sec")
+
+        entry['peak_rss_mb'] = peak_rss_mb()
+        report['results'].append(entry)
+        del encodings, names  # Free the gallery before generating the next size
+    return report
+
+
+def main(argv=None):
+    """
+    Command line entry point: run the matching benchmark and write a JSON report.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark face matching on synthetic galleries")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="Comma separated gallery sizes")
+    parser.add_argument('--batch-sizes', default=','.join(map(str, DEFAULT_BATCH_SIZES)),
+                        help="Comma separated faces per match call")
+    parser.add_argument('--matchers', default='exact,ivf,face_distance', help="Subset of exact, ivf, face_distance")
+    parser.add_argument('--queries', type=int, default=256, help="Query faces per measurement")
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--baseline-max-size', type=int, default=100000,
+                        help="Largest gallery the face_distance baseline runs on")
+    parser.add_argument('--n-probe', type=int, help="IVF cells scanned per query")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='benchmark_matching.json', help="JSON report file")
+    args = parser.parse_args(argv)
+
+    index_options = {'n_probe': args.n_probe} if args.n_probe else {}
+    report = run_benchmarks(
+        sizes=[int(v) for v in args.sizes.split(',') if v],
+        batch_sizes=[int(v) for v in args.batch_sizes.split(',') if v],
+        matchers=[m.strip() for m in args.matchers.split(',') if m.strip()],
+        queries=args.queries,
+        tolerance=args.tolerance,
+        baseline_max_size=args.baseline_max_size,
+        index_options=index_options,
+        seed=args.seed,
+    )
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+# Import necessary libraries
+import os  # For the CPU count and dataset lookup
+import sys  # For the Python version in the report
+import json  # Machine-readable results
+import time  # For pacing and timing
+import argparse  # Command line interface
+import platform  # For describing the machine in the report
+import threading  # For the per-frame latency bookkeeping of the threaded mode
+from datetime import datetime  # For the report timestamp
+import cv2  # OpenCV for synthetic frames
+import numpy as np  # NumPy for synthetic frames and percentiles
+from config import load_config  # Central application configuration
+from face_core import FaceRecognitionCore  # Full attendance path
+from frame_sources import open_source, IMAGE_EXTENSIONS  # Recorded clips and image directories
+from attendance_pipeline import FramePipeline  # Threaded capture / inference stages
+from stage_profiler import StageProfiler  # Per-stage timing inside FaceRecognitionCore
+from benchmark_matching import synthetic_gallery  # Synthetic galleries of any size
+
+DEFAULT_REPLAY_FPS = 30.0  # Delivery rate of the threaded mode when the frames have none
+
+
+def load_frames(spec, max_frames):
+    """
+    Decode up to max_frames frames of a clip or image directory into memory, so decoding
+    is not part of the measurement and every run sees exactly the same frames.
+    """
+    frames = []
+    with open_source(spec) as source:
+        if not source.isOpened():
+            raise IOError(f"Unable to open frame source {spec!r}")
+        for _, frame in source:
+            frames.append(frame)
+            if len(frames) >= max_frames:
+                break
+    return frames, source.fps
+
+
+def synthetic_frames(count, width=1280, height=720, face_image=None, face_height=180, seed=0):
+    """
+    Generate a reproducible frame sequence: a fixed noisy background with an optional
+    face image sliding across it, so detection, tracking and re-detection all run.
+
+    Parameters:
+    count (int): Number of frames.
+    width, height (int): Frame size.
+    face_image (numpy.ndarray): BGR face picture pasted into every frame. None gives face-less frames.
+    face_height (int): Height of the pasted face in pixels.
+    seed (int): Random seed of the background.
+    """
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[None, :, None]
+    background = np.clip(gradient + rng.normal(0, 12, (height, width, 3)), 0, 255).astype(np.uint8)
+
+    face = None
+    if face_image is not None:
+        scale = face_height / face_image.shape[0]
+        face = cv2.resize(face_image, (0, 0), fx=scale, fy=scale)
+        face = face[:height, :width]
+
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        if face is not None:
+            fh, fw = face.shape[:2]
+            span = max(1, width - fw)
+            left = int((i * 8) % (2 * span))
+            left = left if left < span else 2 * span - left  # Walk back and forth
+            top = (height - fh) // 2
+            frame[top:top + fh, left:left + fw] = face
+        frames.append(frame)
+    return frames
+
+
+def first_dataset_image(dataset_dir):
+    """
+    Return the path of the first image of the dataset, used as the synthetic face.
+    """
+    if not os.path.isdir(dataset_dir):
+        return None
+    for person in sorted(os.listdir(dataset_dir)):
+        person_path = os.path.join(dataset_dir, person)
+        if os.path.isdir(person_path):
+            for name in sorted(os.listdir(person_path)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    return os.path.join(person_path, name)
+    return None
+
+
+# In-memory replay with the cv2.VideoCapture interface, optionally paced like a live camera
+class ReplayCapture:
+    def __init__(self, frames, fps=None):
+        """
+        Initialize the ReplayCapture class.
+
+        Parameters:
+        frames (list): Frames returned in order.
+        fps (float): Frames per second to deliver at. None delivers as fast as possible.
+        """
+        self.frames = frames
+        self.fps = fps
+        self.read_times = {}  # id(frame) -> time it was delivered
+        self._lock = threading.Lock()
+        self._next = 0
+        self._start = None
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self._next >= len(self.frames):
+            return False, None
+        if self._start is None:
+            self._start = time.perf_counter()
+        if self.fps:
+            delay = self._start + self._next / self.fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        # A copy gives every delivered frame its own identity for the latency bookkeeping
+        frame = self.frames[self._next].copy()
+        self._next += 1
+        with self._lock:
+            self.read_times[id(frame)] = time.perf_counter()
+        return True, frame
+
+    def delivered_at(self, frame):
+        with self._lock:
+            return self.read_times.pop(id(frame), None)
+
+    def release(self):
+        pass
+
+
+def cpu_seconds():
+    return time.process_time()  # User + system time of every thread of the process
+
+
+def percentiles_ms(latencies):
+    latencies = np.asarray(latencies) if len(latencies) else np.zeros(1)
+    return {
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'mean_ms': float(latencies.mean() * 1000),
+    }
+
+
+def replay(core, frames, workers=1, fps=None):
+    """
+    Replay frames through analyze_frame and draw_detections without any display.
+
+    Parameters:
+    core (FaceRecognitionCore): Engine with a StageProfiler attached.
+    frames (list): Frames to replay.
+    workers (int): 1 processes every frame in order; more runs the threaded FramePipeline
+                   (latest frame wins, so frames are dropped when inference falls behind).
+    fps (float): Delivery rate of the threaded mode. None delivers as fast as possible,
+                 which leaves nearly every frame dropped.
+
+    Returns:
+    dict: Frames processed, seconds, FPS and frame-to-decision latency percentiles.
+    """
+    latencies = []
+    start = time.perf_counter()
+    if workers <= 1:
+        for frame in frames:
+            frame_start = time.perf_counter()
+            detections = core.analyze_frame(frame)
+            with core.profile_stage('draw'):
+                core.draw_detections(frame.copy(), detections)
+            latencies.append(time.perf_counter() - frame_start)
+        processed = len(frames)
+        dropped = 0
+    else:
+        capture = ReplayCapture(frames, fps)
+        lock = threading.Lock()
+
+        def analyze(frame):
+            detections = core.analyze_frame(frame)
+            delivered = capture.delivered_at(frame)
+            if delivered is not None:
+                with lock:
+                    latencies.append(time.perf_counter() - delivered)
+            return detections
+
+        pipeline = FramePipeline(capture, analyze, workers=workers)
+        pipeline.start()
+        try:
+            while True:
+                item = pipeline.next_frame()
+                if item is None:
+                    if pipeline.display_queue.closed:
+                        break  # Every frame was delivered
+                    continue
+                frame, detections = item
+                with core.profile_stage('draw'):
+                    core.draw_detections(frame.copy(), detections)
+            # Let the workers finish the frames still queued or in flight before measuring
+            pipeline.wait()
+        finally:
+            pipeline.stop()
+        stats = pipeline.stats()
+        processed = stats['frames_analyzed']
+        dropped = stats['dropped_inference']
+
+    elapsed = time.perf_counter() - start
+    result = {
+        'frames_delivered': len(frames),
+        'frames_processed': processed,
+        'frames_dropped': dropped,
+        'seconds': elapsed,
+        'fps': processed / elapsed if elapsed > 0 else 0.0,
+    }
+    result['latency'] = percentiles_ms(latencies)
+    return result
+
+
+def run_benchmark(config, source=None, frames=300, width=1280, height=720, face_image=None,
+                  gallery_size=None, workers=1, fps=None, scale=None, detection_model=None,
+                  encoding_model=None, motion_gate=None, warmup=10, verbose=True):
+    """
+    Run the end-to-end replay benchmark.
+
+    Parameters:
+    config (AppConfig): Base configuration; the options below override it.
+    source (str): Clip or image directory to replay. None generates synthetic frames.
+    frames (int): Maximum number of frames replayed.
+    width, height (int): Size of synthetic frames.
+    face_image (str): Face pasted into synthetic frames. Defaults to the first dataset image.
+    gallery_size (int): Match against a synthetic gallery of this size (plus the benchmark face)
+                        instead of loading the dataset.
+    workers (int): Inference threads; 1 replays sequentially.
+    fps (float): Delivery rate of the threaded mode. Defaults to the clip's rate, else DEFAULT_REPLAY_FPS.
+    scale (float): Fixed detection scale. None keeps the adaptive scaler.
+    detection_model, encoding_model (str): Model overrides.
+    motion_gate (bool): Enable or disable the motion gate. None keeps the configuration.
+    warmup (int): Frames processed before measuring.
+    verbose (bool): Print a summary line.
+
+    Returns:
+    dict: Machine-readable report.
+    """
+    face = None
+    if source is not None:
+        frame_list, source_fps = load_frames(source, frames)
+        fps = fps or source_fps or None
+    else:
+        face_path = face_image or first_dataset_image(config.paths.dataset_dir)
+        face = cv2.imread(face_path) if face_path else None
+        frame_list = synthetic_frames(frames, width, height, face)
+    if workers > 1 and not fps:
+        fps = DEFAULT_REPLAY_FPS  # Unpaced delivery would drop all but a handful of frames
+
+    overrides = {'attendance_db': ':memory:', 'inference_workers': workers}  # Never touch the real records
+    if scale is not None:
+        overrides['scaler_options'] = {'initial_scale': scale, 'min_scale': scale, 'max_scale': scale}
+    if detection_model:
+        overrides['detection_model'] = detection_model
+    if encoding_model:
+        overrides['encoding_model'] = encoding_model
+    if motion_gate is False:
+        overrides['motion_options'] = False
+    elif motion_gate:
+        overrides['motion_options'] = {'sensitivity': config.detection.motion_sensitivity,
+                                       'max_skip': config.detection.motion_max_skip}
+    if gallery_size:
+        encodings, names, _ = synthetic_gallery(gallery_size)
+        overrides['known_faces'] = (encodings, names)
+
+    start = time.perf_counter()
+    core = FaceRecognitionCore.from_config(config, **overrides)
+    load_seconds = time.perf_counter() - start
+    if gallery_size and face is not None:
+        # Make the synthetic face a known person so matching and marking are exercised
+        _, face_encodings = core.encode_image(face)
+        if face_encodings:
+            core.gallery.add_many(face_encodings[:1], ['benchmark_subject'])
+
+    try:
+        # Warm up caches, the scaler and the tracker outside the measurement. Nothing is
+        # marked, so the measured 'mark' stage includes the first-sighting insert.
+        for frame in frame_list[:warmup]:
+            core.recognize_frame(frame)
+        core.stream = core.new_stream()
+        core.profiler = StageProfiler()
+
+        cpu_start = cpu_seconds()
+        result = replay(core, frame_list, workers=workers, fps=fps if workers > 1 else None)
+        cpu_used = cpu_seconds() - cpu_start
+        result['stages'] = core.profiler.summary()
+        result['cpu'] = {
+            'seconds': cpu_used,
+            'utilisation': cpu_used / result['seconds'] if result['seconds'] > 0 else 0.0,  # 1.0 = one core busy
+            'utilisation_per_core': cpu_used / result['seconds'] / (os.cpu_count() or 1) if result['seconds'] > 0 else 0.0,
+        }
+    finally:
+        core.close()
+
+    report = {
+        'benchmark': 'pipeline',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': sys.version.split()[0],
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'parameters': {
+            'source': source or 'synthetic',
+            'frames': len(frame_list),
+            'frame_size': list(frame_list[0].shape[:2]) if frame_list else None,
+            'workers': workers,
+            'fps': fps,
+            'scale': scale,
+            'detection_model': core.detection_model,
+            'encoding_model': core.encoding_model,
+            'motion_gate': core.motion_options is not False,
+            'gallery_size': len(core.gallery),
+        },
+        'load_seconds': load_seconds,
+        'result': result,
+    }
+    if verbose:
+        print(f"[INFO] {result['frames_processed']} frames in {result['seconds']:.2f}s "
+              f"({result['fps']:.1f} FPS), latency p50 {result['latency']['p50_ms']:.1f} ms "
+              f"p99 {result['latency']['p99_ms']:.1f} ms, CPU {result['cpu']['utilisation'] * 100:.0f}%")
+        for name, stage in sorted(result['stages'].items(), key=lambda item: -item[1]['total_seconds']):
+            print(f"[INFO]   {name:<8} {stage['mean_ms']:8.2f} ms/call  {stage['share'] * 100:5.1f}%")
+    return report
+
+
+def main(argv=None):
+    """
+    Command line entry point: replay frames through the attendance path and write a JSON report.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the full attendance pipeline on replayed frames")
+    parser.add_argument('--source', help="Clip or image directory to replay (default: synthetic frames)")
+    parser.add_argument('--config', help="Configuration file (defaults to $BIOAUTH_CONFIG or config.json)")
+    parser.add_argument('--frames', type=int, default=300, help="Frames replayed")
+    parser.add_argument('--width', type=int, default=1280, help="Synthetic frame width")
+    parser.add_argument('--height', type=int, default=720, help="Synthetic frame height")
+    parser.add_argument('--face-image', help="Face pasted into synthetic frames (default: first dataset image)")
+    parser.add_argument('--gallery-size', type=int, help="Use a synthetic gallery of this size")
+    parser.add_argument('--workers', type=int, default=1, help="Inference threads; 1 replays sequentially")
+    parser.add_argument('--fps', type=float, help=f"Delivery rate when --workers > 1 (default: clip rate or {DEFAULT_REPLAY_FPS:g})")
+    parser.add_argument('--scale', type=float, help="Fixed detection scale (default: adaptive)")
+    parser.add_argument('--detection-model', choices=('hog', 'cnn'))
+    parser.add_argument('--encoding-model', choices=('small', 'large'))
+    parser.add_argument('--motion-gate', choices=('on', 'off'), help="Override the configured motion gate")
+    parser.add_argument('--warmup', type=int, default=10, help="Frames processed before measuring")
+    parser.add_argument('-o', '--output', default='benchmark_pipeline.json', help="JSON report file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        load_config(args.config),
+        source=args.source,
+        frames=args.frames,
+        width=args.width,
+        height=args.height,
+        face_image=args.face_image,
+        gallery_size=args.gallery_size,
+        workers=args.workers,
+        fps=args.fps,
+        scale=args.scale,
+        detection_model=args.detection_model,
+        encoding_model=args.encoding_model,
+        motion_gate=None if args.motion_gate is None else args.motion_gate == 'on',
+        warmup=args.warmup,
+    )
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# Import necessary libraries
+import os  # For environment variable overrides
+import json  # For reading the configuration file
+import typing  # For inspecting Optional[...] field types
+from dataclasses import dataclass, field, fields, asdict  # Typed configuration sections
+
+# Environment variables named BIOAUTH_<SECTION>_<SETTING> override the file,
+# e.g. BIOAUTH_DETECTION_INITIAL_SCALE=0.5 or BIOAUTH_PATHS_DATASET_DIR=/srv/dataset
+ENV_PREFIX = 'BIOAUTH_'
+CONFIG_ENV = 'BIOAUTH_CONFIG'  # Path of the configuration file
+DEFAULT_CONFIG_FILE = 'config.json'
+
+# Settings restricted to a fixed set of values, checked when the configuration is loaded
+CHOICES = {
+    ('recognition', 'detection_model'): ('hog', 'cnn'),
+    ('recognition', 'encoding_model'): ('small', 'large'),
+    ('recognition', 'index_backend'): ('exact', 'ivf'),
+}
+
+
+@dataclass
+class PathsConfig:
+    dataset_dir: str = 'dataset'  # One sub-folder of face images per person
+    cache_dir: str = '.encoding_cache'  # Encoding cache, search index and compact gallery
+    attendance_db: str = 'attendance.db'  # SQLite attendance database
+    admins_file: str = 'admins.txt'  # One admin name per line
+    logo: str = 'logo.png'
+
+
+@dataclass
+class RecognitionConfig:
+    tolerance: float = 0.5  # Maximum face distance counted as a match
+    detection_model: str = 'hog'  # face_recognition detector: 'hog' (CPU) or 'cnn' (GPU)
+    encoding_model: str = 'small'  # face_recognition landmark model: 'small' or 'large'
+    index_backend: str = 'exact'  # Gallery search: 'exact' or 'ivf'
+    index_options: dict = field(default_factory=dict)  # e.g. {"n_lists": 512, "n_probe": 16}
+    compaction: typing.Optional[dict] = None  # e.g. {"max_prototypes": 3}; null disables it
+    reload_interval: float = 2.0  # Seconds between dataset polls for hot reload; 0 disables it
+
+
+@dataclass
+class DetectionConfig:
+    initial_scale: float = 0.25  # Detection scale of the first frame
+    min_scale: float = 0.15
+    max_scale: float = 1.0
+    target_latency: float = 0.08  # Seconds of detection per frame the scaler aims for
+    full_frame_interval: int = 15  # Frames between whole-frame searches while faces are tracked
+    motion_gate: bool = True  # Skip detection while the scene is static
+    motion_sensitivity: int = 25
+    motion_max_skip: int = 30
+
+
+@dataclass
+class WorkersConfig:
+    encode_workers: int = 0  # Processes encoding dataset images; 0 uses every CPU core
+    encode_chunk_size: int = 4
+    inference_workers: int = 1  # Threads running recognition in the attendance loop
+    camera_workers: int = 0  # Threads shared by the service's cameras; 0 uses one per camera
+
+
+@dataclass
+class AttendanceConfig:
+    batch_size: int = 64  # Records written per database transaction
+    flush_interval: float = 0.5  # Seconds a record may wait for a batch
+    fsync_interval: float = 2.0  # Minimum seconds between checkpoints
+
+
+@dataclass
+class UIConfig:
+    camera_index: int = -1  # -1 picks the camera automatically
+    admin_timeout: float = 10.0  # Seconds allowed for admin face verification
+    splash_delay_ms: int = 3000  # Splash screen duration
+
+
+@dataclass
+class ServiceConfig:
+    host: str = '127.0.0.1'  # Interface of the headless service API; the API is unauthenticated
+    port: int = 8765  # 0 disables the TCP listener
+    unix_socket: typing.Optional[str] = None  # Also serve the API on this socket path
+    max_body_mb: int = 10  # Largest accepted request body
+    sources: list = field(default_factory=list)  # Cameras / files / URLs, e.g. [0, 1, "rtsp://..."] or ["auto"]
+
+
+@dataclass
+class AppConfig:
+    paths: PathsConfig = field(default_factory=PathsConfig)
+    recognition: RecognitionConfig = field(default_factory=RecognitionConfig)
+    detection: DetectionConfig = field(default_factory=DetectionConfig)
+    workers: WorkersConfig = field(default_factory=WorkersConfig)
+    attendance: AttendanceConfig = field(default_factory=AttendanceConfig)
+    ui: UIConfig = field(default_factory=UIConfig)
+    service: ServiceConfig = field(default_factory=ServiceConfig)
+
+    def to_dict(self):
+        """
+        Return the configuration as plain nested dictionaries (the config.json layout).
+        """
+        return asdict(self)
+
+
+def _convert(value, field_type):
+    """
+    Convert an environment variable string to the type of a configuration field.
+    """
+    if typing.get_origin(field_type) is typing.Union:
+        if value.strip().lower() in ('', 'none', 'null'):
+            return None
+        field_type = next(t for t in typing.get_args(field_type) if t is not type(None))
+    if field_type is bool:
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    if field_type is dict:
+        return json.loads(value)
+    if field_type is list:
+        # JSON list, or comma separated values: BIOAUTH_SERVICE_SOURCES=0,1,2
+        return json.loads(value) if value.strip().startswith('[') else [v.strip() for v in value.split(',') if v.strip()]
+    return field_type(value)
+
+
+def _check(value, field_type):
+    """
+    Check a value read from the JSON file against the type of a configuration field,
+    converting strings the way environment variables are converted.
+
+    Returns:
+    The value with the field's type. Raises TypeError or ValueError when it does not fit.
+    """
+    if typing.get_origin(field_type) is typing.Union:
+        if value is None:
+            return None
+        field_type = next(t for t in typing.get_args(field_type) if t is not type(None))
+    if isinstance(value, str) and field_type is not str:
+        return _convert(value, field_type)
+    if field_type is float and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, field_type) or (field_type is int and isinstance(value, bool)):
+        raise TypeError(f"expected {field_type.__name__}, got {type(value).__name__}")
+    return value
+
+
+def load_config(path=None, environ=None):
+    """
+    Load the application configuration.
+    Defaults are overridden by the JSON file, which is overridden by environment variables.
+
+    Parameters:
+    path (str): Configuration file. Defaults to $BIOAUTH_CONFIG or config.json; a missing file is fine.
+    environ (dict): Environment to read overrides from. Defaults to os.environ.
+
+    Returns:
+    AppConfig: The merged configuration.
+    """
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(CONFIG_ENV, DEFAULT_CONFIG_FILE)
+    config = AppConfig()
+
+    data = {}
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+    sections = {f.name for f in fields(config)}
+    for name in data:
+        if name not in sections:
+            raise ValueError(f"Unknown configuration section in {path}: {name}")
+
+    for section_field in fields(config):
+        section = getattr(config, section_field.name)
+        values = data.get(section_field.name, {})
+        unknown = set(values) - {f.name for f in fields(section)}
+        if unknown:
+            raise ValueError(f"Unknown {section_field.name} settings in {path}: {', '.join(sorted(unknown))}")
+        for setting in fields(section):
+            if setting.name in values:
+                try:
+                    setattr(section, setting.name, _check(values[setting.name], setting.type))
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"Invalid {section_field.name}.{setting.name} in {path}: "
+                                     f"{values[setting.name]!r} ({e})") from None
+            env_name = f'{ENV_PREFIX}{section_field.name}_{setting.name}'.upper()
+            if env_name in environ:
+                try:
+                    setattr(section, setting.name, _convert(environ[env_name], setting.type))
+                except ValueError as e:
+                    raise ValueError(f"Invalid {env_name}: {environ[env_name]!r} ({e})") from None
+
+    for (section_name, setting_name), allowed in CHOICES.items():
+        value = getattr(getattr(config, section_name), setting_name)
+        if value not in allowed:
+            raise ValueError(f"Invalid {section_name}.{setting_name}: {value!r} (expected one of {', '.join(allowed)})")
+    return config
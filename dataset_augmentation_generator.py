@@ -1,18 +1,28 @@
 import cv2
 import os
+import re
+import json
+import time
+import zlib
+import argparse
 import numpy as np
 from PIL import Image, ImageEnhance
+from concurrent.futures import ProcessPoolExecutor
+
+from config import load_config
+
+MANIFEST_FILE = 'augmentation_manifest.json'  # Written in the dataset root
+SOURCE_EXTENSIONS = ('.jpg', '.png')
 
-# Dataset path
-dataset_path = r'D:\s8\final project\other resource\xom\dataset'
 
 # Add Gaussian noise
-def add_noise(img):
+def add_noise(img, rng=None):
+    rng = rng or np.random
     row, col = img.shape
     mean = 0
     var = 10
     sigma = var**0.5
-    gauss = np.random.normal(mean, sigma, (row, col))
+    gauss = rng.normal(mean, sigma, (row, col))
     noisy = img + gauss
     noisy = np.clip(noisy, 0, 255).astype('uint8')
     return noisy
@@ -27,59 +37,307 @@ def zoom(img, scale=1.2):
     zoomed = cv2.resize(cropped, (w, h))
     return zoomed
 
-# Augment each image with multiple filters
-def augment_image(img, image_path, count, save_folder):
-    base_name = os.path.splitext(os.path.basename(image_path))[0]
+# Rotate around the centre
+def rotate(img, angle=15):
+    rows, cols = img.shape
+    M = cv2.getRotationMatrix2D((cols/2, rows/2), angle, 1)
+    return cv2.warpAffine(img, M, (cols, rows))
 
-    # 1. Flip
-    flipped = cv2.flip(img, 1)
-    cv2.imwrite(os.path.join(save_folder, f'{base_name}_flip{count}.jpg'), flipped)
+# Brightness and contrast through PIL's enhancers
+def enhance(img, enhancer, factor):
+    return np.asarray(enhancer(Image.fromarray(img)).enhance(factor))
 
-    # 2. Rotate
-    rows, cols = img.shape
-    M = cv2.getRotationMatrix2D((cols/2, rows/2), 15, 1)
-    rotated = cv2.warpAffine(img, M, (cols, rows))
-    cv2.imwrite(os.path.join(save_folder, f'{base_name}_rot{count}.jpg'), rotated)
-
-    # 3. Brightness
-    pil_img = Image.fromarray(img)
-    bright = ImageEnhance.Brightness(pil_img).enhance(1.4)
-    bright.save(os.path.join(save_folder, f'{base_name}_bright{count}.jpg'))
-
-    # 4. Blur
-    blur = cv2.GaussianBlur(img, (5, 5), 0)
-    cv2.imwrite(os.path.join(save_folder, f'{base_name}_blur{count}.jpg'), blur)
-
-    # 5. Contrast
-    contrast = ImageEnhance.Contrast(pil_img).enhance(1.5)
-    contrast.save(os.path.join(save_folder, f'{base_name}_contrast{count}.jpg'))
-
-    # 6. Zoom
-    zoomed = zoom(img)
-    cv2.imwrite(os.path.join(save_folder, f'{base_name}_zoom{count}.jpg'), zoomed)
-
-    # 7. Inverted grayscale
-    inverted = cv2.bitwise_not(img)
-    cv2.imwrite(os.path.join(save_folder, f'{base_name}_invert{count}.jpg'), inverted)
-
-    # 8. Noise
-    noisy = add_noise(img)
-    cv2.imwrite(os.path.join(save_folder, f'{base_name}_noise{count}.jpg'), noisy)
-
-# Loop through user folders
-for user_folder in os.listdir(dataset_path):
-    user_path = os.path.join(dataset_path, user_folder)
-    if not os.path.isdir(user_path):
-        continue
-
-    print(f"[INFO] Augmenting images in: {user_folder}")
-    count = 1
-    for img_file in os.listdir(user_path):
-        if img_file.lower().endswith(('.jpg', '.png')):
-            img_path = os.path.join(user_path, img_file)
-            img = cv2.imread(img_path, cv2.IMREAD_GRAYSCALE)
-            if img is not None:
-                augment_image(img, img_path, count, user_path)
-                count += 1
-
-print("[INFO] Advanced data augmentation completed.")
+
+# Every available variant, keyed by the suffix of its output file. Each transform
+# takes the grayscale source and a random generator seeded from the source path.
+TRANSFORMS = {
+    'flip': lambda img, rng: cv2.flip(img, 1),
+    'rot': lambda img, rng: rotate(img),
+    'bright': lambda img, rng: enhance(img, ImageEnhance.Brightness, 1.4),
+    'blur': lambda img, rng: cv2.GaussianBlur(img, (5, 5), 0),
+    'contrast': lambda img, rng: enhance(img, ImageEnhance.Contrast, 1.5),
+    'zoom': lambda img, rng: zoom(img),
+    'invert': lambda img, rng: cv2.bitwise_not(img),
+    'noise': lambda img, rng: add_noise(img, rng),
+}
+
+# Numbered variants written by the old script, e.g. 'alice_flip3.jpg'. Variants written since
+# are recognized by their manifest entry, so real images may end in '_rot', '_blur' and so on.
+LEGACY_NAME = re.compile(r'^(?P<stem>.+)_(%s)\d+\.jpg$' % '|'.join(TRANSFORMS))
+
+
+def output_name(image_name, transform):
+    """
+    Return the file name of one variant of a source image. The variant keeps the
+    source's extension, so 'x.jpg' and 'x.png' never overwrite each other's variants.
+    """
+    stem, ext = os.path.splitext(image_name)
+    return f'{stem}_{transform}{ext.lower()}'
+
+
+def augment_file(img_path, transforms, jpeg_quality=95):
+    """
+    Generate the requested variants of one source image.
+    Runs inside the worker processes, so it must stay a module-level function.
+
+    Parameters:
+    img_path (str): Source image.
+    transforms (list): Names of the TRANSFORMS to apply.
+    jpeg_quality (int): JPEG quality of the written variants.
+
+    Returns:
+    list: Names of the transforms written; empty if the image could not be read.
+    """
+    img = cv2.imread(img_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return []
+
+    # Seeded from the path so re-generating a variant gives the same image
+    rng = np.random.RandomState(zlib.crc32(img_path.replace('\\', '/').encode()))
+    folder, image_name = os.path.split(img_path)
+    written = []
+    params = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality] if image_name.lower().endswith('.jpg') else []
+    for transform in transforms:
+        variant = TRANSFORMS[transform](img, rng)
+        cv2.imwrite(os.path.join(folder, output_name(image_name, transform)), variant, params)
+        written.append(transform)
+    return written
+
+
+def _augment_task(task):
+    img_path, transforms, jpeg_quality = task
+    return augment_file(img_path, transforms, jpeg_quality)
+
+
+# Define an augmentation pipeline that fans the dataset out over a pool of worker processes
+class DatasetAugmenter:
+    def __init__(self, transforms=None, workers=None, chunk_size=4, jpeg_quality=95):
+        """
+        Initialize the DatasetAugmenter class.
+
+        Parameters:
+        transforms (list): Names of the TRANSFORMS to generate. Defaults to all of them.
+        workers (int): Worker processes. Defaults to the number of CPU cores;
+                       1 augments serially in the calling process.
+        chunk_size (int): Source images handed to a worker per task.
+        jpeg_quality (int): JPEG quality of the written variants.
+        """
+        transforms = list(transforms or TRANSFORMS)
+        unknown = [t for t in transforms if t not in TRANSFORMS]
+        if unknown:
+            raise ValueError(f"Unknown transforms: {', '.join(unknown)} (available: {', '.join(TRANSFORMS)})")
+        self.transforms = transforms
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.jpeg_quality = jpeg_quality
+        self.last_stats = {}
+
+    @staticmethod
+    def load_manifest(dataset_dir):
+        """
+        Return the manifest of generated variants: output path -> source, transform and source stat.
+        """
+        try:
+            with open(os.path.join(dataset_dir, MANIFEST_FILE), 'r') as f:
+                return json.load(f).get('variants', {})
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def save_manifest(dataset_dir, variants):
+        path = os.path.join(dataset_dir, MANIFEST_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'version': 1, 'variants': variants}, f, indent=1, sort_keys=True)
+        os.replace(path + '.tmp', path)  # Never leave a half-written manifest
+
+    @staticmethod
+    def legacy_variants(dataset_dir, manifest):
+        """
+        Find the numbered '<stem>_<transform><n>.jpg' variants of the old script: files that
+        match that name, are not in the manifest and sit next to their source image.
+
+        Returns:
+        list: Paths relative to the dataset directory.
+        """
+        found = []
+        for user_folder in sorted(os.listdir(dataset_dir)):
+            user_path = os.path.join(dataset_dir, user_folder)
+            if not os.path.isdir(user_path):
+                continue
+            files = os.listdir(user_path)
+            stems = {os.path.splitext(name)[0] for name in files if name.lower().endswith(SOURCE_EXTENSIONS)}
+            for name in sorted(files):
+                legacy = LEGACY_NAME.match(name)
+                rel_path = f'{user_folder}/{name}'
+                if legacy and legacy.group('stem') in stems and rel_path not in manifest:
+                    found.append(rel_path)
+        return found
+
+    @staticmethod
+    def remove_outdated(dataset_dir, manifest, legacy=()):
+        """
+        Delete variants recorded in the manifest under an earlier naming, plus the given
+        legacy variants. Keeping them next to the current variants would give the gallery
+        duplicate encodings of every variant. run() regenerates them.
+
+        Parameters:
+        dataset_dir (str): Directory with one sub-folder of images per person.
+        manifest (dict): Manifest entries; outdated ones are dropped in place.
+        legacy (sequence): Relative paths from legacy_variants() to delete as well.
+
+        Returns:
+        int: Number of files removed.
+        """
+        removed = 0
+        for out_rel, entry in list(manifest.items()):
+            if out_rel.rsplit('/', 1)[-1] != output_name(entry['source'].rsplit('/', 1)[-1], entry['transform']):
+                del manifest[out_rel]
+                path = os.path.join(dataset_dir, *out_rel.split('/'))
+                if os.path.exists(path):
+                    os.remove(path)
+                    removed += 1
+
+        for rel_path in legacy:
+            path = os.path.join(dataset_dir, *rel_path.split('/'))
+            if os.path.exists(path):
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def plan(self, dataset_dir, manifest, force=False, exclude=()):
+        """
+        Find the variants that are missing or older than their source.
+        Every image that is not a variant listed in the manifest (or in exclude) is a source.
+
+        Returns:
+        list: (source path, relative source path, source stat, transforms to generate) for
+              every source image; the transform list is empty when the source is up to date.
+        """
+        generated = set(manifest) | set(exclude)
+        tasks = []
+        for user_folder in sorted(os.listdir(dataset_dir)):
+            user_path = os.path.join(dataset_dir, user_folder)
+            if not os.path.isdir(user_path):
+                continue
+
+            for img_file in sorted(os.listdir(user_path)):
+                rel_path = f'{user_folder}/{img_file}'
+                stem, ext = os.path.splitext(img_file)
+                if ext.lower() not in SOURCE_EXTENSIONS or rel_path in generated:
+                    continue  # Not an image, or an augmented variant itself
+
+                img_path = os.path.join(user_path, img_file)
+                stat = os.stat(img_path)
+                source_stat = [stat.st_size, stat.st_mtime_ns]
+                todo = []
+                for transform in self.transforms:
+                    out_rel = f'{user_folder}/{output_name(img_file, transform)}'
+                    entry = manifest.get(out_rel)
+                    up_to_date = (entry is not None and entry['source'] == rel_path
+                                  and entry['source_stat'] == source_stat
+                                  and os.path.exists(os.path.join(user_path, output_name(img_file, transform))))
+                    if force or not up_to_date:
+                        todo.append(transform)
+                tasks.append((img_path, rel_path, source_stat, todo))
+        return tasks
+
+    def run(self, dataset_dir, force=False, verbose=True, progress_interval=2.0, remove_legacy=False):
+        """
+        Generate every missing variant of every source image in the dataset.
+        Variants already listed in the manifest for an unchanged source are skipped,
+        so running it again only processes new or modified images.
+
+        Parameters:
+        dataset_dir (str): Directory with one sub-folder of images per person.
+        force (bool): Regenerate every variant.
+        verbose (bool): Print progress and the achieved throughput.
+        progress_interval (float): Seconds between progress lines.
+        remove_legacy (bool): Delete the numbered variants of the old script. Otherwise they
+                              are left alone and only kept from being augmented themselves.
+
+        Returns:
+        dict: Sources processed and skipped, variants written and outdated variants removed,
+              seconds and images/sec.
+        """
+        start_time = time.perf_counter()
+        manifest = self.load_manifest(dataset_dir)
+        legacy = self.legacy_variants(dataset_dir, manifest)
+        removed = self.remove_outdated(dataset_dir, manifest, legacy if remove_legacy else ())
+        if removed and verbose:
+            print(f"[INFO] Removed {removed} variants with outdated names")
+        if legacy and not remove_legacy and verbose:
+            print(f"[WARN] {len(legacy)} numbered variants from an older version were found (e.g. {legacy[0]}); "
+                  f"they duplicate the current variants in the gallery. Delete them with --remove-legacy")
+        sources = self.plan(dataset_dir, manifest, force, exclude=[] if remove_legacy else legacy)
+        tasks = [task for task in sources if task[3]]
+        skipped = len(sources) - len(tasks)
+
+        written = 0
+        done = 0
+        last_report = start_time
+        work = [(img_path, todo, self.jpeg_quality) for img_path, _, _, todo in tasks]
+        workers = min(self.workers, len(work))
+        if workers <= 1:
+            results = map(_augment_task, work)  # Not worth spawning processes for a single worker
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_augment_task, work, chunksize=self.chunk_size)
+        try:
+            for (_, rel_path, source_stat, _), transforms in zip(tasks, results):
+                user_folder, img_file = rel_path.split('/', 1)
+                for transform in transforms:
+                    manifest[f'{user_folder}/{output_name(img_file, transform)}'] = {
+                        'source': rel_path, 'transform': transform, 'source_stat': source_stat}
+                written += len(transforms)
+                done += 1
+                now = time.perf_counter()
+                if verbose and now - last_report >= progress_interval:
+                    last_report = now
+                    print(f"[INFO] {done}/{len(tasks)} images augmented "
+                          f"({done / (now - start_time):.1f} images/sec)")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            self.save_manifest(dataset_dir, manifest)  # Keep the progress of an interrupted run
+
+        elapsed = time.perf_counter() - start_time
+        self.last_stats = {
+            'sources': len(tasks),
+            'skipped': skipped,
+            'variants': written,
+            'removed': removed,
+            'seconds': elapsed,
+            'images_per_sec': len(tasks) / elapsed if elapsed > 0 else 0.0,
+        }
+        if verbose:
+            print(f"[INFO] Augmented {len(tasks)} images ({written} variants, {skipped} up to date) "
+                  f"with {max(workers, 1)} worker(s) in {elapsed:.2f}s "
+                  f"({self.last_stats['images_per_sec']:.1f} images/sec)")
+        return self.last_stats
+
+
+def main(argv=None):
+    """
+    Command line entry point: augment the configured dataset.
+    """
+    parser = argparse.ArgumentParser(description="Generate augmented variants of the face dataset")
+    parser.add_argument('--dataset', help="Dataset directory (defaults to paths.dataset_dir of the configuration)")
+    parser.add_argument('--transforms', help=f"Comma separated subset of: {', '.join(TRANSFORMS)}")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (defaults to all CPU cores)")
+    parser.add_argument('--chunk-size', type=int, default=4, help="Images handed to a worker per task")
+    parser.add_argument('--force', action='store_true', help="Regenerate variants that are up to date")
+    parser.add_argument('--remove-legacy', action='store_true',
+                        help="Delete numbered variants (<image>_flip1.jpg) written by older versions")
+    args = parser.parse_args(argv)
+
+    # Dataset path, shared with the rest of the application through config.json / BIOAUTH_PATHS_DATASET_DIR
+    dataset_path = args.dataset or load_config().paths.dataset_dir
+    transforms = [t.strip() for t in args.transforms.split(',') if t.strip()] if args.transforms else None
+    augmenter = DatasetAugmenter(transforms, workers=args.workers, chunk_size=args.chunk_size)
+    augmenter.run(dataset_path, force=args.force, remove_legacy=args.remove_legacy)
+    print("[INFO] Advanced data augmentation completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# Import necessary libraries
+import os  # For file system access (stat, paths, atomic replace)
+import json  # For reading and writing the cache index
+import hashlib  # For content hashing of dataset images
+import numpy as np  # NumPy for storing the encoding matrix on disk
+
+
+# Define a class to persist face encodings between application launches
+class EncodingCache:
+    INDEX_FILE = 'index.json'  # Metadata describing every cached image
+    MATRIX_FILE = 'encodings.npy'  # One row per cached face encoding
+
+    def __init__(self, cache_dir='.encoding_cache', model='small'):
+        """
+        Initialize the EncodingCache class.
+
+        Parameters:
+        cache_dir (str): Directory where the encoding index and matrix are stored.
+        model (str): face_recognition encoding model the cached encodings were computed with.
+                     A cache written with another model is discarded on load.
+        """
+        self.cache_dir = cache_dir
+        self.model = model
+        self._entries = {}  # (person, relative path) -> entry dict
+        self._matrix = None  # Memory-mapped encoding matrix from the last save
+        self._seen = set()  # Keys visited during the current pass
+        self._dirty = False  # True when the cache on disk must be rewritten
+        self.hits = 0  # Number of images served from the cache
+        self.misses = 0  # Number of images that had to be re-encoded
+
+    @staticmethod
+    def file_hash(path, chunk_size=1 << 20):
+        """
+        Compute the SHA-1 hash of a file's content.
+
+        Parameters:
+        path (str): Path of the file to hash.
+        chunk_size (int): Number of bytes read per iteration.
+
+        Returns:
+        str: Hexadecimal digest of the file content.
+        """
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self):
+        """
+        Load the cache index and memory-map the encoding matrix from disk.
+        A missing or unreadable cache simply starts empty.
+        """
+        self._entries = {}
+        self._matrix = None
+        self._seen = set()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        matrix_path = os.path.join(self.cache_dir, self.MATRIX_FILE)
+        if not os.path.exists(index_path) or not os.path.exists(matrix_path):
+            return
+
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            # Memory-map the matrix so cold start does not read every row up front
+            self._matrix = np.load(matrix_path, mmap_mode='r')
+        except (OSError, ValueError):
+            # A corrupt cache is rebuilt from scratch on the next save
+            self._entries = {}
+            self._matrix = None
+            self._dirty = True
+            return
+
+        if index.get('model', 'small') != self.model:
+            # Encodings of another model are not comparable: re-encode everything
+            self._matrix = None
+            self._dirty = True
+            return
+
+        for entry in index.get('entries', []):
+            self._entries[(entry['person'], entry['path'])] = entry
+
+    def get(self, person, rel_path, abs_path):
+        """
+        Look up the cached encoding of an image, validating it against the file on disk.
+
+        Parameters:
+        person (str): Name of the person the image belongs to.
+        rel_path (str): Path of the image relative to the dataset directory (cache key).
+        abs_path (str): Path used to stat and hash the image.
+
+        Returns:
+        tuple: (found, encoding) where encoding is None if the image contains no face.
+        """
+        key = (person, rel_path)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        stat = os.stat(abs_path)
+        if stat.st_size != entry['size']:
+            self.misses += 1
+            return False, None
+
+        if stat.st_mtime_ns != entry['mtime']:
+            # The file was touched: only a content change invalidates the entry
+            if self.file_hash(abs_path) != entry['sha1']:
+                self.misses += 1
+                return False, None
+            entry['mtime'] = stat.st_mtime_ns
+            self._dirty = True
+
+        self.hits += 1
+        if entry['row'] < 0:
+            return True, None
+        return True, np.array(self._matrix[entry['row']], dtype=np.float64)
+
+    def put(self, person, rel_path, abs_path, encoding):
+        """
+        Store the encoding of a freshly processed image.
+
+        Parameters:
+        person (str): Name of the person the image belongs to.
+        rel_path (str): Path of the image relative to the dataset directory (cache key).
+        abs_path (str): Path used to stat and hash the image.
+        encoding (numpy.ndarray or None): The face encoding, or None if no face was found.
+        """
+        key = (person, rel_path)
+        stat = os.stat(abs_path)
+        self._seen.add(key)
+        self._entries[key] = {
+            'person': person,
+            'path': rel_path,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'sha1': self.file_hash(abs_path),
+            'encoding': None if encoding is None else np.asarray(encoding, dtype=np.float64),
+        }
+        self._dirty = True
+
+    def save(self, prune=True):
+        """
+        Write the cache back to disk if anything changed during this pass.
+
+        Parameters:
+        prune (bool): Drop entries for images that were not visited since load(),
+                      i.e. images that no longer exist in the dataset. Pass False
+                      after a partial pass such as enrolling a single person.
+        """
+        stale = [key for key in self._entries if key not in self._seen] if prune else []
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._dirty = True
+        if not self._dirty:
+            return
+
+        # Gather every encoding into a fresh contiguous matrix
+        rows = []
+        index = []
+        for key in sorted(self._entries):
+            entry = self._entries[key]
+            if 'encoding' in entry:
+                encoding = entry['encoding']
+            elif entry['row'] >= 0:
+                encoding = np.array(self._matrix[entry['row']], dtype=np.float64)
+            else:
+                encoding = None
+
+            row = -1
+            if encoding is not None:
+                row = len(rows)
+                rows.append(encoding)
+            index.append({
+                'person': entry['person'],
+                'path': entry['path'],
+                'size': entry['size'],
+                'mtime': entry['mtime'],
+                'sha1': entry['sha1'],
+                'row': row,
+            })
+
+        matrix = np.vstack(rows) if rows else np.empty((0, 128), dtype=np.float64)
+        self._matrix = None  # Release the memory map before replacing the file
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        matrix_path = os.path.join(self.cache_dir, self.MATRIX_FILE)
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+
+        # Write to temporary files first so a crash never leaves a half-written cache
+        with open(matrix_path + '.tmp', 'wb') as f:
+            np.save(f, matrix)
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump({'version': 1, 'model': self.model, 'entries': index}, f)
+        os.replace(matrix_path + '.tmp', matrix_path)
+        os.replace(index_path + '.tmp', index_path)
+
+        # Re-key the in-memory entries to the rows that were just written
+        self._entries = {(e['person'], e['path']): e for e in index}
+        self._matrix = np.load(matrix_path, mmap_mode='r')
+        self._dirty = False
@@ -0,0 +1,78 @@
+# Import necessary libraries
+import os  # For detecting the number of available CPU cores
+import time  # For measuring encoding throughput
+from functools import partial  # Binds the encoding model for the worker processes
+from concurrent.futures import ProcessPoolExecutor  # Process pool for parallel encoding
+import face_recognition  # Face Recognition library for decoding images and computing encodings
+
+
+def encode_image_file(img_path, model='small'):
+    """
+    Decode an image file and compute the encoding of its first face.
+    Runs inside the worker processes, so it must stay a module-level function.
+
+    Parameters:
+    img_path (str): Path of the image to encode.
+    model (str): face_recognition landmark model, 'small' or 'large'.
+
+    Returns:
+    numpy.ndarray or None: The 128-d face encoding, or None if no face was found.
+    """
+    image = face_recognition.load_image_file(img_path)  # Load image file
+    encodings = face_recognition.face_encodings(image, model=model)  # Extract face encoding
+    return encodings[0] if encodings else None
+
+
+# Define a class that fans image encoding out over a pool of worker processes
+class ParallelEncoder:
+    def __init__(self, workers=None, chunk_size=4, model='small'):
+        """
+        Initialize the ParallelEncoder class.
+
+        Parameters:
+        workers (int): Number of worker processes. Defaults to the number of CPU cores;
+                       1 encodes serially in the calling process.
+        chunk_size (int): Number of images handed to a worker per task.
+        model (str): face_recognition landmark model, 'small' or 'large'.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.model = model
+        self.last_stats = {'images': 0, 'seconds': 0.0, 'images_per_sec': 0.0}
+
+    def encode(self, image_paths, verbose=True):
+        """
+        Encode a list of images, returning results in the same order as the input.
+
+        Parameters:
+        image_paths (list): Paths of the images to encode.
+        verbose (bool): Print the achieved throughput when finished.
+
+        Returns:
+        list: One encoding (or None when no face was found) per input path.
+        """
+        image_paths = list(image_paths)
+        if not image_paths:
+            return []
+
+        start_time = time.perf_counter()
+        encode = partial(encode_image_file, model=self.model)
+        workers = min(self.workers, len(image_paths))
+        if workers <= 1:
+            # Not worth spawning processes for a single worker
+            results = [encode(path) for path in image_paths]
+        else:
+            # executor.map keeps the results in submission order
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(encode, image_paths, chunksize=self.chunk_size))
+        elapsed = time.perf_counter() - start_time
+
+        self.last_stats = {
+            'images': len(image_paths),
+            'seconds': elapsed,
+            'images_per_sec': len(image_paths) / elapsed if elapsed > 0 else 0.0,
+        }
+        if verbose:
+            print(f"[INFO] Encoded {len(image_paths)} images with {workers} worker(s) "
+                  f"in {elapsed:.2f}s ({self.last_stats['images_per_sec']:.1f} images/sec)")
+        return results
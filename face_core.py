@@ -2,118 +2,744 @@
 import cv2  # OpenCV library for video capturing and drawing on frames
 import os  # For accessing the file system (folders, files)
 import numpy as np   # NumPy for numerical operations, used here for array handling
+import threading  # For guarding tracker state shared with the inference workers
+import time  # For measuring detection latency
+from contextlib import nullcontext  # Stage timing is a no-op unless a profiler is attached
+from collections import namedtuple  # Lightweight record for per-face results
 import face_recognition  # Face Recognition library for detecting and encoding faces
 from datetime import datetime  # For getting the current date and time
-from tkinter import messagebox, simpledialog  # For displaying GUI message boxes to the user
+from encoding_cache import EncodingCache  # Persistent on-disk store of dataset encodings
+from encoding_pipeline import ParallelEncoder  # Multi-process image encoding
+from gallery import FaceGallery  # Contiguous float32 matrix of known encodings
+from gallery_index import make_index  # Exact or approximate nearest-neighbour search backends
+from gallery_compaction import load_compact_gallery, person_prototypes  # Per-person prototype compaction
+from attendance_pipeline import FramePipeline  # Threaded capture / inference / render stages
+from face_tracker import FaceTracker  # Carries identities across frames to skip re-encoding
+from motion_gate import MotionGate  # Skips face detection while the scene is static
+from adaptive_scaler import AdaptiveScaler, face_regions  # Latency-driven detection scale and ROI crops
+from attendance_sink import AttendanceSink  # Background batched attendance writer
+from attendance_store import AttendanceStore  # SQLite attendance database
+from attendance_dedup import DailyAttendanceCache  # Restart-safe per-day de-duplication
 
-# Define a class to handle core face recognition functionalities
+# One recognized (or unknown) face: location is (top, right, bottom, left) in full-frame pixels
+Detection = namedtuple('Detection', ['location', 'name', 'matched', 'distance'])
+
+
+# Raised when a camera cannot be opened, so callers can tell it apart from other failures
+class CameraError(RuntimeError):
+    pass
+
+
+# Per-video-source recognition state. Every camera needs its own tracks, motion
+# baseline and detection scale, while the gallery and attendance sink are shared.
+class StreamState:
+    def __init__(self, motion_options=None, scaler_options=None):
+        """
+        Initialize the StreamState class.
+
+        Parameters:
+        motion_options (dict): MotionGate settings, or False to detect on every frame.
+        scaler_options (dict): AdaptiveScaler settings.
+        """
+        self.tracker = FaceTracker()  # Faces followed across this source's frames
+        self.lock = threading.Lock()  # Guards the tracker against concurrent inference workers
+        self.motion_gate = None if motion_options is False else MotionGate(**(motion_options or {}))
+        self.scaler = AdaptiveScaler(**(scaler_options or {}))  # Detection resolution of this source
+        self.frames_since_full = 0  # Frames since the last whole-frame detection
+        self.last_detections = []  # Shown again for frames gated out by the motion gate
+
+
+# Define a class to handle core face recognition functionalities.
+# It has no GUI dependencies, so it runs the same in the Tk app and the headless service.
 class FaceRecognitionCore:
-    def __init__(self, dataset_dir='dataset'):
+    def __init__(self, dataset_dir='dataset', cache_dir='.encoding_cache', encode_workers=None,
+                 index_backend='exact', index_options=None, compaction=None, inference_workers=1,
+                 motion_options=None, scaler_options=None, full_frame_interval=15,
+                 attendance_db='attendance.db', sink_options=None, tolerance=0.5,
+                 detection_model='hog', encoding_model='small', encode_chunk_size=4, known_faces=None):
         """
         Initialize the FaceRecognitionCore class.
 
         Parameters:
         dataset_dir (str): Directory where the known faces (dataset) are stored.
+        cache_dir (str): Directory of the persistent encoding cache.
+        encode_workers (int): Worker processes used to encode images. Defaults to all CPU cores.
+        index_backend (str): Gallery search backend, 'exact' or 'ivf' (approximate).
+        index_options (dict): Tuning knobs for the backend, e.g. {'n_lists': 512, 'n_probe': 16}.
+        compaction (dict): Enables matching against per-person prototypes instead of every
+                           image, e.g. {'max_prototypes': 3, 'method': 'centroid'}. None disables it.
+        inference_workers (int): Threads running detection and recognition in run_attendance.
+        motion_options (dict): MotionGate settings, e.g. {'sensitivity': 25, 'max_skip': 30}.
+                               Pass False to run detection on every frame.
+        scaler_options (dict): AdaptiveScaler settings, e.g. {'target_latency': 0.05}.
+        full_frame_interval (int): While faces are tracked, detection runs only around them;
+                                   the whole frame is searched every this many frames.
+        attendance_db (str): SQLite database attendance records are stored in. None makes a
+                             recognition-only engine that records nothing.
+        sink_options (dict): AttendanceSink settings, e.g. {'batch_size': 64, 'fsync_interval': 2.0}.
+        tolerance (float): Maximum face distance counted as a match.
+        detection_model (str): face_recognition detector, 'hog' or 'cnn'.
+        encoding_model (str): face_recognition landmark model, 'small' or 'large'.
+        encode_chunk_size (int): Images handed to an encoding worker per task.
+        known_faces (tuple): (encodings, names) matched against instead of loading the dataset,
+                             e.g. a gallery shipped to a worker process. Nothing is persisted.
         """
         self.dataset_dir = dataset_dir  # Directory path containing face images
-        self.known_face_encodings = []  # List to store face encodings
-        self.known_face_names = []  # List to store names corresponding to encodings
-        self.attendance_today = set()  # Set to keep track of who has been marked present today
-        self.load_known_faces()  # Load faces immediately upon initialization
+        self.encoding_cache = EncodingCache(cache_dir, model=encoding_model)  # Encodings reused between launches
+        self.index_backend = index_backend
+        self.index_options = index_options or {}
+        self.compaction = compaction
+        self.compact_path = os.path.join(cache_dir, 'compact_gallery.npz')  # Persisted prototypes
+        suffix = '_compact' if compaction else ''
+        self.index_path = os.path.join(cache_dir, f'gallery_index_{index_backend}{suffix}.npz')  # Persisted search index
+        self.tolerance = tolerance
+        self.detection_model = detection_model
+        self.encoding_model = encoding_model
+        # Parallel encoder for cache misses
+        self.encoder = ParallelEncoder(workers=encode_workers, chunk_size=encode_chunk_size, model=encoding_model)
+        self.full_gallery = FaceGallery()  # Every known face encoding and its name
+        self.gallery = self.full_gallery  # Gallery used for matching (compact when enabled)
+        # Serializes gallery updates (loading, enrollment, hot reload); matching never takes it
+        self._gallery_lock = threading.RLock()
+        self._dataset_state = {}  # Dataset snapshot the gallery was built from, see scan_dataset()
+        self.gallery_generation = 0  # Bumped on every gallery swap or update
+        self._admin_gallery = None  # Admin-only view of the gallery, see admin_gallery()
+        self._admin_gallery_key = None
+        self.admin_names = set()  # Names listed in the admins file at the last admin_gallery() call
+        self.attendance_store = self.attendance_sink = self.attendance_cache = None
+        if attendance_db is not None:
+            # Records are written by a background thread so disk stalls never block recognition
+            self.attendance_store = AttendanceStore(attendance_db)
+            self.attendance_sink = AttendanceSink(self.attendance_store, **(sink_options or {}))
+            # Who has been marked present today, warmed from the database and reset at midnight
+            self.attendance_cache = DailyAttendanceCache(self.attendance_store)
+        self.inference_workers = inference_workers
+        # Detection is skipped while nothing moves in front of the camera
+        self.motion_options = motion_options
+        self.scaler_options = scaler_options or {}
+        self.full_frame_interval = full_frame_interval
+        self.stream = self.new_stream()  # Tracks, motion gate and scale of run_attendance
+        self.profiler = None  # Optional StageProfiler timing every stage of analyze_frame
+        if known_faces is not None:
+            encodings, names = known_faces
+            self.full_gallery = self.gallery = FaceGallery.from_encodings(encodings, names)
+            self.gallery_generation += 1
+            self.gallery.index = make_index(index_backend, **self.index_options)
+            self.gallery.index.build(self.gallery.encodings)
+        else:
+            self.load_known_faces()  # Load faces immediately upon initialization
+
+    @classmethod
+    def from_config(cls, config, **overrides):
+        """
+        Create a FaceRecognitionCore from the application configuration.
+
+        Parameters:
+        config (AppConfig): Configuration returned by config.load_config().
+        overrides: Constructor arguments replacing the configured values (e.g. attendance_db).
+
+        Returns:
+        FaceRecognitionCore: The initialized core.
+        """
+        detection = config.detection
+        motion_options = False
+        if detection.motion_gate:
+            motion_options = {'sensitivity': detection.motion_sensitivity, 'max_skip': detection.motion_max_skip}
+        options = dict(
+            dataset_dir=config.paths.dataset_dir,
+            cache_dir=config.paths.cache_dir,
+            encode_workers=config.workers.encode_workers or None,
+            encode_chunk_size=config.workers.encode_chunk_size,
+            index_backend=config.recognition.index_backend,
+            index_options=config.recognition.index_options,
+            compaction=config.recognition.compaction,
+            inference_workers=config.workers.inference_workers,
+            motion_options=motion_options,
+            scaler_options={
+                'initial_scale': detection.initial_scale,
+                'min_scale': detection.min_scale,
+                'max_scale': detection.max_scale,
+                'target_latency': detection.target_latency,
+            },
+            full_frame_interval=detection.full_frame_interval,
+            attendance_db=config.paths.attendance_db,
+            sink_options={
+                'batch_size': config.attendance.batch_size,
+                'flush_interval': config.attendance.flush_interval,
+                'fsync_interval': config.attendance.fsync_interval,
+            },
+            tolerance=config.recognition.tolerance,
+            detection_model=config.recognition.detection_model,
+            encoding_model=config.recognition.encoding_model,
+        )
+        options.update(overrides)
+        return cls(**options)
+
+    def new_stream(self):
+        """
+        Create the per-source state for one more video source.
+
+        Returns:
+        StreamState: Fresh tracker, motion gate and scaler configured like this core.
+        """
+        return StreamState(self.motion_options, self.scaler_options)
+
+    @property
+    def attendance_today(self):
+        """set: Names already marked present today."""
+        return self.attendance_cache.present_today() if self.attendance_cache is not None else set()
+
+    @property
+    def known_face_encodings(self):
+        """numpy.ndarray: (N, 128) float32 matrix of known face encodings."""
+        return self.gallery.encodings
+
+    @property
+    def known_face_names(self):
+        """list: Names corresponding to the rows of known_face_encodings."""
+        return self.gallery.names
 
     def load_known_faces(self):
         """
-        Load all known faces from the dataset directory and compute their encodings.
+        Load all known faces from the dataset directory.
+        Encodings are served from the persistent cache and only new or changed
+        images are passed through the face encoder.
         """
-        for person_name in os.listdir(self.dataset_dir):
-            person_path = os.path.join(self.dataset_dir, person_name)
-            if not os.path.isdir(person_path):
+        with self._gallery_lock:
+            self.encoding_cache.load()
+            state = self.scan_dataset()
+            self.full_gallery, self.gallery = self._build_galleries(self._state_images(state))
+            self.gallery_generation += 1
+            self.encoding_cache.save()  # Persist new encodings and prune deleted images
+            self._dataset_state = state
+
+    def scan_dataset(self):
+        """
+        Take a snapshot of the dataset directory for change detection.
+        Every image is stat'ed: overwriting an image in place changes its size or
+        mtime but not the mtime of its folder, so folders cannot be skipped.
+
+        Returns:
+        dict: Person -> {image name: (size, mtime)}.
+        """
+        state = {}
+        for entry in os.scandir(self.dataset_dir):
+            if not entry.is_dir():
                 continue  # Skip if it's not a folder
+            state[entry.name] = self._scan_folder(entry.path)
+        return state
+
+    @staticmethod
+    def _scan_folder(path):
+        """
+        Return {image name: (size, mtime)} for the files of one person's folder.
+        """
+        files = {}
+        for image in os.scandir(path):
+            if image.is_file():
+                stat = image.stat()
+                files[image.name] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def _mark_enrolled(self, person_name, img_names):
+        """
+        Record freshly enrolled images in the dataset snapshot so the hot reload does
+        not add them a second time. Other changes in the folder are left for the reload.
+        """
+        files = dict(self._dataset_state.get(person_name, {}))
+        current = self._scan_folder(os.path.join(self.dataset_dir, person_name))
+        for img_name in img_names:
+            if img_name in current:
+                files[img_name] = current[img_name]
+        self._dataset_state[person_name] = files
 
-            # Iterate through each image in the person's folder
-            for img_name in os.listdir(person_path):
-                img_path = os.path.join(person_path, img_name)
-                image = face_recognition.load_image_file(img_path)  # Load image file
-                encodings = face_recognition.face_encodings(image)  # Extract face encoding
+    @property
+    def dataset_state(self):
+        """dict: Dataset snapshot the running gallery was built from."""
+        return self._dataset_state
 
-                if encodings:
-                    # If at least one face encoding is found, store the first one
-                    self.known_face_encodings.append(encodings[0])
-                    self.known_face_names.append(person_name)
+    def _state_images(self, state, names=None):
+        """
+        List the images of a dataset snapshot as (person, relative path, absolute path) tuples.
+
+        Parameters:
+        state (dict): Snapshot returned by scan_dataset().
+        names (set): (person, image name) pairs to keep. None keeps every image.
+        """
+        images = []
+        for person_name in sorted(state):
+            for img_name in sorted(state[person_name]):
+                if names is None or (person_name, img_name) in names:
+                    rel_path = f'{person_name}/{img_name}'  # Platform independent cache key
+                    images.append((person_name, rel_path, os.path.join(self.dataset_dir, person_name, img_name)))
+        return images
+
+    def _build_galleries(self, images):
+        """
+        Build the full gallery, the matching gallery and its index from a list of images.
+
+        Returns:
+        tuple: (full gallery, gallery used for matching).
+        """
+        # Build the gallery matrix once from every image that contains a face
+        encodings = self._encode_images(images)
+        known = [(encoding, image[0]) for image, encoding in zip(images, encodings) if encoding is not None]
+        full_gallery = FaceGallery.from_encodings([e for e, _ in known], [n for _, n in known])
+        gallery = full_gallery
+
+        if self.compaction:
+            # Match against a few prototypes per person instead of every augmented image
+            prototypes, names = load_compact_gallery(
+                self.compact_path, full_gallery.encodings, full_gallery.names, **self.compaction)
+            gallery = FaceGallery.from_encodings(prototypes, names)
+
+        self._attach_index(gallery)
+        return full_gallery, gallery
+
+    def reload_known_faces(self):
+        """
+        Bring the running gallery up to date with the dataset directory.
+        Added images are encoded and appended to the live gallery. When images were
+        deleted or changed, a new gallery is built from the encoding cache and swapped
+        in with a single assignment, so matching never sees a half-updated gallery.
+
+        Returns:
+        dict: Number of 'added' and 'removed' images (both 0 when nothing changed).
+        """
+        with self._gallery_lock:
+            old = self._dataset_state
+            state = self.scan_dataset()  # Rescanned under the lock
+            old_files = {(p, name): stat for p, files in old.items() for name, stat in files.items()}
+            new_files = {(p, name): stat for p, files in state.items() for name, stat in files.items()}
+            added = {key for key in new_files if key not in old_files}
+            removed = {key for key, stat in old_files.items() if new_files.get(key) != stat}
+            if not added and not removed:
+                self._dataset_state = state
+                return {'added': 0, 'removed': 0}
+
+            if not removed:
+                # Only new images: encode them and grow the live gallery in place
+                images = self._state_images(state, added)
+                encodings = self._encode_images(images)
+                self.encoding_cache.save(prune=False)
+                by_person = {}
+                for (person_name, _, _), encoding in zip(images, encodings):
+                    if encoding is not None:
+                        by_person.setdefault(person_name, []).append(encoding)
+                for person_name, person_encodings in by_person.items():
+                    self._add_person(person_name, person_encodings)
+            else:
+                # Rebuild from the cache (only changed images are re-encoded), then swap
+                self.encoding_cache.load()
+                full_gallery, gallery = self._build_galleries(self._state_images(state))
+                self.encoding_cache.save()
+                self.gallery = gallery
+                self.full_gallery = full_gallery
+                self.gallery_generation += 1
+            self._dataset_state = state
+            return {'added': len(added), 'removed': len(removed)}
+
+    def _encode_images(self, images):
+        """
+        Return the encoding of every image, serving cached encodings first and
+        encoding all cache misses across the worker pool.
+
+        Parameters:
+        images (list): (person, relative path, absolute path) tuples.
+
+        Returns:
+        list: One encoding (or None when no face was found) per image.
+        """
+        results = []
+        pending = []  # Indexes of images that missed the cache
+        for person_name, rel_path, img_path in images:
+            found, encoding = self.encoding_cache.get(person_name, rel_path, img_path)
+            if not found:
+                pending.append(len(results))
+            results.append(encoding)
+
+        encodings = self.encoder.encode([images[i][2] for i in pending])
+        for i, encoding in zip(pending, encodings):
+            person_name, rel_path, img_path = images[i]
+            results[i] = encoding
+            self.encoding_cache.put(person_name, rel_path, img_path, encoding)
+        return results
+
+    def admin_gallery(self, admins_file='admins.txt'):
+        """
+        Return a gallery holding only the encodings of the configured admins.
+        It is filtered from the already-loaded gallery and rebuilt only when
+        admins.txt or the loaded gallery changes.
+
+        Parameters:
+        admins_file (str): File listing one admin name per line.
+
+        Returns:
+        FaceGallery: The admin gallery; empty if no admins are configured or none of the
+                     listed admins has face encodings (see admin_names to tell them apart).
+        """
+        try:
+            stat = os.stat(admins_file)
+            file_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_key = None
+        key = (admins_file, file_key, self.gallery_generation)
+        if self._admin_gallery is not None and self._admin_gallery_key == key:
+            return self._admin_gallery
+
+        admins = set()
+        if file_key is not None:
+            with open(admins_file, 'r') as f:
+                admins = {line.strip() for line in f if line.strip()}
+
+        self.admin_names = admins
+        names = self.full_gallery.names
+        rows = [row for row, name in enumerate(names) if name in admins]
+        self._admin_gallery = FaceGallery.from_encodings(
+            self.full_gallery.encodings[rows], [names[row] for row in rows])
+        self._admin_gallery_key = key
+        return self._admin_gallery
+
+    def _attach_index(self, gallery):
+        index = make_index(self.index_backend, **self.index_options)
+        if not index.load(self.index_path, gallery.encodings):
+            index.build(gallery.encodings)
+            index.save(self.index_path, gallery.encodings)
+        gallery.index = index
+
+    def enroll_encodings(self, person_name, captures):
+        """
+        Insert encodings computed at capture time into the encoding cache and the
+        running gallery, so the person is recognized without encoding anything again.
+
+        Parameters:
+        person_name (str): Name of the person's folder inside the dataset directory.
+        captures (list): (image path, encoding) pairs of images already saved in that folder.
+                         An encoding of None records an image without a usable face.
+
+        Returns:
+        int: Number of encodings added to the gallery.
+        """
+        with self._gallery_lock:
+            # Images the hot reload already picked up are in the gallery
+            known = self._dataset_state.get(person_name, {})
+            encodings = []
+            added = []
+            for img_path, encoding in captures:
+                img_name = os.path.basename(img_path)
+                rel_path = f'{person_name}/{img_name}'  # Same key as _state_images
+                self.encoding_cache.put(person_name, rel_path, img_path, encoding)
+                if img_name not in known:
+                    if encoding is not None:
+                        encodings.append(encoding)
+                    added.append(img_name)
+            self.encoding_cache.save(prune=False)
+            self._mark_enrolled(person_name, added)
+            return self._add_person(person_name, encodings)
+
+    def _add_person(self, person_name, encodings):
+        """
+        Append one person's encodings to the galleries and persist the updated index.
+        """
+        self.full_gallery.add_many(encodings, [person_name] * len(encodings))
+        if self.gallery is not self.full_gallery and encodings:
+            prototypes = person_prototypes(encodings, **self.compaction)
+            self.gallery.add_many(prototypes, [person_name] * len(prototypes))
+        self.gallery_generation += 1
+        self.gallery.index.save(self.index_path, self.gallery.encodings)
+        return len(encodings)
 
-    def mark_attendance(self, name):
+    def profile_stage(self, name):
         """
-        Mark the attendance of the recognized person into a CSV file.
+        Time a stage with the attached profiler, if any. Callers outside the engine
+        (e.g. a UI drawing the results) can time their own stages the same way.
+
+        Parameters:
+        name (str): Stage name reported by the profiler.
+
+        Returns:
+        context manager: The profiler's timer, or a no-op when no profiler is attached.
+        """
+        return self.profiler.stage(name) if self.profiler is not None else nullcontext()
+
+    def mark_attendance(self, name, when=None):
+        """
+        Mark the attendance of the recognized person in the attendance database.
 
         Parameters:
         name (str): The name of the recognized person.
+        when (datetime): Time of the sighting, e.g. within recorded footage. Defaults to now.
         """
-        if name in self.attendance_today:
+        if self.attendance_cache is None:
+            return  # Recognition-only engine
+        now = when or datetime.now()
+        time_now = now.strftime('%H:%M:%S')  # Current time
+        date_now = now.strftime('%Y-%m-%d')  # Current date
+
+        if not self.attendance_cache.add(name, date_now):
             return  # Avoid duplicate attendance for the same person
 
-        self.attendance_today.add(name)  # Add to today's attendance list
-        time_now = datetime.now().strftime('%H:%M:%S')  # Current time
-        date_now = datetime.now().strftime('%Y-%m-%d')  # Current date
+        # Queue the attendance record for the background database writer
+        self.attendance_sink.submit(name, time_now, date_now)
 
-        # Append the attendance record to a CSV file
-        with open('attendance.csv', 'a') as f:
-            f.write(f'{name},{time_now},{date_now}\n')
+    def close(self):
+        """
+        Flush pending attendance records and close the attendance database.
+        """
+        if self.attendance_sink is not None:
+            self.attendance_sink.close()
 
-    def run_attendance(self, camera_index=0):
+    def locate_faces(self, frame, scaler, regions=None):
         """
-        Run the face recognition process to mark attendance live using webcam.
+        Detect faces on a downscaled copy of the frame, optionally only inside regions.
 
         Parameters:
-        camera_index (int): The index of the camera to use. Default is 0.
+        frame (numpy.ndarray): Full-resolution BGR camera frame.
+        scaler (AdaptiveScaler): Chooses the detection scale and learns from this frame.
+        regions (list): (top, right, bottom, left) full-frame regions to search. None searches everywhere.
+
+        Returns:
+        tuple: (rgb_small, small_locations, full_locations) where small_locations index
+               into rgb_small (for face_encodings) and full_locations are in frame pixels.
         """
-        cap = cv2.VideoCapture(camera_index)  # Use the selected camera index
-        if not cap.isOpened():
-            messagebox.showerror("Camera Error", "Unable to access the camera.")
-            return
+        scale = scaler.scale
+        with self.profile_stage('resize'):
+            small = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
+            rgb_small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)  # Convert BGR to RGB
 
-        while True:
-            ret, frame = cap.read()  # Capture frame-by-frame
-            if not ret:
-                break  # If capturing fails, exit the loop
+        start_time = time.perf_counter()
+        with self.profile_stage('detect'):
+            if regions is None:
+                small_locations = face_recognition.face_locations(rgb_small, model=self.detection_model)
+            else:
+                small_locations = []
+                for top, right, bottom, left in regions:
+                    # Map the region into the scaled image and detect on that patch only
+                    t, r, b, l = int(top * scale), int(right * scale), int(bottom * scale), int(left * scale)
+                    patch = np.ascontiguousarray(rgb_small[t:b, l:r])
+                    for pt, pr, pb, pl in face_recognition.face_locations(patch, model=self.detection_model):
+                        small_locations.append((pt + t, pr + l, pb + t, pl + l))
+        latency = time.perf_counter() - start_time
 
-            # Resize the frame for faster face recognition processing
-            small = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-            rgb_small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)  # Convert BGR to RGB
+        # Scale back face locations to original size
+        full_locations = [tuple(int(round(v / scale)) for v in loc) for loc in small_locations]
+        scaler.update(latency if regions is None else None, [b - t for t, _, b, _ in full_locations])
+        return rgb_small, small_locations, full_locations
+
+    def encode_image(self, frame, max_width=640):
+        """
+        Detect and encode every face of a single still image.
+
+        Parameters:
+        frame (numpy.ndarray): BGR image.
+        max_width (int): The image is downscaled to at most this width for detection and encoding.
+
+        Returns:
+        tuple: (locations, encodings) with locations as (top, right, bottom, left) in image pixels.
+        """
+        scale = min(1.0, max_width / frame.shape[1])
+        small = cv2.resize(frame, (0, 0), fx=scale, fy=scale) if scale < 1.0 else frame
+        rgb_small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)  # Convert BGR to RGB
+        small_locations = face_recognition.face_locations(rgb_small, model=self.detection_model)
+        encodings = face_recognition.face_encodings(rgb_small, small_locations, model=self.encoding_model)
+        locations = [tuple(int(round(v / scale)) for v in loc) for loc in small_locations]
+        return locations, encodings
+
+    def identify(self, frame, mark=False):
+        """
+        Identify every face of a still image.
+
+        Parameters:
+        frame (numpy.ndarray): BGR image.
+        mark (bool): Also mark the attendance of the recognized people.
+
+        Returns:
+        list: One Detection per face found in the image.
+        """
+        locations, encodings = self.encode_image(frame)
+        detections = []
+        for location, match in zip(locations, self.gallery.match(encodings, tolerance=self.tolerance)):
+            if match.matched and mark:
+                self.mark_attendance(match.name)
+            detections.append(Detection(location, match.name or "UNKNOWN", match.matched, match.distance))
+        return detections
+
+    def verify(self, frame, person_name):
+        """
+        Check whether a still image shows a given person (1:1 verification).
+
+        Parameters:
+        frame (numpy.ndarray): BGR image, expected to contain one face.
+        person_name (str): Claimed identity.
+
+        Returns:
+        tuple: (verified, distance) for the face closest to the person; (False, inf) without a face.
+        """
+        _, encodings = self.encode_image(frame)
+        if not encodings:
+            return False, float('inf')
+        distance = float(self.full_gallery.distances_to(encodings, person_name).min())
+        return distance <= self.tolerance, distance
+
+    def enroll_images(self, person_name, frames):
+        """
+        Save still images of a person into the dataset and enroll them into the running gallery.
+        Every image must show exactly one face; otherwise nothing is saved.
+
+        Parameters:
+        person_name (str): Name of the person.
+        frames (list): BGR images.
+
+        Returns:
+        int: Number of encodings added to the gallery.
+        """
+        person_name = (person_name or '').strip()
+        if not person_name or person_name in ('.', '..') or os.path.basename(person_name) != person_name:
+            raise ValueError(f"Invalid person name: {person_name!r}")
+
+        encodings = []
+        for i, frame in enumerate(frames):
+            locations, frame_encodings = self.encode_image(frame)
+            if len(locations) != 1:
+                raise ValueError(f"Image {i + 1} shows {len(locations)} faces, expected exactly one")
+            encodings.append(frame_encodings[0])
+
+        person_path = os.path.join(self.dataset_dir, person_name)
+        os.makedirs(person_path, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        captures = []
+        for i, (frame, encoding) in enumerate(zip(frames, encodings)):
+            img_path = os.path.join(person_path, f'enroll_{stamp}_{i + 1}.jpg')
+            cv2.imwrite(img_path, frame)
+            captures.append((img_path, encoding))
+        return self.enroll_encodings(person_name, captures)
+
+    def analyze_frame(self, frame, stream=None):
+        """
+        Detect, identify and mark attendance for every face in a BGR frame.
+
+        Parameters:
+        frame (numpy.ndarray): Full-resolution BGR camera frame.
+        stream (StreamState): State of the source the frame comes from. Defaults to self.stream.
+
+        Returns:
+        list: One Detection per face found in the frame.
+        """
+        detections = self.recognize_frame(frame, stream)
+        with self.profile_stage('mark'):
+            for detection in detections:
+                if detection.matched:
+                    self.mark_attendance(detection.name)  # Mark the attendance
+        return detections
+
+    def recognize_frame(self, frame, stream=None):
+        """
+        Detect and identify every face in a BGR frame without marking attendance.
+
+        Parameters:
+        frame (numpy.ndarray): Full-resolution BGR camera frame.
+        stream (StreamState): State of the source the frame comes from. Defaults to self.stream.
+
+        Returns:
+        list: One Detection per face found in the frame.
+        """
+        stream = stream or self.stream
+        if stream.motion_gate is not None:
+            with self.profile_stage('motion'):
+                moving = stream.motion_gate.should_detect(frame)
+            if not moving:
+                return stream.last_detections  # Static scene: the previous result still holds
+
+        # Search only around tracked faces, except for a periodic whole-frame pass for newcomers
+        regions = None
+        stream.frames_since_full += 1
+        if stream.frames_since_full < self.full_frame_interval:
+            with stream.lock:
+                regions = face_regions([track.location for track in stream.tracker.tracks], frame.shape)
+        if not regions:
+            regions = None
+            stream.frames_since_full = 0
+
+        # Find all faces and follow them from the previous frames
+        rgb_small, small_locations, face_locations = self.locate_faces(frame, stream.scaler, regions)
+        with self.profile_stage('track'), stream.lock:
+            tracked = stream.tracker.update(face_locations)
+
+        # Only new tracks and tracks due for re-verification go through the 128-d encoder
+        pending = [i for i, (_, needs_encoding) in enumerate(tracked) if needs_encoding]
+        if pending:
+            pending_locations = [small_locations[i] for i in pending]
+            with self.profile_stage('encode'):
+                face_encodings = face_recognition.face_encodings(rgb_small, pending_locations, model=self.encoding_model)
+            # Identify every encoded face against the whole gallery in one pass
+            with self.profile_stage('match'):
+                matches = self.gallery.match(face_encodings, tolerance=self.tolerance)
+            with stream.lock:
+                for i, match in zip(pending, matches):
+                    stream.tracker.identify(tracked[i][0], match)
+
+        detections = []
+        for location, (track, _) in zip(face_locations, tracked):
+            detections.append(Detection(location, track.name or "UNKNOWN", track.matched, track.distance))
+        stream.last_detections = detections
+        return detections
+
+    @staticmethod
+    def draw_detections(frame, detections):
+        """
+        Draw a labelled box around every detection.
+
+        Parameters:
+        frame (numpy.ndarray): BGR frame to draw on.
+        detections (list): Detections returned by analyze_frame.
+        """
+        for detection in detections:
+            top, right, bottom, left = detection.location
+            # Green for recognized faces, red for unknown faces
+            color = (0, 255, 0) if detection.matched else (0, 0, 255)
+            cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
+            cv2.putText(frame, detection.name, (left + 6, bottom - 6), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
 
-            # Find all faces and their encodings in the current frame
-            face_locations = face_recognition.face_locations(rgb_small)
-            face_encodings = face_recognition.face_encodings(rgb_small, face_locations)
+    def run_attendance(self, camera_index=0):
+        """
+        Run the face recognition process to mark attendance live using webcam.
+        Capture, recognition and display run as separate stages so the preview keeps
+        camera speed while recognition runs as fast as the CPU allows.
 
-            # Compare each detected face with known faces
-            for encoding, loc in zip(face_encodings, face_locations):
-                matches = face_recognition.compare_faces(self.known_face_encodings, encoding, tolerance=0.5)
-                face_distances = face_recognition.face_distance(self.known_face_encodings, encoding)
+        Parameters:
+        camera_index (int): The index of the camera to use. Default is 0.
 
-                # Scale back face locations to original size
-                top, right, bottom, left = [v * 4 for v in loc]
+        Raises:
+        CameraError: If the camera cannot be opened.
+        """
+        cap = cv2.VideoCapture(camera_index)  # Use the selected camera index
+        if not cap.isOpened():
+            raise CameraError("Unable to access the camera.")
 
-                if face_distances.size > 0 and matches[np.argmin(face_distances)]:
-                    # If a known face is recognized
-                    name = self.known_face_names[np.argmin(face_distances)]
-                    self.mark_attendance(name)  # Mark the attendance
-                    color = (0, 255, 0)  # Green for recognized faces
-                else:
-                    # If face is not recognized
-                    name = "UNKNOWN"
-                    color = (0, 0, 255)  # Red for unknown faces
+        pipeline = FramePipeline(cap, self.analyze_frame, workers=self.inference_workers)
+        pipeline.start()
+        try:
+            while True:
+                item = pipeline.next_frame()
+                if item is None:
+                    if pipeline.display_queue.closed:
+                        break  # Capturing failed or the source ended
+                    continue
 
-                # Draw a rectangle around the face and label it
-                cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
-                cv2.putText(frame, name, (left + 6, bottom - 6), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+                # Draw on a copy so an inference worker never reads a half-drawn frame
+                frame, detections = item
+                frame = frame.copy()
+                self.draw_detections(frame, detections)
 
-            # Display the resulting frame
-            cv2.imshow("Face Recognition Attendance - Press 'Q' to Quit", frame)
+                # Display the resulting frame
+                cv2.imshow("Face Recognition Attendance - Press 'Q' to Quit", frame)
 
-            # Break loop if 'q' key is pressed
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+                # Break loop if 'q' key is pressed
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+        finally:
+            pipeline.stop()
 
         # Release the camera and close OpenCV windows
         cap.release()
         cv2.destroyAllWindows()
-        messagebox.showinfo("Attendance Finished", "Face recognition attendance session has ended.")
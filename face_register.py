@@ -1,23 +1,70 @@
  # Import necessary libraries
 import os  # For interacting with the operating system, like creating directories
 import cv2  # OpenCV library for accessing the webcam and image processing
+import face_recognition  # Face Recognition library for validating and encoding the captures
+from concurrent.futures import ThreadPoolExecutor  # Encodes captures off the camera loop
 import tkinter as tk  # Tkinter library for GUI elements
 from tkinter import simpledialog, messagebox  # Import specific Tkinter dialogs for user input and alerts
 
+NO_FACE_ERROR = "No face found - try again"  # encode_capture() result when the detector finds nothing
+
 # Define a class to handle face registration
 class FaceRegister:
-    def __init__(self, dataset_dir='dataset'):
+    def __init__(self, dataset_dir='dataset', core=None, detection_model='hog', encoding_model='small',
+                 camera_index=0, detection_width=640):
         """
         Initialize the FaceRegister class.
 
         Parameters:
         dataset_dir (str): Path where the captured images will be stored.
+        core (FaceRecognitionCore): Running recognizer the new person is enrolled into.
+                                    Its detection and encoding models are used when given.
+        detection_model (str): face_recognition detector, 'hog' or 'cnn'.
+        encoding_model (str): face_recognition landmark model, 'small' or 'large'.
+        camera_index (int): Camera used for the captures.
+        detection_width (int): Captures are downscaled to this width to find the face;
+                               the encoding is still computed at full resolution.
         """
         self.dataset_dir = dataset_dir  # Set the directory for saving the person's images
+        self.core = core
+        self.detection_model = core.detection_model if core else detection_model
+        self.encoding_model = core.encoding_model if core else encoding_model
+        self.camera_index = camera_index
+        self.detection_width = detection_width
+
+    def encode_capture(self, frame):
+        """
+        Validate that a captured frame shows exactly one face and compute its encoding.
+        Runs on the registration worker thread.
+
+        Parameters:
+        frame (numpy.ndarray): BGR camera frame.
+
+        Returns:
+        tuple: (encoding, error) where error is None when exactly one face was found.
+        """
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        scale = min(1.0, self.detection_width / rgb.shape[1])
+        small = cv2.resize(rgb, (0, 0), fx=scale, fy=scale) if scale < 1.0 else rgb
+        locations = face_recognition.face_locations(small, model=self.detection_model)
+        if not locations:
+            return None, NO_FACE_ERROR
+        if len(locations) > 1:
+            return None, "Several faces found - only one person please"
+
+        # Map the face back to full resolution for an accurate encoding
+        top, right, bottom, left = (int(round(v / scale)) for v in locations[0])
+        encoding = face_recognition.face_encodings(rgb, [(top, right, bottom, left)], model=self.encoding_model)[0]
+        return encoding, None
 
     def register_new_person(self):
         """
         Register a new person by capturing their face in different poses.
+        Each capture is checked and encoded on a worker thread while the camera keeps
+        running, then the person is enrolled into the running recognizer.
+
+        Returns:
+        str or None: The registered person's name, or None if registration was cancelled.
         """
         # Create a hidden Tkinter window to use GUI dialogs
         root = tk.Tk()
@@ -34,49 +81,89 @@ class FaceRegister:
         save_path = os.path.join(self.dataset_dir, name.strip())  # Clean name and join with dataset directory
         os.makedirs(save_path, exist_ok=True)  # Make the directory if it doesn't exist
 
-        # Define the different poses/images we want to capture with instructions
+        # Define the different poses/images we want to capture with instructions.
+        # The last flag marks poses that must show a detectable face.
         instructions = [
-            ("1_normal.jpg", "Look straight"),  # Capture the person looking straight
-            ("2_smile.jpg", "Smile"),            # Capture the person smiling
-            ("3_left.jpg", "Turn left"),          # Capture the person looking to the left
-            ("4_right.jpg", "Turn right"),        # Capture the person looking to the right
-            ("5_maskOn.jpg", "Wear a mask"),      # Capture the person wearing a mask
+            ("1_normal.jpg", "Look straight", True),  # Capture the person looking straight
+            ("2_smile.jpg", "Smile", True),            # Capture the person smiling
+            ("3_left.jpg", "Turn left", True),          # Capture the person looking to the left
+            ("4_right.jpg", "Turn right", True),        # Capture the person looking to the right
+            ("5_maskOn.jpg", "Wear a mask", False),     # Masked faces are often missed by the detector
         ]
+        unencoded = []  # Optional poses saved without a face encoding
 
         # Open the webcam
-        cap = cv2.VideoCapture(0)
+        cap = cv2.VideoCapture(self.camera_index)
         if not cap.isOpened():
             # If the webcam is not accessible, show an error message
             messagebox.showerror("Camera Error", "Unable to access the camera.")
             return
 
+        captures = []  # (image path, encoding) of every accepted pose
+        executor = ThreadPoolExecutor(max_workers=1)  # Keeps encoding off the camera loop
+
         # Loop over each instruction to capture required images
-        for file, msg in instructions:
+        for file, msg, face_required in instructions:
             captured = False  # Flag to check if the current image is captured
+            pending = None  # Encoding job of the frame being checked
+            pending_frame = None
+            status = ""  # Result of the last check, shown under the instruction
             while not captured:
                 ret, frame = cap.read()  # Read a frame from the webcam
                 if not ret:
                     continue  # If frame reading fails, retry
 
+                if pending is not None and pending.done():
+                    encoding, error = pending.result()
+                    if error == NO_FACE_ERROR and not face_required:
+                        # No face detected on an optional pose: keep the image without an encoding
+                        unencoded.append(msg)
+                        error = None
+                    if error is None:
+                        # Exactly one face (or an optional pose): keep the image and its encoding
+                        img_path = os.path.join(save_path, file)
+                        cv2.imwrite(img_path, pending_frame)
+                        captures.append((img_path, encoding))
+                        captured = True  # Mark as captured to move to next instruction
+                        continue
+                    status = error
+                    pending = None
+
                 # Display the instruction on the screen
-                cv2.putText(frame, msg, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-                cv2.imshow("Registration - Press 's' to save, 'q' to quit", frame)  # Show the frame
+                display = frame.copy()
+                cv2.putText(display, msg, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+                if pending is not None:
+                    status = "Checking face..."
+                if status:
+                    cv2.putText(display, status, (10, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                cv2.imshow("Registration - Press 's' to save, 'q' to quit", display)  # Show the frame
 
                 key = cv2.waitKey(1)  # Wait for a key press
-                if key == ord('s'):
-                    # If 's' is pressed, save the current frame as an image
-                    cv2.imwrite(os.path.join(save_path, file), frame)
-                    captured = True  # Mark as captured to move to next instruction
+                if key == ord('s') and pending is None:
+                    # If 's' is pressed, check and encode the current frame in the background
+                    pending_frame = frame
+                    pending = executor.submit(self.encode_capture, frame)
                 elif key == ord('q'):
                     # If 'q' is pressed, cancel the registration
+                    executor.shutdown(wait=False)
                     cap.release()  # Release the webcam
                     cv2.destroyAllWindows()  # Close all OpenCV windows
                     messagebox.showinfo("Registration Cancelled", "Registration was cancelled by user.")  # Inform the user
                     return
 
         # After capturing all images, release the camera and close OpenCV windows
+        executor.shutdown()
         cap.release()
         cv2.destroyAllWindows()
 
+        # Make the new person recognizable immediately, reusing the encodings computed above
+        if self.core is not None:
+            self.core.enroll_encodings(name.strip(), captures)
+
         # Notify the user that registration was completed successfully
-        messagebox.showinfo("Registration Complete", f"{name} has been successfully registered!")
\ No newline at end of file
+        message = f"{name} has been successfully registered!"
+        if unencoded:
+            message += (f"\n\nNo face was detected in: {', '.join(unencoded)}. "
+                        "Those images were saved but are not used for recognition.")
+        messagebox.showinfo("Registration Complete", message)
+        return name.strip()
@@ -0,0 +1,137 @@
+# Import necessary libraries
+import itertools  # For generating unique track ids
+
+
+def box_iou(a, b):
+    """
+    Compute the intersection-over-union of two face boxes.
+
+    Parameters:
+    a (tuple): (top, right, bottom, left) box.
+    b (tuple): (top, right, bottom, left) box.
+
+    Returns:
+    float: Overlap ratio between 0 and 1.
+    """
+    top, right = max(a[0], b[0]), min(a[1], b[1])
+    bottom, left = min(a[2], b[2]), max(a[3], b[3])
+    inter = max(0, right - left) * max(0, bottom - top)
+    area_a = (a[1] - a[3]) * (a[2] - a[0])
+    area_b = (b[1] - b[3]) * (b[2] - b[0])
+    union = area_a + area_b - inter
+    return inter / union if union > 0 else 0.0
+
+
+# Define a record for one face followed across frames
+class Track:
+    def __init__(self, track_id, location):
+        """
+        Initialize a Track.
+
+        Parameters:
+        track_id (int): Unique id of the track.
+        location (tuple): (top, right, bottom, left) box of the face.
+        """
+        self.track_id = track_id
+        self.location = location
+        self.name = None  # Identity from the last encoding, None until encoded
+        self.matched = False
+        self.distance = float('inf')
+        self.frames_since_encoding = 0  # Frames since the 128-d encoder last ran on this face
+        self.missed = 0  # Consecutive frames without a matching detection
+        self.encoded = False  # True once the track has been identified at least once
+
+
+# Define an IoU tracker that carries identities across frames
+class FaceTracker:
+    def __init__(self, iou_threshold=0.3, max_missed=5, reverify_interval=30, unknown_retry_interval=5):
+        """
+        Initialize the FaceTracker class.
+
+        Parameters:
+        iou_threshold (float): Minimum box overlap for a detection to continue a track.
+        max_missed (int): Frames a track survives without a matching detection.
+        reverify_interval (int): Frames between re-encodings of an identified face.
+        unknown_retry_interval (int): Frames between re-encodings of an unrecognized face.
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.reverify_interval = reverify_interval
+        self.unknown_retry_interval = unknown_retry_interval
+        self.tracks = []
+        self._ids = itertools.count()
+        self.encodings_run = 0  # Faces that had to be encoded
+        self.encodings_skipped = 0  # Faces whose identity was carried over from the track
+
+    def update(self, locations):
+        """
+        Associate this frame's detections with the existing tracks.
+
+        Parameters:
+        locations (list): (top, right, bottom, left) boxes detected in the frame.
+
+        Returns:
+        list: (track, needs_encoding) for every location, in input order.
+        """
+        # Greedy association: best overlapping pairs first
+        pairs = []
+        for t, track in enumerate(self.tracks):
+            for d, location in enumerate(locations):
+                iou = box_iou(track.location, location)
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, t, d))
+        pairs.sort(reverse=True)
+
+        assigned = [None] * len(locations)
+        used_tracks = set()
+        for _, t, d in pairs:
+            if t in used_tracks or assigned[d] is not None:
+                continue
+            used_tracks.add(t)
+            assigned[d] = self.tracks[t]
+
+        # Age out tracks that were not seen in this frame
+        survivors = []
+        for t, track in enumerate(self.tracks):
+            if t not in used_tracks:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    continue
+            survivors.append(track)
+        self.tracks = survivors
+
+        results = []
+        for d, location in enumerate(locations):
+            track = assigned[d]
+            if track is None:
+                # A new face entered the view
+                track = Track(next(self._ids), location)
+                self.tracks.append(track)
+            else:
+                track.location = location
+                track.missed = 0
+                track.frames_since_encoding += 1
+
+            interval = self.reverify_interval if track.matched else self.unknown_retry_interval
+            needs_encoding = not track.encoded or track.frames_since_encoding >= interval
+            if needs_encoding:
+                self.encodings_run += 1
+            else:
+                self.encodings_skipped += 1
+            results.append((track, needs_encoding))
+        return results
+
+    @staticmethod
+    def identify(track, match):
+        """
+        Store a fresh match result on a track.
+
+        Parameters:
+        track (Track): The track that was just encoded.
+        match (MatchResult): Result of matching the track's face against the gallery.
+        """
+        track.name = match.name
+        track.matched = match.matched
+        track.distance = match.distance
+        track.frames_since_encoding = 0
+        track.encoded = True
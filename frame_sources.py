@@ -0,0 +1,251 @@
+# Import necessary libraries
+import os  # For listing image directories
+import threading  # For interrupting stream reconnect delays
+from abc import ABC, abstractmethod  # For the common frame source interface
+from urllib.parse import urlparse  # For recognizing stream URLs
+import cv2  # OpenCV for cameras, video files and streams
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+STREAM_SCHEMES = ('rtsp', 'rtmp', 'http', 'https', 'udp', 'tcp')
+
+
+# Frame sources share the cv2.VideoCapture interface (isOpened / read / release), so
+# FramePipeline and MultiCameraScheduler accept any of them in place of a camera.
+class FrameSource(ABC):
+    fps = 0.0  # Frames per second of the underlying source; 0 when unknown
+    frame_count = None  # Total frames, when known (files and image directories)
+
+    def __init__(self):
+        self.position = -1  # Index of the last frame returned by read()
+
+    @abstractmethod
+    def isOpened(self):
+        """
+        Return True when the source could be opened.
+        """
+
+    @abstractmethod
+    def read(self):
+        """
+        Return (ok, frame) like cv2.VideoCapture.read(); ok is False at the end of the source.
+        """
+
+    def stop(self):
+        """
+        Ask a blocking read() to give up; safe to call from another thread. The reading
+        thread still calls release(). Only sources that can block for long need it.
+        """
+
+    def release(self):
+        self.stop()
+
+    @property
+    def timestamp(self):
+        """float: Offset of the last frame from the start of the source in seconds, or None."""
+        return self.position / self.fps if self.fps and self.position >= 0 else None
+
+    def __iter__(self):
+        """
+        Yield (frame index, frame) until the source ends.
+        """
+        while True:
+            ok, frame = self.read()
+            if not ok:
+                return
+            yield self.position, frame
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+# Local camera
+class CameraFrameSource(FrameSource):
+    def __init__(self, index=0):
+        """
+        Initialize the CameraFrameSource class.
+
+        Parameters:
+        index (int): Camera index passed to cv2.VideoCapture.
+        """
+        super().__init__()
+        self.capture = cv2.VideoCapture(index)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        ok, frame = self.capture.read()
+        if ok:
+            self.position += 1
+        return ok, frame
+
+    def release(self):
+        self.capture.release()
+
+
+# Recorded video file, optionally sampled and limited to a range of frames
+class VideoFileSource(FrameSource):
+    def __init__(self, path, step=1, sample_fps=None, start_frame=0, end_frame=None):
+        """
+        Initialize the VideoFileSource class.
+
+        Parameters:
+        path (str): Video file.
+        step (int): Return every step-th frame. Skipped frames are grabbed but never decoded.
+        sample_fps (float): Sampling rate in frames per second of footage; overrides step.
+        start_frame (int): First frame index read.
+        end_frame (int): Frame index reading stops at (exclusive). None reads to the end.
+        """
+        super().__init__()
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+        count = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self.frame_count = count if count > 0 else None
+        if sample_fps and self.fps:
+            step = round(self.fps / sample_fps)
+        self.step = max(1, int(step))
+        self.end_frame = end_frame
+        self._next = 0  # Index of the next frame in the file
+        if start_frame > 0:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            self._next = start_frame
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        if self.end_frame is not None and self._next >= self.end_frame:
+            return False, None
+        ok, frame = self.capture.read()
+        if not ok:
+            return False, None
+        self.position = self._next
+        self._next += 1
+        # Skip to the next sampled frame without decoding the ones in between
+        for _ in range(self.step - 1):
+            if self.end_frame is not None and self._next >= self.end_frame:
+                break
+            if not self.capture.grab():
+                break
+            self._next += 1
+        return True, frame
+
+    def release(self):
+        self.capture.release()
+
+
+# Directory of still images, read in file name order
+class ImageDirectorySource(FrameSource):
+    def __init__(self, path, step=1, start_frame=0, end_frame=None, fps=0.0):
+        """
+        Initialize the ImageDirectorySource class.
+
+        Parameters:
+        path (str): Directory of images; each image is one frame.
+        step (int): Return every step-th image.
+        start_frame (int): Index of the first image read.
+        end_frame (int): Image index reading stops at (exclusive).
+        fps (float): Frame rate the images were captured at, for timestamps. 0 when unknown.
+        """
+        super().__init__()
+        self.path = path
+        self.files = sorted(name for name in os.listdir(path) if name.lower().endswith(IMAGE_EXTENSIONS)) \
+            if os.path.isdir(path) else []
+        self.frame_count = len(self.files)
+        self.fps = fps
+        self.step = max(1, int(step))
+        self.end_frame = len(self.files) if end_frame is None else min(end_frame, len(self.files))
+        self._next = start_frame
+
+    def isOpened(self):
+        return os.path.isdir(self.path)
+
+    def read(self):
+        while self._next < self.end_frame:
+            index = self._next
+            self._next += self.step
+            frame = cv2.imread(os.path.join(self.path, self.files[index]))
+            if frame is not None:  # Unreadable files are skipped
+                self.position = index
+                return True, frame
+        return False, None
+
+
+# Network stream that reconnects after dropouts
+class StreamSource(FrameSource):
+    def __init__(self, url, reconnect_delay=2.0, max_reconnects=None):
+        """
+        Initialize the StreamSource class.
+
+        Parameters:
+        url (str): RTSP / HTTP / RTMP stream URL.
+        reconnect_delay (float): Seconds to wait before reopening a dropped stream.
+        max_reconnects (int): Reconnect attempts after which the source ends. None retries
+                              until stop() or release() is called.
+        """
+        super().__init__()
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnects = max_reconnects
+        self.reconnects = 0
+        self._stop = threading.Event()
+        self._open()
+
+    def _open(self):
+        self.capture = cv2.VideoCapture(self.url)
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep latency low: do not queue old frames
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        while not self._stop.is_set():
+            ok, frame = self.capture.read()
+            if ok:
+                self.position += 1
+                return True, frame
+            if self.max_reconnects is not None and self.reconnects >= self.max_reconnects:
+                break
+            # Dropped connection: reopen the stream after a short pause, unless stopped meanwhile
+            self.capture.release()
+            if self._stop.wait(self.reconnect_delay):
+                break
+            self.reconnects += 1
+            self._open()
+        return False, None
+
+    def stop(self):
+        self._stop.set()
+
+    def release(self):
+        self.stop()
+        self.capture.release()
+
+
+def open_source(spec, step=1, sample_fps=None, start_frame=0, end_frame=None):
+    """
+    Open a frame source from a command line / configuration value.
+
+    Parameters:
+    spec (int or str): Camera index, video file, image directory or stream URL.
+    step (int): Return every step-th frame (files and image directories).
+    sample_fps (float): Sampling rate in frames per second of footage (video files).
+    start_frame (int): First frame read (files and image directories).
+    end_frame (int): Frame index reading stops at, exclusive (files and image directories).
+
+    Returns:
+    FrameSource: The opened source; check isOpened().
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraFrameSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, step=step, start_frame=start_frame, end_frame=end_frame)
+    if urlparse(spec).scheme.lower() in STREAM_SCHEMES:
+        return StreamSource(spec)
+    return VideoFileSource(spec, step=step, sample_fps=sample_fps, start_frame=start_frame, end_frame=end_frame)
@@ -0,0 +1,246 @@
+# Import necessary libraries
+import threading  # For serializing writers while readers stay lock-free
+from collections import namedtuple  # Lightweight record for match results
+import numpy as np  # NumPy for the contiguous encoding matrix and batched distances
+
+# Result of matching one face against the gallery:
+# name is None when unmatched, distance is the best distance found and margin is the
+# gap between the best identity and the runner-up identity (larger is more confident)
+MatchResult = namedtuple('MatchResult', ['name', 'distance', 'margin', 'matched'])
+
+
+# Define a class holding every known face encoding in one contiguous matrix
+class FaceGallery:
+    def __init__(self, dim=128, capacity=256, index=None, candidates=16):
+        """
+        Initialize an empty FaceGallery.
+
+        Parameters:
+        dim (int): Length of a face encoding vector.
+        capacity (int): Number of rows allocated up front; the matrix grows by doubling.
+        index (ExactIndex or IVFIndex): Optional search index from gallery_index.
+                                        None scans the whole gallery with one matrix product.
+        candidates (int): Neighbours fetched from an approximate index per face.
+        """
+        self.dim = dim
+        self.index = index
+        self.candidates = candidates
+        self.identities = []  # Unique person names; ids index into this list
+        self._identity_ids = {}  # Person name -> id
+        self._lock = threading.Lock()
+        capacity = max(1, capacity)
+        # Readers take this tuple once, so they never see a half-written row
+        self._state = (
+            np.empty((capacity, dim), dtype=np.float32),  # Encodings
+            np.empty(capacity, dtype=np.float32),  # Squared norms of the encodings
+            np.empty(capacity, dtype=np.int32),  # Identity id of every row
+            0,  # Number of rows in use
+        )
+
+    @classmethod
+    def from_encodings(cls, encodings, names, dim=128, **options):
+        """
+        Build a gallery from parallel sequences of encodings and names.
+
+        Parameters:
+        encodings (sequence): Face encodings, one per row.
+        names (sequence): Person name for every encoding.
+        dim (int): Length of a face encoding vector.
+        options: Extra FaceGallery arguments (index, candidates).
+
+        Returns:
+        FaceGallery: The populated gallery.
+        """
+        gallery = cls(dim=dim, capacity=len(names), **options)
+        gallery.add_many(encodings, names)
+        return gallery
+
+    def __len__(self):
+        return self._state[3]
+
+    @property
+    def encodings(self):
+        """numpy.ndarray: Read-only (size, dim) float32 view of the gallery encodings."""
+        matrix, _, _, size = self._state
+        view = matrix[:size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ids(self):
+        """numpy.ndarray: Identity id of every gallery row."""
+        _, _, ids, size = self._state
+        return ids[:size]
+
+    @property
+    def names(self):
+        """list: Person name of every gallery row."""
+        return [self.identities[i] for i in self.ids]
+
+    def _identity_id(self, name):
+        """
+        Return the id of a person, registering the name if it is new.
+        """
+        identity_id = self._identity_ids.get(name)
+        if identity_id is None:
+            identity_id = len(self.identities)
+            self.identities.append(name)
+            self._identity_ids[name] = identity_id
+        return identity_id
+
+    def add(self, encoding, name):
+        """
+        Append a single encoding to the gallery in place.
+
+        Parameters:
+        encoding (numpy.ndarray): The face encoding.
+        name (str): Name of the person the encoding belongs to.
+        """
+        self.add_many([encoding], [name])
+
+    def add_many(self, encodings, names):
+        """
+        Append several encodings to the gallery in place, growing the matrix when full.
+
+        Parameters:
+        encodings (sequence): Face encodings, one per row.
+        names (sequence): Person name for every encoding.
+        """
+        names = list(names)
+        if not names:
+            return
+        rows = np.asarray(encodings, dtype=np.float32).reshape(len(names), self.dim)
+
+        with self._lock:
+            matrix, sq_norms, ids, size = self._state
+            new_size = size + len(names)
+            if new_size > len(matrix):
+                # Grow by doubling so repeated enrollment stays amortized O(1) per row
+                capacity = max(new_size, 2 * len(matrix))
+                grown = np.empty((capacity, self.dim), dtype=np.float32)
+                grown_norms = np.empty(capacity, dtype=np.float32)
+                grown_ids = np.empty(capacity, dtype=np.int32)
+                grown[:size] = matrix[:size]
+                grown_norms[:size] = sq_norms[:size]
+                grown_ids[:size] = ids[:size]
+                matrix, sq_norms, ids = grown, grown_norms, grown_ids
+
+            # Rows beyond the published size are invisible to readers until the swap below
+            matrix[size:new_size] = rows
+            sq_norms[size:new_size] = np.einsum('ij,ij->i', rows, rows)
+            ids[size:new_size] = [self._identity_id(name) for name in names]
+            self._state = (matrix, sq_norms, ids, new_size)
+            if self.index is not None:
+                self.index.add(matrix[:new_size], size)  # Incremental insert into the index
+
+    def distances(self, face_encodings):
+        """
+        Compute the Euclidean distance of every query face to every gallery encoding.
+        All faces are scored with a single matrix multiplication.
+
+        Parameters:
+        face_encodings (sequence): Query face encodings.
+
+        Returns:
+        numpy.ndarray: (number of faces, gallery size) matrix of distances.
+        """
+        return self._distances(self._state, face_encodings)
+
+    def _distances(self, state, face_encodings):
+        """
+        Compute query-to-gallery distances against one snapshot of the gallery state.
+        """
+        matrix, sq_norms, _, size = state
+        queries = np.asarray(face_encodings, dtype=np.float32).reshape(-1, self.dim)
+        if size == 0 or len(queries) == 0:
+            return np.empty((len(queries), size), dtype=np.float32)
+
+        # ||q - g||^2 = ||q||^2 + ||g||^2 - 2 q.g
+        squared = queries @ matrix[:size].T
+        squared *= -2.0
+        squared += sq_norms[:size]
+        squared += np.einsum('ij,ij->i', queries, queries)[:, None]
+        np.maximum(squared, 0.0, out=squared)  # Rounding can push identical faces below zero
+        return np.sqrt(squared, out=squared)
+
+    def distances_to(self, face_encodings, name):
+        """
+        Compute the distance of every query face to the closest encoding of one person.
+
+        Parameters:
+        face_encodings (sequence): Query face encodings.
+        name (str): Person the faces are compared with.
+
+        Returns:
+        numpy.ndarray: One distance per query face; inf when the person is not in the gallery.
+        """
+        state = self._state  # One snapshot so distances and ids always agree
+        distances = self._distances(state, face_encodings)
+        identity_id = self._identity_ids.get(name)
+        rows = state[2][:state[3]] == identity_id
+        if identity_id is None or not rows.any():
+            return np.full(len(distances), np.inf)
+        return distances[:, rows].min(axis=1)
+
+    def match(self, face_encodings, tolerance=0.5):
+        """
+        Identify a batch of faces in a single pass over the gallery.
+
+        Parameters:
+        face_encodings (sequence): Query face encodings.
+        tolerance (float): Maximum distance for a face to count as a match.
+
+        Returns:
+        list: One MatchResult per query face, in input order.
+        """
+        state = self._state  # One snapshot so distances and ids always agree
+        matrix, sq_norms, ids, size = state
+        if self.index is not None and self.index.kind != 'exact' and size > 0:
+            queries = np.asarray(face_encodings, dtype=np.float32).reshape(-1, self.dim)
+            neighbours = self.index.search(matrix[:size], sq_norms[:size], queries, self.candidates)
+            return [self._match_candidates(d, ids[rows], tolerance) for d, rows in neighbours]
+
+        distances = self._distances(state, face_encodings)
+        if size == 0:
+            return [MatchResult(None, float('inf'), 0.0, False) for _ in range(len(distances))]
+
+        ids = ids[:size]
+        rows = np.arange(len(distances))
+        best = np.argmin(distances, axis=1)
+        best_distance = distances[rows, best]
+        best_id = ids[best]
+
+        # Closest encoding that belongs to a different person gives the confidence margin
+        other = np.where(ids[None, :] == best_id[:, None], np.inf, distances)
+        runner_up = other.min(axis=1)
+
+        results = []
+        for distance, identity_id, second in zip(best_distance.tolist(), best_id.tolist(), runner_up.tolist()):
+            matched = distance <= tolerance
+            results.append(MatchResult(
+                self.identities[identity_id] if matched else None,
+                distance,
+                second - distance,
+                matched,
+            ))
+        return results
+
+    def _match_candidates(self, distances, candidate_ids, tolerance):
+        """
+        Turn the sorted neighbours returned by an approximate index into a MatchResult.
+        When every candidate belongs to the same person, the farthest candidate
+        bounds the margin from below.
+        """
+        if len(distances) == 0:
+            return MatchResult(None, float('inf'), 0.0, False)
+
+        distance = float(distances[0])
+        others = distances[candidate_ids != candidate_ids[0]]
+        second = float(others[0]) if len(others) else float(distances[-1])
+        matched = distance <= tolerance
+        return MatchResult(
+            self.identities[candidate_ids[0]] if matched else None,
+            distance,
+            second - distance,
+            matched,
+        )
@@ -0,0 +1,118 @@
+# Import necessary libraries
+import os  # For atomic replacement of the compact gallery file
+import hashlib  # For fingerprinting the labels of the full gallery
+import numpy as np  # NumPy for clustering encodings into prototypes
+from gallery_index import gallery_digest  # Fingerprint of the full gallery
+
+
+def person_prototypes(encodings, max_prototypes=3, method='centroid', outlier_distance=0.45,
+                      iterations=10):
+    """
+    Cluster one person's encodings into a small set of prototypes.
+
+    Parameters:
+    encodings (numpy.ndarray): (N, dim) encodings of a single person.
+    max_prototypes (int): Maximum number of prototypes kept for the person.
+    method (str): 'centroid' keeps cluster means, 'medoid' keeps the real encoding
+                  closest to each cluster mean.
+    outlier_distance (float): Encodings farther than this from the person's median
+                              encoding are dropped before clustering.
+    iterations (int): Number of k-means iterations.
+
+    Returns:
+    numpy.ndarray: (P, dim) prototypes with 1 <= P <= max_prototypes.
+    """
+    encodings = np.asarray(encodings, dtype=np.float32)
+    if len(encodings) <= 1:
+        return encodings.copy()
+
+    # Outlier filter: drop bad augmentations and mis-detections far from the median face
+    center = np.median(encodings, axis=0)
+    spread = np.linalg.norm(encodings - center, axis=1)
+    inliers = encodings[spread <= outlier_distance]
+    if len(inliers) == 0:
+        inliers = encodings[[int(np.argmin(spread))]]
+
+    k = max(1, min(max_prototypes, len(inliers)))
+    # Deterministic farthest-point seeding keeps prototypes spread over the poses
+    seeds = [int(np.argmin(np.linalg.norm(inliers - center, axis=1)))]
+    while len(seeds) < k:
+        gaps = np.min(np.linalg.norm(inliers[:, None, :] - inliers[seeds][None, :, :], axis=2), axis=1)
+        seeds.append(int(np.argmax(gaps)))
+    centroids = inliers[seeds].copy()
+
+    for _ in range(iterations):
+        labels = np.argmin(np.linalg.norm(inliers[:, None, :] - centroids[None, :, :], axis=2), axis=1)
+        for cluster in range(k):
+            members = inliers[labels == cluster]
+            if len(members):
+                centroids[cluster] = members.mean(axis=0)
+
+    if method == 'medoid':
+        closest = np.argmin(np.linalg.norm(inliers[:, None, :] - centroids[None, :, :], axis=2), axis=0)
+        return inliers[closest]
+    if method != 'centroid':
+        raise ValueError(f"Unknown compaction method: {method}")
+    return centroids
+
+
+def compact_gallery(encodings, names, **options):
+    """
+    Replace every person's encodings with a small number of prototypes.
+
+    Parameters:
+    encodings (numpy.ndarray): (N, dim) full gallery encodings.
+    names (sequence): Person name of every encoding.
+    options: Arguments forwarded to person_prototypes().
+
+    Returns:
+    tuple: (prototype encodings, prototype names) in order of first appearance.
+    """
+    encodings = np.asarray(encodings, dtype=np.float32)
+    rows_by_person = {}
+    for row, name in enumerate(names):
+        rows_by_person.setdefault(name, []).append(row)
+
+    prototypes = []
+    prototype_names = []
+    for name, rows in rows_by_person.items():
+        person = person_prototypes(encodings[rows], **options)
+        prototypes.append(person)
+        prototype_names.extend([name] * len(person))
+
+    if not prototypes:
+        return np.empty((0, encodings.shape[1] if encodings.ndim == 2 else 128), dtype=np.float32), []
+    return np.vstack(prototypes), prototype_names
+
+
+def load_compact_gallery(path, full_encodings, full_names, **options):
+    """
+    Return the compact gallery for a full gallery, reusing the copy stored on disk
+    when it was computed from exactly the same encodings and names.
+
+    Parameters:
+    path (str): The .npz file holding the compact gallery.
+    full_encodings (numpy.ndarray): (N, dim) full gallery encodings.
+    full_names (sequence): Person name of every full gallery encoding.
+    options: Arguments forwarded to person_prototypes().
+
+    Returns:
+    tuple: (prototype encodings, prototype names).
+    """
+    # Renamed folders keep their encodings, so the labels are part of the fingerprint too
+    names_digest = hashlib.sha1('\n'.join(full_names).encode('utf-8')).hexdigest()
+    digest = gallery_digest(full_encodings) + names_digest + repr(sorted(options.items()))
+    if os.path.exists(path):
+        try:
+            with np.load(path) as data:
+                if str(data['digest']) == digest:
+                    return data['encodings'], data['names'].tolist()
+        except (OSError, ValueError, KeyError):
+            pass  # Recompute a corrupt file
+
+    encodings, names = compact_gallery(full_encodings, full_names, **options)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, digest=np.array(digest), encodings=encodings, names=np.array(names, dtype=str))
+    os.replace(tmp_path, path)
+    return encodings, names
@@ -0,0 +1,299 @@
+# Import necessary libraries
+import os  # For atomic replacement of index files
+import hashlib  # For fingerprinting the gallery an index was built from
+import numpy as np  # NumPy for k-means training and candidate scoring
+
+
+def gallery_digest(encodings):
+    """
+    Fingerprint a gallery matrix so a persisted index is only reused for the same rows.
+
+    Parameters:
+    encodings (numpy.ndarray): (N, dim) float32 gallery encodings.
+
+    Returns:
+    str: Hexadecimal digest of the encodings.
+    """
+    return hashlib.sha1(np.ascontiguousarray(encodings).tobytes()).hexdigest()
+
+
+def top_k(distances, rows, k):
+    """
+    Select the k smallest distances of a candidate set, sorted ascending.
+
+    Parameters:
+    distances (numpy.ndarray): Candidate distances.
+    rows (numpy.ndarray): Gallery row of every candidate.
+    k (int): Number of neighbours to keep.
+
+    Returns:
+    tuple: (distances, rows) of the k nearest candidates.
+    """
+    if len(distances) > k:
+        keep = np.argpartition(distances, k - 1)[:k]
+        distances, rows = distances[keep], rows[keep]
+    order = np.argsort(distances, kind='stable')
+    return distances[order], rows[order]
+
+
+def candidate_distances(encodings, sq_norms, query, rows):
+    """
+    Compute the Euclidean distance from one query to a subset of gallery rows.
+    """
+    squared = sq_norms[rows] - 2.0 * (encodings[rows] @ query) + query @ query
+    return np.sqrt(np.maximum(squared, 0.0))
+
+
+# Exact backend: brute force over every gallery row
+class ExactIndex:
+    kind = 'exact'
+    nbytes = 0  # No memory on top of the gallery matrix
+
+    def build(self, encodings):
+        """
+        Nothing to train: the exact index scans the gallery directly.
+        """
+
+    def add(self, encodings, start):
+        """
+        Nothing to update: new gallery rows are scanned automatically.
+        """
+
+    def search(self, encodings, sq_norms, queries, k):
+        """
+        Find the k nearest gallery rows of every query.
+
+        Parameters:
+        encodings (numpy.ndarray): (N, dim) gallery encodings.
+        sq_norms (numpy.ndarray): Squared norm of every gallery row.
+        queries (numpy.ndarray): (F, dim) query encodings.
+        k (int): Number of neighbours to return per query.
+
+        Returns:
+        list: One (distances, rows) pair per query, nearest first.
+        """
+        all_rows = np.arange(len(encodings))
+        return [top_k(candidate_distances(encodings, sq_norms, q, all_rows), all_rows, k) for q in queries]
+
+    def save(self, path, encodings):
+        """
+        The exact index has no state worth persisting.
+        """
+
+    def load(self, path, encodings):
+        """
+        The exact index is always ready.
+
+        Returns:
+        bool: Always True.
+        """
+        return True
+
+
+# Approximate backend: inverted file (IVF) index with a k-means coarse quantiser
+class IVFIndex:
+    kind = 'ivf'
+
+    def __init__(self, n_lists=None, n_probe=8, train_iterations=10, min_size=2048, seed=0):
+        """
+        Initialize the IVFIndex class.
+
+        Parameters:
+        n_lists (int): Number of k-means cells. Defaults to 4 * sqrt(gallery size).
+        n_probe (int): Cells scanned per query. Higher values raise recall and latency.
+        train_iterations (int): Number of k-means iterations when building.
+        min_size (int): Galleries smaller than this are scanned exactly.
+        seed (int): Random seed for reproducible training.
+        """
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_iterations = train_iterations
+        self.min_size = min_size
+        self.seed = seed
+        self.centroids = None  # (n_lists, dim) cell centres, None while untrained
+        self._assignments = np.empty(0, dtype=np.int32)  # Cell of every gallery row
+        self._lists = []  # Gallery rows stored in every cell
+
+    @property
+    def nbytes(self):
+        """int: Memory held by the index on top of the gallery matrix."""
+        if self.centroids is None:
+            return 0
+        return int(self.centroids.nbytes + self._assignments.nbytes + sum(rows.nbytes for rows in self._lists))
+
+    def _assign(self, vectors, block_elements=1 << 22):
+        """
+        Return the nearest centroid of every vector.
+        Vectors are processed in blocks so the distance matrix stays small for large galleries.
+        """
+        centroid_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)[None, :]
+        block = max(1, block_elements // len(self.centroids))
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), block):
+            chunk = vectors[start:start + block]
+            squared = chunk @ self.centroids.T
+            squared *= -2.0
+            squared += centroid_norms
+            squared += np.einsum('ij,ij->i', chunk, chunk)[:, None]
+            labels[start:start + block] = np.argmin(squared, axis=1)
+        return labels
+
+    def _rebuild_lists(self):
+        """
+        Rebuild the per-cell row lists from the assignment vector.
+        """
+        order = np.argsort(self._assignments, kind='stable').astype(np.int32)
+        bounds = np.searchsorted(self._assignments[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+
+    def build(self, encodings):
+        """
+        Train the coarse quantiser on the gallery and assign every row to a cell.
+
+        Parameters:
+        encodings (numpy.ndarray): (N, dim) gallery encodings.
+        """
+        size = len(encodings)
+        self.centroids = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._lists = []
+        if size < self.min_size:
+            return  # Small galleries are scanned exactly
+
+        n_lists = self.n_lists or int(4 * np.sqrt(size))
+        n_lists = max(1, min(n_lists, size))
+        rng = np.random.default_rng(self.seed)
+
+        # Train on a bounded sample so building stays fast for very large galleries
+        sample_size = min(size, 64 * n_lists)
+        sample = np.asarray(encodings[rng.choice(size, sample_size, replace=False)], dtype=np.float32)
+        self.centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = self._assign(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            filled = counts > 0
+            # Empty cells keep their previous centre
+            self.centroids[filled] = sums[filled] / counts[filled, None]
+
+        self._assignments = self._assign(np.asarray(encodings, dtype=np.float32))
+        self._rebuild_lists()
+
+    def add(self, encodings, start):
+        """
+        Incrementally insert new gallery rows into their nearest cells.
+
+        Parameters:
+        encodings (numpy.ndarray): (N, dim) gallery encodings after the insert.
+        start (int): Gallery row of the first new encoding.
+        """
+        if self.centroids is None:
+            # Train once the gallery outgrows the exact-scan threshold
+            if len(encodings) >= self.min_size:
+                self.build(encodings)
+            return
+
+        labels = self._assign(np.asarray(encodings[start:], dtype=np.float32))
+        self._assignments = np.concatenate([self._assignments, labels])
+        for offset, label in enumerate(labels.tolist()):
+            self._lists[label] = np.append(self._lists[label], np.int32(start + offset))
+
+    def search(self, encodings, sq_norms, queries, k):
+        """
+        Find the approximate k nearest gallery rows of every query.
+
+        Parameters:
+        encodings (numpy.ndarray): (N, dim) gallery encodings.
+        sq_norms (numpy.ndarray): Squared norm of every gallery row.
+        queries (numpy.ndarray): (F, dim) query encodings.
+        k (int): Number of neighbours to return per query.
+
+        Returns:
+        list: One (distances, rows) pair per query, nearest first.
+        """
+        if self.centroids is None:
+            return ExactIndex().search(encodings, sq_norms, queries, k)
+
+        size = len(encodings)
+        n_probe = min(self.n_probe, len(self.centroids))
+        cell_distances = (
+            -2.0 * (queries @ self.centroids.T)
+            + np.einsum('ij,ij->i', self.centroids, self.centroids)[None, :]
+        )
+        results = []
+        for query, cells in zip(queries, cell_distances):
+            probed = np.argpartition(cells, n_probe - 1)[:n_probe]
+            rows = np.concatenate([self._lists[c] for c in probed])
+            rows = rows[rows < size]  # Ignore rows newer than the caller's snapshot
+            results.append(top_k(candidate_distances(encodings, sq_norms, query, rows), rows, k))
+        return results
+
+    def save(self, path, encodings):
+        """
+        Persist the trained quantiser and row assignments.
+
+        Parameters:
+        path (str): Destination .npz file.
+        encodings (numpy.ndarray): The gallery the index was built for.
+        """
+        if self.centroids is None:
+            return
+        tmp_path = path + '.tmp.npz'
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            assignments=self._assignments,
+            digest=np.array(gallery_digest(encodings[:len(self._assignments)])),
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, path, encodings):
+        """
+        Restore a persisted index if it was built from (a prefix of) this gallery.
+        Rows appended since the index was saved are inserted incrementally.
+
+        Parameters:
+        path (str): The .npz file written by save().
+        encodings (numpy.ndarray): The current gallery encodings.
+
+        Returns:
+        bool: True if the index was restored, False if it must be rebuilt.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path) as data:
+                centroids = data['centroids']
+                assignments = data['assignments']
+                digest = str(data['digest'])
+        except (OSError, ValueError, KeyError):
+            return False
+
+        if len(assignments) > len(encodings) or gallery_digest(encodings[:len(assignments)]) != digest:
+            return False
+
+        self.centroids = centroids.astype(np.float32)
+        self._assignments = assignments.astype(np.int32)
+        self._rebuild_lists()
+        if len(assignments) < len(encodings):
+            self.add(encodings, len(assignments))
+        return True
+
+
+def make_index(backend='exact', **options):
+    """
+    Create a gallery index backend by name.
+
+    Parameters:
+    backend (str): 'exact' for brute force or 'ivf' for the approximate inverted file index.
+    options: Tuning knobs forwarded to the backend (e.g. n_lists, n_probe).
+
+    Returns:
+    ExactIndex or IVFIndex: The requested backend.
+    """
+    if backend == 'exact':
+        return ExactIndex()
+    if backend == 'ivf':
+        return IVFIndex(**options)
+    raise ValueError(f"Unknown gallery index backend: {backend}")
@@ -0,0 +1,90 @@
+# Import necessary libraries
+import time  # For reload timing metrics
+import threading  # Background polling thread
+
+
+# Define a watcher that keeps the running gallery in sync with the dataset directory
+class GalleryWatcher:
+    def __init__(self, core, interval=2.0, on_reload=None):
+        """
+        Initialize the GalleryWatcher class.
+
+        Parameters:
+        core (FaceRecognitionCore): Recognizer whose gallery is kept up to date.
+        interval (float): Seconds between polls of the dataset directory.
+        on_reload (callable): Called with the reload summary dict after every applied change.
+        """
+        self.core = core
+        self.interval = interval
+        self.on_reload = on_reload
+        self._pending = None  # Changed snapshot waiting for the dataset to settle
+        self._stop = threading.Event()
+        self._thread = None
+        self.reloads = 0
+        self.last_reload_time = 0.0  # Seconds spent applying the last change
+        self.last_error = None
+
+    def start(self):
+        """
+        Start polling on a background thread.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop polling and wait for a reload in progress to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # A file still being written can fail to decode; the next poll retries it
+                self.last_error = e
+                print(f"[WARN] Gallery reload failed: {e}")
+
+    def poll(self):
+        """
+        Check the dataset once and apply changes that have settled.
+        A change is applied only when two consecutive polls see the same snapshot,
+        so images that are still being copied in are not encoded half-written.
+
+        Returns:
+        dict or None: The reload summary, or None when nothing was applied.
+        """
+        state = self.core.scan_dataset()
+        if state == self.core.dataset_state:
+            self._pending = None
+            return None
+        if state != self._pending:
+            self._pending = state  # Wait one more interval for the dataset to settle
+            return None
+
+        start_time = time.perf_counter()
+        summary = self.core.reload_known_faces()
+        self.last_reload_time = time.perf_counter() - start_time
+        self._pending = None
+        self.reloads += 1
+        self.last_error = None
+        print(f"[INFO] Gallery reloaded: {summary['added']} added, {summary['removed']} removed "
+              f"in {self.last_reload_time:.2f}s")
+        if self.on_reload is not None:
+            self.on_reload(summary)
+        return summary
+
+    def stats(self):
+        """
+        Report how often and how quickly the gallery was reloaded.
+        """
+        return {
+            'reloads': self.reloads,
+            'last_reload_time': self.last_reload_time,
+            'last_error': None if self.last_error is None else str(self.last_error),
+        }
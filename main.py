@@ -4,11 +4,14 @@
 
 import tkinter as tk  # Tkinter library for building the graphical user interface (GUI)
 from tkinter import messagebox, ttk, Toplevel, Label, PhotoImage  # Specific Tkinter widgets and components
-from face_core import FaceRecognitionCore  # Custom module handling face recognition logic
+from face_core import FaceRecognitionCore, CameraError  # Custom module handling face recognition logic
 from face_register import FaceRegister  # Custom module for registering new faces
+from adaptive_scaler import AdaptiveScaler  # Latency-driven detection scale
+from report_viewer import AttendanceReportViewer  # Paged attendance report window
+from config import load_config  # Central application configuration
+from gallery_watcher import GalleryWatcher  # Hot reload of dataset changes
 import threading  # For running tasks in parallel threads
 import time  # For time-related operations (delays, timeout)
-import csv  # For reading and writing CSV files
 import os  # For operating system-level operations (path handling, file reading)
 import cv2  # OpenCV library for accessing camera and image processing
 import face_recognition  # Face recognition library built on dlib
@@ -21,12 +24,14 @@ from datetime import datetime  # For fetching and formatting current date and ti
 # -------------------------------------------------------
 
 class SplashScreen(tk.Toplevel):
-    def __init__(self, parent):
+    def __init__(self, parent, logo_path="logo.png", delay_ms=3000):
         """
         Initialize the Splash Screen Window.
 
         Parameters:
         parent (tk.Tk): The parent window object.
+        logo_path (str): Image shown on the splash screen.
+        delay_ms (int): Time in milliseconds before the splash screen closes.
         """
         super().__init__(parent)
         self.configure(bg="#1e2a38")
@@ -38,7 +43,7 @@ class SplashScreen(tk.Toplevel):
         self.geometry(f"{screen_width}x{screen_height}+0+0")
 
         # Load and display the application logo
-        logo_image = Image.open("logo.png")
+        logo_image = Image.open(logo_path)
         self.logo = ImageTk.PhotoImage(logo_image)
 
         logo_label = tk.Label(self, image=self.logo, bg="#1e2a38")
@@ -54,33 +59,45 @@ class SplashScreen(tk.Toplevel):
         )
         loading_text.place(relx=0.5, rely=0.65, anchor="center")
 
-        # Automatically destroy splash screen after 3 seconds
-        self.after(3000, self.destroy)
+        # Automatically destroy splash screen after the configured delay
+        self.after(delay_ms, self.destroy)
 # -------------------------------------------------------
 # FaceRecognitionApp Class
 # Main Application Window for Biometric Authentication System
 # -------------------------------------------------------
 
 class FaceRecognitionApp:
-    def __init__(self, master):
+    def __init__(self, master, config=None):
         """
         Initialize the main Face Recognition Application.
 
         Parameters:
         master (tk.Tk): The root window of the application.
+        config (AppConfig): Application configuration. Loaded from config.json / environment if omitted.
         """
         self.master = master
+        self.config = config or load_config()
         master.title("Biometric Authentication System")
         master.geometry("800x600")
         master.configure(bg="#1e2a38")
         master.minsize(600, 400)
 
         # Instantiate the Face Recognition Core and Face Registration Modules
-        self.attendance = FaceRecognitionCore()
-        self.registrar = FaceRegister()
+        self.attendance = FaceRecognitionCore.from_config(self.config)
 
-        # Detect available camera index
-        self.camera_index = self.detect_camera_index()
+        # Pick up dataset changes (new or deleted people and images) while the app runs
+        self.gallery_watcher = GalleryWatcher(self.attendance, interval=self.config.recognition.reload_interval)
+        if self.config.recognition.reload_interval > 0:
+            self.gallery_watcher.start()
+
+        # Use the configured camera, or detect the available camera index
+        self.camera_index = self.config.ui.camera_index
+        if self.camera_index < 0:
+            self.camera_index = self.detect_camera_index()
+
+        # New people are enrolled straight into the running recognizer
+        self.registrar = FaceRegister(dataset_dir=self.config.paths.dataset_dir, core=self.attendance,
+                                      camera_index=self.camera_index)
 
         # Configure custom style for GUI buttons
         style = ttk.Style()
@@ -98,7 +115,7 @@ class FaceRecognitionApp:
 
         # Load and display the application logo
         try:
-            self.logo = PhotoImage(file="logo.png")
+            self.logo = PhotoImage(file=self.config.paths.logo)
             logo_label = tk.Label(master, image=self.logo, bg="#1e2a38")
             logo_label.pack(pady=(30, 10))
         except Exception:
@@ -202,6 +219,9 @@ class FaceRecognitionApp:
         try:
             messagebox.showinfo("Starting", "Starting Face Recognition...")
             self.attendance.run_attendance(camera_index=self.camera_index)  # <--- updated
+            messagebox.showinfo("Attendance Finished", "Face recognition attendance session has ended.")
+        except CameraError as e:
+            messagebox.showerror("Camera Error", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
@@ -209,38 +229,23 @@ class FaceRecognitionApp:
         """
         Launch the Admin Mode after verifying the user's identity via face recognition.
         """
+        # Admin encodings come from the already-loaded gallery, filtered by admins.txt
+        admin_gallery = self.attendance.admin_gallery(self.config.paths.admins_file)
+        if not admin_gallery.identities:
+            if self.attendance.admin_names:
+                messagebox.showerror("Access Denied", "None of the configured admins has registered face images.")
+            else:
+                messagebox.showerror("Access Denied", "No admins configured.")
+            return
+
         cap = cv2.VideoCapture(self.camera_index)
         if not cap.isOpened():
             messagebox.showerror("Camera Error", "Unable to access the camera.")
             return
 
-        # Dataset location where admin images are stored
-        dataset_base = r"D:\\s8\\final project\\other resource\\xom\\dataset"
-        admin_list = []
-
-        # Load the list of registered admins
-        if os.path.exists("admins.txt"):
-            with open("admins.txt", "r") as f:
-                admin_list = [line.strip() for line in f if line.strip()]
-
-        if not admin_list:
-            messagebox.showerror("Access Denied", "No admins configured.")
-            return
-
-        # Load encodings for all admin faces
-        known_encodings = []
-        for admin_name in admin_list:
-            admin_folder = os.path.join(dataset_base, admin_name)
-            if os.path.exists(admin_folder):
-                for img_name in os.listdir(admin_folder):
-                    img_path = os.path.join(admin_folder, img_name)
-                    image = face_recognition.load_image_file(img_path)
-                    encodings = face_recognition.face_encodings(image)
-                    if encodings:
-                        known_encodings.append(encodings[0])
-
+        admin_scaler = AdaptiveScaler(**self.attendance.scaler_options)
         verified = False
-        timeout_seconds = 10  # Maximum time to attempt verification
+        timeout_seconds = self.config.ui.admin_timeout  # Maximum time to attempt verification
         start_time = time.time()
 
         # Begin verification loop
@@ -249,17 +254,13 @@ class FaceRecognitionApp:
             if not ret:
                 continue
 
-            # Process the frame for face detection
-            small = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-            rgb_small = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
-
-            face_locations = face_recognition.face_locations(rgb_small)
-            face_encodings = face_recognition.face_encodings(rgb_small, face_locations)
+            # Process the frame for face detection at the adaptive detection scale
+            rgb_small, face_locations, _ = self.attendance.locate_faces(frame, admin_scaler)
+            face_encodings = face_recognition.face_encodings(rgb_small, face_locations, model=self.attendance.encoding_model)
 
             # Compare detected faces with known admin faces
-            for encoding in face_encodings:
-                matches = face_recognition.compare_faces(known_encodings, encoding, tolerance=0.5)
-                if True in matches:
+            for match in admin_gallery.match(face_encodings, tolerance=self.attendance.tolerance):
+                if match.matched:
                     verified = True
                     break
 
@@ -293,7 +294,7 @@ class FaceRecognitionApp:
 
         # Attempt to load and display the logo
         try:
-            logo_img = Image.open("logo.png")
+            logo_img = Image.open(self.config.paths.logo)
             self.admin_logo = ImageTk.PhotoImage(logo_img)
             logo_label = tk.Label(self.admin_window, image=self.admin_logo, bg="#ffffff")
             logo_label.pack(pady=(20, 10))
@@ -331,8 +332,8 @@ class FaceRecognitionApp:
         self.admin_tree.pack(padx=10, pady=20, fill=tk.X)
 
         # Populate the admin list from the existing records
-        if os.path.exists("admins.txt"):
-            with open("admins.txt", "r") as f:
+        if os.path.exists(self.config.paths.admins_file):
+            with open(self.config.paths.admins_file, "r") as f:
                 admins = [line.strip() for line in f if line.strip()]
                 for admin in admins:
                     self.admin_tree.insert("", tk.END, values=(admin,))
@@ -350,8 +351,8 @@ class FaceRecognitionApp:
         self.admin_tree.pack(padx=10, pady=20, fill=tk.BOTH, expand=True)
 
         # Populate the TreeView with admin names
-        if os.path.exists("admins.txt"):
-            with open("admins.txt", "r") as f:
+        if os.path.exists(self.config.paths.admins_file):
+            with open(self.config.paths.admins_file, "r") as f:
                 admins = [line.strip() for line in f if line.strip()]
                 for admin in admins:
                     self.admin_tree.insert("", tk.END, values=(admin,))
@@ -360,15 +361,15 @@ class FaceRecognitionApp:
         """
         Promote a registered person to Admin role.
         """
-        dataset_path = r"D:\\s8\\final project\\other resource\\xom\\dataset"
+        dataset_path = self.config.paths.dataset_dir
         persons = [d for d in os.listdir(dataset_path) if os.path.isdir(os.path.join(dataset_path, d))]
 
         if not persons:
             messagebox.showerror("Error", "No persons found in dataset.")
             return
 
-        if os.path.exists("admins.txt"):
-            with open("admins.txt", "r") as f:
+        if os.path.exists(self.config.paths.admins_file):
+            with open(self.config.paths.admins_file, "r") as f:
                 current_admins = [line.strip() for line in f if line.strip()]
             available_persons = [p for p in persons if p not in current_admins]
         else:
@@ -396,7 +397,7 @@ class FaceRecognitionApp:
         # Confirm the selected admin
         def confirm_selection():
             admin_name = selected_admin.get()
-            with open("admins.txt", "a") as f:
+            with open(self.config.paths.admins_file, "a") as f:
                 f.write(admin_name + "\n")
             messagebox.showinfo("Success", f"{admin_name} added as Admin!")
             admin_window.destroy()
@@ -417,10 +418,10 @@ class FaceRecognitionApp:
         admin_name = self.admin_tree.item(selected_item, "values")[0]
 
         if messagebox.askyesno("Confirm Delete", f"Delete {admin_name}?"):
-            if os.path.exists("admins.txt"):
-                with open("admins.txt", "r") as f:
+            if os.path.exists(self.config.paths.admins_file):
+                with open(self.config.paths.admins_file, "r") as f:
                     lines = f.readlines()
-                with open("admins.txt", "w") as f:
+                with open(self.config.paths.admins_file, "w") as f:
                     for line in lines:
                         if line.strip() != admin_name:
                             f.write(line)
@@ -433,6 +434,7 @@ class FaceRecognitionApp:
         """
         try:
             messagebox.showinfo("Register Person", "Camera will open. Press 'S' to save, 'Q' to quit.")
+            # The registrar enrolls the new person into self.attendance as soon as the poses are captured
             self.registrar.register_new_person()
             messagebox.showinfo("Success", "Person registered successfully!")
         except Exception as e:
@@ -442,35 +444,13 @@ class FaceRecognitionApp:
         """
         Display the attendance records in a separate report window.
         """
-        report_window = Toplevel(self.master)
-        report_window.title("Attendance Report")
-        report_window.geometry("600x500")
-        report_window.configure(bg="#ffffff")
-
-        if not os.path.exists("attendance.csv"):
-            tk.Label(report_window, text="No attendance records found.", font=("Helvetica", 12), bg="#ffffff").pack(pady=20)
-            return
-
-        # Create TreeView for displaying the records
-        tree = ttk.Treeview(report_window, columns=("Name", "Time", "Date"), show='headings')
-        tree.heading("Name", text="Name")
-        tree.heading("Time", text="Time")
-        tree.heading("Date", text="Date")
-        tree.column("Name", width=180)
-        tree.column("Time", width=120)
-        tree.column("Date", width=200)
-        tree.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
-
-        # Populate attendance records
-        with open("attendance.csv", newline='') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if len(row) == 3:
-                    tree.insert("", tk.END, values=row)
+        # Rows are fetched one page at a time from the attendance database
+        viewer = AttendanceReportViewer(self.master, self.attendance.attendance_store)
+        report_window = viewer.window
 
         # Display logo at the bottom if available
         try:
-            logo_img = Image.open("logo.png")
+            logo_img = Image.open(self.config.paths.logo)
             logo_photo = ImageTk.PhotoImage(logo_img)
             logo_label = tk.Label(report_window, image=logo_photo, bg="#ffffff")
             logo_label.image = logo_photo
@@ -482,6 +462,8 @@ def main():
     Entry point of the application.
     Displays the splash screen first, then launches the main Face Recognition App.
     """
+    config = load_config()  # config.json and BIOAUTH_* environment overrides
+
     # Initialize the splash screen window
     splash_root = tk.Tk()
     splash_root.overrideredirect(True)  # Remove window decorations for splash
@@ -494,7 +476,7 @@ def main():
 
     # Attempt to load and display the splash logo
     try:
-        logo_photo = ImageTk.PhotoImage(Image.open("logo.png"))
+        logo_photo = ImageTk.PhotoImage(Image.open(config.paths.logo))
         logo_label = tk.Label(splash_root, image=logo_photo, bg="#1e2a38")
         logo_label.image = logo_photo  # Keep a reference to avoid garbage collection
         logo_label.place(relx=0.5, rely=0.4, anchor="center")
@@ -516,11 +498,13 @@ def main():
     def launch_main():
         splash_root.destroy()  # Close the splash screen
         main_root = tk.Tk()  # Create main application window
-        app = FaceRecognitionApp(main_root)  # Initialize FaceRecognitionApp
+        app = FaceRecognitionApp(main_root, config)  # Initialize FaceRecognitionApp
         main_root.mainloop()  # Start the main event loop
+        app.gallery_watcher.stop()
+        app.attendance.close()  # Flush queued attendance records before exiting
 
-    # Schedule the main application to launch after 3 seconds
-    splash_root.after(3000, launch_main)
+    # Schedule the main application to launch after the splash delay
+    splash_root.after(config.ui.splash_delay_ms, launch_main)
 
     # Start the splash screen event loop
     splash_root.mainloop()
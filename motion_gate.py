@@ -0,0 +1,90 @@
+# Import necessary libraries
+import threading  # For sharing one gate between inference workers
+import cv2  # OpenCV for cheap frame differencing
+import numpy as np  # NumPy for the background model
+
+
+# Define a gate that lets the face detector idle while the scene is static
+class MotionGate:
+    def __init__(self, sensitivity=25, min_changed_fraction=0.01, max_skip=30, width=160, learning_rate=0.05):
+        """
+        Initialize the MotionGate class.
+
+        Parameters:
+        sensitivity (int): Per-pixel grey-level change counted as motion (lower is more sensitive).
+        min_changed_fraction (float): Fraction of changed pixels needed to run detection.
+        max_skip (int): Detection is forced after this many gated frames in a row,
+                        so slow changes are never missed for long.
+        width (int): Width of the thumbnail compared between frames.
+        learning_rate (float): How quickly the background model absorbs scene changes.
+        """
+        self.sensitivity = sensitivity
+        self.min_changed_fraction = min_changed_fraction
+        self.max_skip = max_skip
+        self.width = width
+        self.learning_rate = learning_rate
+        self._background = None  # Running average of the static scene
+        self._skipped = 0  # Consecutive gated frames
+        self._lock = threading.Lock()
+        self.frames_seen = 0
+        self.frames_gated = 0
+        self.last_changed_fraction = 0.0
+
+    def _thumbnail(self, frame):
+        """
+        Reduce a BGR frame to a small blurred greyscale image.
+        """
+        height = max(1, int(frame.shape[0] * self.width / frame.shape[1]))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_detect(self, frame):
+        """
+        Decide whether the face detector has to run on this frame.
+
+        Parameters:
+        frame (numpy.ndarray): Full-resolution BGR camera frame.
+
+        Returns:
+        bool: True if the scene changed enough (or the skip limit was reached).
+        """
+        gray = self._thumbnail(frame)
+        with self._lock:
+            return self._update(gray)
+
+    def _update(self, gray):
+        """
+        Compare a thumbnail with the background model and update the gate state.
+        """
+        self.frames_seen += 1
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray.astype(np.float32)
+            self._skipped = 0
+            return True  # Always look at the first frame
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        _, changed = cv2.threshold(diff, self.sensitivity, 255, cv2.THRESH_BINARY)
+        self.last_changed_fraction = cv2.countNonZero(changed) / changed.size
+        cv2.accumulateWeighted(gray, self._background, self.learning_rate)
+
+        if self.last_changed_fraction >= self.min_changed_fraction or self._skipped >= self.max_skip:
+            self._skipped = 0
+            return True
+
+        self._skipped += 1
+        self.frames_gated += 1
+        return False
+
+    def stats(self):
+        """
+        Report how much detection work the gate saved.
+
+        Returns:
+        dict: Frames seen, frames gated out and the gated ratio.
+        """
+        return {
+            'frames_seen': self.frames_seen,
+            'frames_gated': self.frames_gated,
+            'gated_ratio': self.frames_gated / self.frames_seen if self.frames_seen else 0.0,
+        }
@@ -0,0 +1,238 @@
+# Import necessary libraries
+import os  # For sizing the worker pool from the CPU count
+import time  # For frame timestamps and rate statistics
+import threading  # Capture threads, inference workers and the scheduler condition
+from collections import deque  # Recent latencies of each source
+import cv2  # OpenCV for probing the attached cameras
+import numpy as np  # NumPy for latency percentiles
+from frame_sources import open_source  # Cameras, video files, image directories and streams
+
+
+def available_cameras(max_index=10):
+    """
+    List the camera indexes that can be opened.
+
+    Parameters:
+    max_index (int): Highest index probed, exclusive.
+
+    Returns:
+    list: Indexes of the cameras that opened successfully.
+    """
+    found = []
+    for index in range(max_index):
+        cap = cv2.VideoCapture(index)
+        if cap.isOpened():
+            found.append(index)
+        cap.release()
+    return found
+
+
+# One video source handled by the scheduler
+class CameraSource:
+    def __init__(self, name, source, stream, latency_window=200):
+        """
+        Initialize the CameraSource class.
+
+        Parameters:
+        name (str): Label used in statistics and callbacks.
+        source (int or str): Camera index, video file, image directory or stream URL (see open_source).
+        stream (StreamState): Tracker, motion gate and scaler of this source.
+        latency_window (int): Number of recent frames the latency statistics cover.
+        """
+        self.name = name
+        self.source = source
+        self.stream = stream
+        self.capture = None
+        self.pending = None  # (frame, capture time) of the newest frame not yet analyzed
+        self.busy = False  # A worker is analyzing a frame of this source
+        self.finished = False  # The source ended or could not be opened
+        self.error = None
+        self.frames_captured = 0
+        self.frames_analyzed = 0
+        self.frames_dropped = 0  # Replaced by a newer frame before a worker picked them up
+        self.latencies = deque(maxlen=latency_window)  # Capture-to-result seconds
+        self.busy_time = 0.0  # Worker seconds spent on this source
+        self.last_detections = []
+
+    def stats(self, elapsed):
+        """
+        Report the throughput and latency of this source.
+        """
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            'source': self.source,
+            'error': self.error,
+            'frames_captured': self.frames_captured,
+            'frames_analyzed': self.frames_analyzed,
+            'frames_dropped': self.frames_dropped,
+            'capture_fps': self.frames_captured / elapsed,
+            'inference_fps': self.frames_analyzed / elapsed,
+            'cpu_share': self.busy_time / elapsed,  # Worker-seconds per second spent on this source
+            'latency_mean': float(latencies.mean()),
+            'latency_p95': float(np.percentile(latencies, 95)),
+            'faces': len(self.last_detections),
+        }
+
+
+# Define a scheduler that runs many cameras against one shared gallery and worker pool
+class MultiCameraScheduler:
+    def __init__(self, core, sources, workers=None, on_detections=None):
+        """
+        Initialize the MultiCameraScheduler class.
+
+        Every source gets a capture thread that keeps only its newest frame. A shared
+        pool of inference workers takes frames round-robin across the sources, with at
+        most one frame per source in flight, so a busy camera cannot starve the others
+        and each source's tracker sees its frames in order.
+
+        Parameters:
+        core (FaceRecognitionCore): Engine providing the shared gallery and attendance sink.
+        sources (list): Camera indexes, video files, image directories or stream URLs.
+        workers (int): Inference worker threads. Defaults to one per source, at most the CPU count.
+        on_detections (callable): Called with (source name, frame, detections) after each analyzed frame.
+        """
+        self.core = core
+        self.sources = [CameraSource(str(source), source, core.new_stream()) for source in sources]
+        self.workers = workers or min(len(self.sources), os.cpu_count() or 1)
+        self.workers = max(1, min(self.workers, len(self.sources)))  # More would sit idle
+        self.on_detections = on_detections
+        self._ready = threading.Condition()
+        self._next = 0  # Source the round-robin search starts from
+        self._stop = threading.Event()
+        self._threads = []
+        self.started_at = None
+
+    def start(self):
+        """
+        Open every source and start the capture threads and the worker pool.
+        """
+        self.started_at = time.perf_counter()
+        for source in self.sources:
+            thread = threading.Thread(target=self._capture_loop, args=(source,), daemon=True,
+                                      name=f'capture-{source.name}')
+            thread.start()
+            self._threads.append(thread)
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, daemon=True, name=f'camera-worker-{index}')
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=5.0):
+        """
+        Stop every thread and release the cameras.
+
+        Parameters:
+        timeout (float): Seconds to wait for all threads together. A source stuck in a read that
+                         cannot be interrupted is left behind (the threads are daemons).
+
+        Returns:
+        list: Names of the threads still running after the timeout.
+        """
+        self._stop.set()
+        for source in self.sources:
+            if source.capture is not None:
+                source.capture.stop()  # Interrupt a stream waiting to reconnect
+        with self._ready:
+            self._ready.notify_all()
+        deadline = time.perf_counter() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.perf_counter(), 0.0))
+        stuck = [thread.name for thread in self._threads if thread.is_alive()]
+        if stuck:
+            print(f"[WARN] {len(stuck)} camera thread(s) did not stop within {timeout:.1f}s: {', '.join(stuck)}")
+        self._threads = []
+        return stuck
+
+    def wait(self, stop_event=None):
+        """
+        Block until every source has ended or stop_event is set.
+        """
+        while not self._stop.is_set() and (stop_event is None or not stop_event.is_set()):
+            if all(source.finished for source in self.sources):
+                break
+            time.sleep(0.2)
+
+    def _capture_loop(self, source):
+        """
+        Read one source as fast as it delivers, keeping only the newest frame.
+        """
+        source.capture = open_source(source.source)
+        if not source.capture.isOpened():
+            source.error = f"Unable to open video source {source.source!r}"
+            print(f"[ERROR] {source.error}")
+            source.finished = True
+            return
+        try:
+            while not self._stop.is_set():
+                ret, frame = source.capture.read()
+                if not ret:
+                    break  # The source ended or the camera was disconnected
+                with self._ready:
+                    if source.pending is not None:
+                        source.frames_dropped += 1
+                    source.pending = (frame, time.perf_counter())
+                    source.frames_captured += 1
+                    self._ready.notify()
+        finally:
+            source.capture.release()
+            source.finished = True
+
+    def _take_frame(self):
+        """
+        Wait for the next source with a frame and no frame in flight, in round-robin order.
+
+        Returns:
+        tuple or None: (source, frame, capture time), or None when stopping.
+        """
+        with self._ready:
+            while not self._stop.is_set():
+                count = len(self.sources)
+                for offset in range(count):
+                    source = self.sources[(self._next + offset) % count]
+                    if source.pending is not None and not source.busy:
+                        self._next = (self._next + offset + 1) % count
+                        frame, captured_at = source.pending
+                        source.pending = None
+                        source.busy = True
+                        return source, frame, captured_at
+                self._ready.wait(0.5)
+        return None
+
+    def _worker_loop(self):
+        while True:
+            item = self._take_frame()
+            if item is None:
+                return
+            source, frame, captured_at = item
+            start_time = time.perf_counter()
+            try:
+                detections = self.core.analyze_frame(frame, source.stream)
+            except Exception as e:
+                detections = []
+                source.error = str(e)
+            done = time.perf_counter()
+            with self._ready:
+                source.busy = False
+                source.frames_analyzed += 1
+                source.busy_time += done - start_time
+                source.latencies.append(done - captured_at)
+                source.last_detections = detections
+                self._ready.notify()  # The source may already have a newer frame waiting
+            if self.on_detections is not None:
+                self.on_detections(source.name, frame, detections)
+
+    def stats(self):
+        """
+        Report per-source throughput and latency.
+
+        Returns:
+        dict: Source name -> statistics, plus the worker count and aggregate FPS.
+        """
+        elapsed = max(time.perf_counter() - (self.started_at or time.perf_counter()), 1e-9)
+        with self._ready:
+            per_source = {source.name: source.stats(elapsed) for source in self.sources}
+        return {
+            'workers': self.workers,
+            'inference_fps': sum(s['inference_fps'] for s in per_source.values()),
+            'sources': per_source,
+        }
@@ -0,0 +1,274 @@
+# Import necessary libraries
+import os  # For removing a stale Unix socket
+import json  # Request and response bodies
+import base64  # Images embedded in JSON requests
+import signal  # Graceful shutdown on SIGINT / SIGTERM
+import argparse  # Command line interface of the daemon
+import threading  # API server and video source run on their own threads
+import socketserver  # Unix socket variant of the HTTP server
+import cv2  # OpenCV for decoding uploaded images
+import numpy as np  # NumPy for turning request bodies into image buffers
+from urllib.parse import urlparse, parse_qs  # Query string parameters
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Local HTTP API
+from config import load_config  # Central application configuration
+from face_core import FaceRecognitionCore  # UI-free recognition engine
+from gallery_watcher import GalleryWatcher  # Hot reload of dataset changes
+from multi_camera import MultiCameraScheduler, available_cameras  # Many cameras, one worker pool
+
+
+def decode_image(data):
+    """
+    Decode JPEG / PNG bytes into a BGR image.
+
+    Raises:
+    ValueError: If the bytes are not a readable image.
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Request body is not a readable image")
+    return image
+
+
+def is_true(value):
+    """
+    Read a boolean parameter: a JSON true or the strings '1', 'true', 'yes' and 'on' in any case.
+    """
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def finite(value):
+    """
+    Return a distance for JSON, or None when it is infinite (no face or unknown person).
+    """
+    return float(value) if np.isfinite(value) else None
+
+
+# Request handler of the local API. The engine is shared through the server object.
+class RecognitionRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'BioAuthService/1.0'
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self._send(200, {'status': 'ok', 'gallery_size': len(self.server.core.gallery),
+                             'people': len(set(self.server.core.full_gallery.identities))})
+        elif path == '/stats':
+            self._send(200, self.server.service.stats())
+        else:
+            self._send(404, {'error': f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        core = self.server.core
+        try:
+            images = self._read_images(params)
+            if url.path == '/identify':
+                detections = core.identify(images[0], mark=is_true(params.get('mark')))
+                self._send(200, {'faces': [dict(detection._asdict(), distance=finite(detection.distance))
+                                           for detection in detections]})
+            elif url.path == '/verify':
+                name = params.get('name')
+                if not name:
+                    raise ValueError("Missing 'name'")
+                verified, distance = core.verify(images[0], name)
+                self._send(200, {'name': name, 'verified': verified, 'distance': finite(distance)})
+            elif url.path == '/enroll':
+                added = core.enroll_images(params.get('name'), images)
+                self._send(200, {'name': params.get('name'), 'added': added})
+            else:
+                self._send(404, {'error': f"Unknown endpoint {url.path}"})
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            # Answer instead of dropping the connection; the service keeps running
+            print(f"[ERROR] {url.path} failed: {e!r}")
+            self._send(500, {'error': f"Internal error: {e}"})
+
+    def _read_images(self, params):
+        """
+        Read the request images: a raw image body, or JSON with a base64 'image' or 'images' list.
+        Fields of a JSON body are also accepted as parameters (e.g. 'name').
+        """
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise ValueError("Empty request body")
+        if length > self.server.max_body_size:
+            raise ValueError(f"Request body larger than {self.server.max_body_size} bytes")
+        body = self.rfile.read(length)
+
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise ValueError("Malformed JSON body")
+            if not isinstance(payload, dict):
+                raise ValueError("JSON body must be an object")
+            encoded = payload.get('images') or ([payload['image']] if 'image' in payload else [])
+            if not encoded:
+                raise ValueError("JSON body needs 'image' or 'images'")
+            if not isinstance(encoded, list) or not all(isinstance(data, str) for data in encoded):
+                raise ValueError("'image' must be a base64 string and 'images' a list of them")
+            for key, value in payload.items():
+                if key not in ('image', 'images'):
+                    params.setdefault(key, str(value))
+            return [decode_image(base64.b64decode(data)) for data in encoded]
+        return [decode_image(body)]
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, default=float).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+ThreadingUnixHTTPServer = None  # Unix sockets are not available on every platform (e.g. Windows)
+if hasattr(socketserver, 'UnixStreamServer'):
+    class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+# Define the long-running headless recognition service
+class RecognitionService:
+    def __init__(self, core, sources=(), host='127.0.0.1', port=8765, unix_socket=None,
+                 max_body_size=10 << 20, verbose=False, camera_workers=None):
+        """
+        Initialize the RecognitionService class.
+
+        Parameters:
+        core (FaceRecognitionCore): Warm engine shared by the video sources and every request.
+        sources (list): Camera indexes, video files or stream URLs to take attendance from.
+                        Empty only serves the API.
+        host (str): Interface of the HTTP API. Keep it on localhost: the API is unauthenticated.
+        port (int): Port of the HTTP API; 0 disables the TCP listener.
+        unix_socket (str): Also (or only) serve the API on this Unix socket path. Not available on Windows.
+        max_body_size (int): Largest accepted request body in bytes.
+        verbose (bool): Log every request.
+        camera_workers (int): Inference workers shared by the sources. Defaults to one per source.
+        """
+        if unix_socket and ThreadingUnixHTTPServer is None:
+            raise ValueError("Unix sockets are not supported on this platform; serve the API on a TCP port instead")
+        self.core = core
+        self.scheduler = MultiCameraScheduler(core, sources, workers=camera_workers) if sources else None
+        self.servers = []
+        if port:
+            self.servers.append(ThreadingHTTPServer((host, port), RecognitionRequestHandler))
+        if unix_socket:
+            if os.path.exists(unix_socket):
+                os.remove(unix_socket)  # Left behind by a previous run
+            self.servers.append(ThreadingUnixHTTPServer(unix_socket, RecognitionRequestHandler))
+        for server in self.servers:
+            server.core = core
+            server.service = self
+            server.max_body_size = max_body_size
+            server.verbose = verbose
+        self.unix_socket = unix_socket
+        self._threads = []
+
+    def start(self):
+        """
+        Start the API listeners and the video sources on background threads.
+        """
+        for server in self.servers:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.scheduler is not None:
+            print(f"[INFO] Taking attendance from {len(self.scheduler.sources)} source(s) "
+                  f"with {self.scheduler.workers} worker(s)")
+            self.scheduler.start()
+
+    def stop(self):
+        """
+        Stop the listeners and the video sources, then flush the attendance records.
+        """
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join()
+        if self.unix_socket and os.path.exists(self.unix_socket):
+            os.remove(self.unix_socket)
+        self.core.close()
+
+    def stats(self):
+        """
+        Report the gallery, per-source and attendance writer state.
+        """
+        return {
+            'gallery_size': len(self.core.gallery),
+            'cameras': self.scheduler.stats() if self.scheduler is not None else None,
+            'attendance_sink': self.core.attendance_sink.stats(),
+        }
+
+
+def main(argv=None):
+    """
+    Command line entry point: run recognition as a headless daemon.
+    """
+    parser = argparse.ArgumentParser(description="Headless face recognition service with a local HTTP API")
+    parser.add_argument('--config', help="Configuration file (defaults to $BIOAUTH_CONFIG or config.json)")
+    parser.add_argument('--source', action='append',
+                        help="Camera index, video file or stream URL to take attendance from; "
+                             "repeat for several, or 'auto' for every attached camera (default from service.sources)")
+    parser.add_argument('--host', help="API interface (default from service.host)")
+    parser.add_argument('--port', type=int, help="API port, 0 disables TCP (default from service.port)")
+    parser.add_argument('--unix-socket', help="Also serve the API on this Unix socket")
+    parser.add_argument('--verbose', action='store_true', help="Log every API request")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    service_config = config.service
+    sources = []
+    for source in (args.source or service_config.sources):
+        source = str(source)
+        if source == 'auto':
+            sources.extend(available_cameras())
+        else:
+            sources.append(int(source) if source.isdigit() else source)  # Camera index or URL / path
+
+    print("[INFO] Loading the gallery...")
+    core = FaceRecognitionCore.from_config(config)
+    watcher = GalleryWatcher(core, interval=config.recognition.reload_interval)
+    service = RecognitionService(
+        core,
+        sources=sources,
+        host=args.host or service_config.host,
+        port=service_config.port if args.port is None else args.port,
+        unix_socket=args.unix_socket or service_config.unix_socket,
+        max_body_size=service_config.max_body_mb << 20,
+        verbose=args.verbose,
+        camera_workers=config.workers.camera_workers or None,
+    )
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    if config.recognition.reload_interval > 0:
+        watcher.start()
+    service.start()
+    print(f"[INFO] Serving {len(core.gallery)} gallery encodings; press Ctrl+C to stop")
+    try:
+        while not stop.wait(0.5):
+            pass
+    finally:
+        print("[INFO] Shutting down...")
+        watcher.stop()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
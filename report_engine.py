@@ -0,0 +1,163 @@
+# Import necessary libraries
+import sys  # For writing reports to standard output
+import csv  # For CSV exports
+import argparse  # Command line interface
+from attendance_store import AttendanceStore  # SQLite attendance database
+
+# Arrivals after this time count as late unless another cut-off is given
+DEFAULT_LATE_AFTER = '09:00:00'
+
+PERSON_COLUMNS = ['name', 'days_present', 'first_seen', 'last_seen', 'late_count']
+DAY_COLUMNS = ['date', 'present', 'late_count', 'first_arrival', 'last_arrival']
+RECORD_COLUMNS = ['name', 'time', 'date']
+
+
+def person_summary(store, late_after=DEFAULT_LATE_AFTER, **filters):
+    """
+    Aggregate attendance per person in SQL.
+
+    Parameters:
+    store (AttendanceStore): The attendance database.
+    late_after (str): Arrival time (HH:MM:SS) after which a day counts as late.
+    filters: Optional name, date_from and date_to filters.
+
+    Returns:
+    list: (name, days present, first seen, last seen, late count) rows ordered by name.
+    """
+    where, params = store.where_clause(**filters)
+    sql = ('SELECT name, COUNT(*), MIN(date || \' \' || time), MAX(date || \' \' || time), '
+           'SUM(time > ?) FROM attendance' + where + ' GROUP BY name ORDER BY name')
+    return store.query(sql, [late_after] + params)
+
+
+def day_summary(store, late_after=DEFAULT_LATE_AFTER, **filters):
+    """
+    Aggregate attendance per day in SQL.
+
+    Parameters:
+    store (AttendanceStore): The attendance database.
+    late_after (str): Arrival time (HH:MM:SS) after which an arrival counts as late.
+    filters: Optional name, date_from and date_to filters.
+
+    Returns:
+    list: (date, people present, late count, first arrival, last arrival) rows ordered by date.
+    """
+    where, params = store.where_clause(**filters)
+    sql = ('SELECT date, COUNT(*), SUM(time > ?), MIN(time), MAX(time) FROM attendance'
+           + where + ' GROUP BY date ORDER BY date')
+    return store.query(sql, [late_after] + params)
+
+
+def _write_rows(path, columns, chunks):
+    """
+    Write chunks of rows to a CSV or Excel file without holding them all in memory.
+
+    Parameters:
+    path (str): Destination file; '.xlsx' writes an Excel workbook, '-' writes CSV to stdout.
+    columns (list): Header row.
+    chunks (iterable): Lists of rows.
+
+    Returns:
+    int: Number of data rows written.
+    """
+    written = 0
+    if path.lower().endswith('.xlsx'):
+        try:
+            from openpyxl import Workbook  # Optional dependency, only needed for Excel output
+        except ImportError:
+            raise RuntimeError("Excel export requires the openpyxl package (pip install openpyxl).")
+        workbook = Workbook(write_only=True)  # Write-only mode streams rows to disk
+        sheet = workbook.create_sheet('Attendance')
+        sheet.append(columns)
+        for rows in chunks:
+            for row in rows:
+                sheet.append(list(row))
+            written += len(rows)
+        workbook.save(path)
+        return written
+
+    # utf-8-sig lets Excel open the CSV with non-ASCII names intact
+    f = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8-sig')
+    try:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in chunks:
+            writer.writerows(rows)
+            written += len(rows)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return written
+
+
+def export_records(store, path, chunk_size=5000, **filters):
+    """
+    Stream raw attendance records to a CSV or Excel file in chunks.
+
+    Parameters:
+    store (AttendanceStore): The attendance database.
+    path (str): Destination file ('.csv', '.xlsx' or '-' for stdout).
+    chunk_size (int): Rows read from the database per chunk.
+    filters: Optional name, date_from and date_to filters.
+
+    Returns:
+    int: Number of records exported.
+    """
+    where, params = store.where_clause(**filters)
+    sql = 'SELECT name, time, date FROM attendance' + where + ' ORDER BY date, time, id'
+    return _write_rows(path, RECORD_COLUMNS, store.iter_query(sql, params, chunk_size))
+
+
+def export_summary(store, path, by='person', late_after=DEFAULT_LATE_AFTER, **filters):
+    """
+    Write the per-person or per-day aggregate report to a CSV or Excel file.
+
+    Parameters:
+    store (AttendanceStore): The attendance database.
+    path (str): Destination file ('.csv', '.xlsx' or '-' for stdout).
+    by (str): 'person' or 'day'.
+    late_after (str): Arrival time (HH:MM:SS) after which an arrival counts as late.
+    filters: Optional name, date_from and date_to filters.
+
+    Returns:
+    int: Number of summary rows written.
+    """
+    if by == 'person':
+        return _write_rows(path, PERSON_COLUMNS, [person_summary(store, late_after, **filters)])
+    if by == 'day':
+        return _write_rows(path, DAY_COLUMNS, [day_summary(store, late_after, **filters)])
+    raise ValueError(f"Unknown summary grouping: {by}")
+
+
+def main(argv=None):
+    """
+    Command line entry point for attendance exports and reports.
+    """
+    parser = argparse.ArgumentParser(description="Attendance exports and aggregate reports")
+    parser.add_argument('report', choices=['export', 'people', 'days'],
+                        help="export: raw records, people: per-person summary, days: per-day summary")
+    parser.add_argument('-o', '--output', default='-', help="Output file (.csv or .xlsx), '-' for stdout")
+    parser.add_argument('--db', default='attendance.db', help="SQLite database file")
+    parser.add_argument('--name', help="Only people whose name contains this text")
+    parser.add_argument('--from', dest='date_from', help="First date included (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', help="Last date included (YYYY-MM-DD)")
+    parser.add_argument('--late-after', default=DEFAULT_LATE_AFTER, help="Late arrival cut-off (HH:MM:SS)")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Rows streamed per chunk")
+    args = parser.parse_args(argv)
+
+    filters = {'name': args.name, 'date_from': args.date_from, 'date_to': args.date_to}
+    store = AttendanceStore(args.db)
+    try:
+        if args.report == 'export':
+            count = export_records(store, args.output, chunk_size=args.chunk_size, **filters)
+        else:
+            by = 'person' if args.report == 'people' else 'day'
+            count = export_summary(store, args.output, by=by, late_after=args.late_after, **filters)
+    finally:
+        store.close()
+    if args.output != '-':
+        print(f"[INFO] Wrote {count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# Import necessary libraries
+import queue  # Hands pages from the loader thread back to the Tk main loop
+import threading  # Background page loading
+import tkinter as tk  # Tkinter library for GUI elements
+from tkinter import ttk, Toplevel, filedialog  # Treeview, window and save dialog widgets
+from report_engine import export_records  # Streaming CSV / Excel export
+
+
+# Define a paged attendance report window backed by the attendance store
+class AttendanceReportViewer:
+    def __init__(self, master, store, page_size=100):
+        """
+        Initialize the AttendanceReportViewer class and open its window.
+
+        Parameters:
+        master (tk.Tk): Parent window.
+        store (AttendanceStore): Store the report pages are read from.
+        page_size (int): Number of rows shown (and fetched) per page.
+        """
+        self.store = store
+        self.page_size = page_size
+        self.page_index = 0
+        self.total = 0
+        self.sort = 'date'
+        self.descending = True
+        self._results = queue.Queue()  # Pages loaded by the background thread
+        self._request_id = 0  # Responses for older requests are ignored
+
+        self.window = Toplevel(master)
+        self.window.title("Attendance Report")
+        self.window.geometry("600x500")
+        self.window.configure(bg="#ffffff")
+
+        # Filter bar: name substring and date range
+        filter_frame = tk.Frame(self.window, bg="#ffffff")
+        filter_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        self.name_var = tk.StringVar()
+        self.from_var = tk.StringVar()
+        self.to_var = tk.StringVar()
+        for label, var in (("Name", self.name_var), ("From (YYYY-MM-DD)", self.from_var), ("To", self.to_var)):
+            tk.Label(filter_frame, text=label, bg="#ffffff").pack(side=tk.LEFT)
+            ttk.Entry(filter_frame, textvariable=var, width=12).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Button(filter_frame, text="Filter", command=self.apply_filters).pack(side=tk.LEFT)
+        ttk.Button(filter_frame, text="Export", command=self.export).pack(side=tk.LEFT, padx=(5, 0))
+
+        # Create TreeView for displaying the records; headings sort on the database side
+        self.tree = ttk.Treeview(self.window, columns=("Name", "Time", "Date"), show='headings')
+        for column, width in (("Name", 180), ("Time", 120), ("Date", 200)):
+            self.tree.heading(column, text=column, command=lambda c=column.lower(): self.sort_by(c))
+            self.tree.column(column, width=width)
+        self.tree.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        # Paging controls
+        nav_frame = tk.Frame(self.window, bg="#ffffff")
+        nav_frame.pack(pady=(0, 10))
+        ttk.Button(nav_frame, text="< Prev", command=lambda: self.go_to(self.page_index - 1)).pack(side=tk.LEFT, padx=5)
+        self.status = tk.Label(nav_frame, text="Loading...", bg="#ffffff")
+        self.status.pack(side=tk.LEFT, padx=10)
+        ttk.Button(nav_frame, text="Next >", command=lambda: self.go_to(self.page_index + 1)).pack(side=tk.LEFT, padx=5)
+
+        self.load_page()
+        self._poll()
+
+    @property
+    def page_count(self):
+        return max(1, -(-self.total // self.page_size))
+
+    def _filter_values(self):
+        """
+        Return the current filter entries, with blanks turned into None.
+        """
+        return {
+            'name': self.name_var.get().strip() or None,
+            'date_from': self.from_var.get().strip() or None,
+            'date_to': self.to_var.get().strip() or None,
+        }
+
+    def apply_filters(self):
+        """
+        Restart the report from the first page with the current filters.
+        """
+        self.page_index = 0
+        self.load_page()
+
+    def sort_by(self, column):
+        """
+        Sort by a column, toggling the direction when it is already the sort column.
+        """
+        self.descending = not self.descending if column == self.sort else False
+        self.sort = column
+        self.page_index = 0
+        self.load_page()
+
+    def go_to(self, page_index):
+        """
+        Show another page if it exists.
+        """
+        if 0 <= page_index < self.page_count:
+            self.page_index = page_index
+            self.load_page()
+
+    def export(self):
+        """
+        Export every record matching the current filters, streaming on a background thread.
+        """
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("Excel", "*.xlsx")])
+        if not path:
+            return
+        filters = self._filter_values()
+        self.status.config(text="Exporting...")
+
+        def run():
+            try:
+                count = export_records(self.store, path, **filters)
+                self._results.put(('export', f"Exported {count} records to {path}"))
+            except Exception as e:
+                self._results.put(('export', f"Export failed: {e}"))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def load_page(self):
+        """
+        Fetch the current page on a background thread so the Tk main loop never blocks.
+        """
+        self._request_id += 1
+        request = (self._request_id, self.page_index * self.page_size, self.sort, self.descending,
+                   self._filter_values())
+        self.status.config(text="Loading...")
+        threading.Thread(target=self._load, args=request, daemon=True).start()
+
+    def _load(self, request_id, offset, sort, descending, filters):
+        """
+        Query one page and its total count (runs on the loader thread).
+        """
+        try:
+            total = self.store.count(**filters)
+            rows = self.store.page(offset, self.page_size, sort=sort, descending=descending, **filters)
+            self._results.put((request_id, total, rows, None))
+        except Exception as e:
+            self._results.put((request_id, 0, [], e))
+
+    def _poll(self):
+        """
+        Apply loaded pages on the Tk thread.
+        """
+        if not self.window.winfo_exists():
+            return
+        try:
+            while True:
+                result = self._results.get_nowait()
+                if result[0] == 'export':
+                    self.status.config(text=result[1])
+                    continue
+                request_id, total, rows, error = result
+                if request_id != self._request_id:
+                    continue  # A newer request superseded this page
+                self.tree.delete(*self.tree.get_children())
+                if error is not None:
+                    self.status.config(text=f"Error: {error}")
+                    continue
+                self.total = total
+                for row in rows:
+                    self.tree.insert("", tk.END, values=row)
+                if total == 0:
+                    self.status.config(text="No attendance records found.")
+                else:
+                    self.status.config(text=f"Page {self.page_index + 1} of {self.page_count} ({total} records)")
+        except queue.Empty:
+            pass
+        self.window.after(50, self._poll)
@@ -0,0 +1,69 @@
+# Import necessary libraries
+import time  # High resolution stage timing
+import threading  # Stages may be timed from several inference workers
+from collections import deque  # Bounded per-stage sample buffers
+from contextlib import contextmanager  # For the stage() context manager
+import numpy as np  # NumPy for percentiles
+
+
+# Define a collector of per-stage processing times
+class StageProfiler:
+    def __init__(self, max_samples=None):
+        """
+        Initialize the StageProfiler class. Stages are created on first use by stage().
+
+        Parameters:
+        max_samples (int): Most recent durations kept per stage, so a long-running process
+                           profiles in bounded memory. None keeps every sample.
+        """
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._times = {}  # Stage name -> durations in seconds
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time the body of a with-block as one call of a stage.
+
+        Parameters:
+        name (str): Stage name, e.g. 'detect' or 'encode'.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                samples = self._times.get(name)
+                if samples is None:
+                    samples = self._times[name] = deque(maxlen=self.max_samples)
+                samples.append(elapsed)
+
+    def reset(self):
+        """
+        Forget every recorded timing, e.g. after a warm-up. max_samples is kept.
+        """
+        with self._lock:
+            self._times = {}
+
+    def summary(self):
+        """
+        Summarize every stage.
+
+        Returns:
+        dict: Stage name -> calls, total seconds (of the kept samples), mean / p50 / p95 milliseconds and share of the total.
+        """
+        with self._lock:
+            times = {name: np.array(values) for name, values in self._times.items()}
+        grand_total = sum(values.sum() for values in times.values()) or 1.0
+        return {
+            name: {
+                'calls': len(values),
+                'total_seconds': float(values.sum()),
+                'mean_ms': float(values.mean() * 1000),
+                'p50_ms': float(np.percentile(values, 50) * 1000),
+                'p95_ms': float(np.percentile(values, 95) * 1000),
+                'share': float(values.sum() / grand_total),
+            }
+            for name, values in times.items()
+        }
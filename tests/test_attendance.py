@@ -0,0 +1,121 @@
+# Import necessary libraries
+import time  # For waiting on the writer thread
+import pytest  # Test framework
+from attendance_store import AttendanceStore  # SQLite persistence under test
+from attendance_sink import AttendanceSink  # Background batched writer under test
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AttendanceStore(str(tmp_path / 'attendance.db'))
+    yield store
+    store.close()
+
+
+def test_duplicates_on_the_same_date_are_ignored(store):
+    inserted = store.write_batch([('Alice', '08:00:00', '2025-04-01'),
+                                  ('Alice', '09:30:00', '2025-04-01'),
+                                  ('Alice', '08:05:00', '2025-04-02'),
+                                  ('Bob', '08:10:00', '2025-04-01')])
+    assert inserted == 3
+    assert store.write_batch([('Bob', '12:00:00', '2025-04-01')]) == 0
+    # The first sighting of the day is the one kept
+    assert store.page(0, 10, sort='name', descending=False, date_from='2025-04-01', date_to='2025-04-01') == [
+        ('Alice', '08:00:00', '2025-04-01'), ('Bob', '08:10:00', '2025-04-01')]
+    assert sorted(store.names_on('2025-04-01')) == ['Alice', 'Bob']
+
+
+def test_page_and_count_filters(store):
+    store.write_batch([(f'person_{i}', f'08:{i:02d}:00', f'2025-04-{day:02d}')
+                       for day in range(1, 4) for i in range(5)])
+    store.write_batch([('Alicia', '10:00:00', '2025-04-02')])
+
+    assert store.count() == 16
+    assert store.count(date_from='2025-04-02') == 11
+    assert store.count(date_from='2025-04-02', date_to='2025-04-02') == 6
+    assert store.count(name='Alic') == 1
+    assert store.count(name='person_1', date_to='2025-04-01') == 1
+
+    newest = store.page(0, 3)
+    assert newest[0] == ('person_4', '08:04:00', '2025-04-03')
+    assert [row[1] for row in newest] == ['08:04:00', '08:03:00', '08:02:00']
+    # Consecutive pages cover every row exactly once
+    pages = store.page(0, 7, sort='time', descending=False) + store.page(7, 20, sort='time', descending=False)
+    assert len(pages) == 16 and len(set(pages)) == 16
+    with pytest.raises(ValueError):
+        store.page(0, 10, sort='name; DROP TABLE attendance')
+
+
+def test_import_legacy(tmp_path, store):
+    (tmp_path / 'attendance.csv').write_text('Alice,08:00:00,2025-04-01\n\nBob,08:10:00\n')
+    (tmp_path / 'attendance').mkdir()
+    (tmp_path / 'attendance' / 'attend_2025-04-02.csv').write_text('Bob,09:00:00\nAlice,09:05:00\n')
+
+    report = store.import_legacy(str(tmp_path))
+    assert report[str(tmp_path / 'attendance.csv')] == (1, 2)  # Blank row and undated row skipped
+    assert report[str(tmp_path / 'attendance' / 'attend_2025-04-02.csv')] == (2, 0)
+    assert sorted(store.names_on('2025-04-02')) == ['Alice', 'Bob']
+
+    # Importing again inserts nothing new; the rows already stored count as skipped
+    assert store.import_legacy(str(tmp_path))[str(tmp_path / 'attendance.csv')] == (0, 3)
+
+
+# Backend that fails a number of writes before accepting them
+class FlakyBackend:
+    def __init__(self, failures):
+        self.failures = failures
+        self.records = []
+        self.closed = False
+
+    def write_batch(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise OSError('database is locked')
+        self.records.extend(records)
+
+    def sync(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_sink_writes_into_the_store(tmp_path):
+    store = AttendanceStore(str(tmp_path / 'attendance.db'))
+    sink = AttendanceSink(store, flush_interval=0.01)
+    sink.submit('Alice', '08:00:00', '2025-04-01')
+    sink.submit('Alice', '08:01:00', '2025-04-01')
+    sink.close()
+    assert sink.stats()['records_written'] == 2
+    reopened = AttendanceStore(store.path)  # close() closed the sink's backend
+    assert reopened.count() == 1  # The second record is a duplicate of the same day
+    reopened.close()
+
+
+def test_sink_retries_a_failing_write():
+    backend = FlakyBackend(failures=2)
+    sink = AttendanceSink(backend, flush_interval=0.01, retry_interval=0.02)
+    sink.submit('Alice', '08:00:00', '2025-04-01')
+    deadline = time.monotonic() + 2
+    while not backend.records and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sink.submit('Bob', '08:01:00', '2025-04-01')
+    sink.close()
+
+    assert [record[0] for record in backend.records] == ['Alice', 'Bob']
+    stats = sink.stats()
+    assert stats['write_errors'] == 2 and stats['records_failed'] == 0
+    assert backend.closed
+
+
+def test_sink_keeps_failed_records_and_rejects_submit_after_close():
+    backend = FlakyBackend(failures=100)
+    sink = AttendanceSink(backend, retry_interval=0.01, close_retries=2)
+    sink.submit('Alice', '08:00:00', '2025-04-01')
+    sink.close()
+    assert sink.stats()['records_failed'] == 1
+    assert sink.stats()['last_error'] is not None
+
+    with pytest.raises(RuntimeError):
+        sink.submit('Bob', '08:01:00', '2025-04-01')
+    sink.close()  # Closing twice is harmless
@@ -0,0 +1,28 @@
+# Import necessary libraries
+from attendance_store import AttendanceStore  # Store the cache is warmed from
+from attendance_dedup import DailyAttendanceCache  # Per-day de-duplication under test
+
+
+def test_cache_is_warmed_from_the_store_at_startup(tmp_path):
+    store = AttendanceStore(str(tmp_path / 'attendance.db'))
+    today = DailyAttendanceCache.today()
+    store.write_batch([('Alice', '08:00:00', today), ('Bob', '08:00:00', '2000-01-01')])
+
+    cache = DailyAttendanceCache(store)
+    assert cache.date == today
+    assert cache.present_today() == {'Alice'}  # Known before anyone is marked in this session
+    assert not cache.add('Alice', today)
+    assert cache.add('Bob', today)
+    store.close()
+
+
+def test_cache_rolls_over_to_a_new_date(tmp_path):
+    store = AttendanceStore(str(tmp_path / 'attendance.db'))
+    store.write_batch([('Alice', '08:00:00', '2000-01-02')])
+    cache = DailyAttendanceCache(store)
+
+    assert cache.add('Carol', '2000-01-01')
+    assert not cache.add('Alice', '2000-01-02')  # Loaded from the store for the new date
+    assert cache.add('Carol', '2000-01-02')
+    assert cache.present_today() == set(store.names_on(DailyAttendanceCache.today()))
+    store.close()
@@ -0,0 +1,43 @@
+# Import necessary libraries
+import json  # Inspect the manifest
+import os  # Lay out a small dataset
+import cv2  # Write source images
+import numpy as np  # Synthetic image data
+import pytest  # Skip when the imaging dependencies are missing
+
+pytest.importorskip('PIL')  # The generator imports Pillow for its colour transforms
+from dataset_augmentation_generator import DatasetAugmenter, MANIFEST_FILE  # Generator under test
+
+
+def make_dataset(root, names):
+    person = root / 'alice'
+    person.mkdir()
+    for name in names:
+        cv2.imwrite(str(person / name), np.random.RandomState(0).randint(0, 255, (32, 32, 3), dtype=np.uint8))
+    return person
+
+
+def test_images_named_like_variants_are_augmented(tmp_path):
+    person = make_dataset(tmp_path, ['selfie_rot.jpg'])
+    stats = DatasetAugmenter(['flip'], workers=1).run(str(tmp_path), verbose=False)
+
+    assert stats['variants'] == 1
+    assert (person / 'selfie_rot_flip.jpg').exists()
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert list(manifest['variants']) == ['alice/selfie_rot_flip.jpg']
+
+
+def test_legacy_variants_are_kept_unless_requested(tmp_path):
+    person = make_dataset(tmp_path, ['a.jpg', 'a_flip1.jpg', 'b_flip1.jpg'])
+    augmenter = DatasetAugmenter(['flip'], workers=1)
+
+    stats = augmenter.run(str(tmp_path), verbose=False)
+    assert stats['removed'] == 0
+    assert (person / 'a_flip1.jpg').exists()  # Left alone without --remove-legacy
+    assert not (person / 'a_flip1_flip.jpg').exists()  # ...but never augmented itself
+    assert (person / 'b_flip1_flip.jpg').exists()  # No 'b.jpg' next to it, so it is a real image
+
+    stats = augmenter.run(str(tmp_path), verbose=False, remove_legacy=True)
+    assert stats['removed'] == 1
+    assert not (person / 'a_flip1.jpg').exists()
+    assert (person / 'b_flip1.jpg').exists()
@@ -0,0 +1,74 @@
+# Import necessary libraries
+import json  # For writing configuration files
+import pytest  # Test framework
+from config import load_config  # Configuration loader under test
+
+
+def write_config(tmp_path, data):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_defaults_without_a_file(tmp_path):
+    config = load_config(str(tmp_path / 'missing.json'), environ={})
+    assert config.recognition.tolerance == 0.5
+    assert config.workers.encode_workers == 0
+    assert config.service.sources == []
+
+
+def test_environment_overrides_the_file(tmp_path):
+    path = write_config(tmp_path, {'recognition': {'tolerance': 0.4}, 'paths': {'dataset_dir': 'from_file'}})
+    config = load_config(path, environ={
+        'BIOAUTH_RECOGNITION_TOLERANCE': '0.45',
+        'BIOAUTH_DETECTION_MOTION_GATE': 'off',
+        'BIOAUTH_RECOGNITION_COMPACTION': '{"max_prototypes": 3}',
+        'BIOAUTH_SERVICE_SOURCES': '0, rtsp://camera/stream',
+        'BIOAUTH_SERVICE_UNIX_SOCKET': 'none',
+    })
+    assert config.recognition.tolerance == 0.45
+    assert config.paths.dataset_dir == 'from_file'
+    assert config.detection.motion_gate is False
+    assert config.recognition.compaction == {'max_prototypes': 3}
+    assert config.service.sources == ['0', 'rtsp://camera/stream']
+    assert config.service.unix_socket is None
+
+
+def test_config_file_named_by_the_environment(tmp_path):
+    path = write_config(tmp_path, {'ui': {'camera_index': 2}})
+    assert load_config(environ={'BIOAUTH_CONFIG': path}).ui.camera_index == 2
+
+
+def test_file_values_are_coerced_to_the_field_types(tmp_path):
+    path = write_config(tmp_path, {'workers': {'encode_workers': '4'}, 'detection': {'initial_scale': 1},
+                                   'service': {'sources': [0, 1], 'unix_socket': None}})
+    config = load_config(path, environ={})
+    assert config.workers.encode_workers == 4
+    assert isinstance(config.detection.initial_scale, float)
+    assert config.service.sources == [0, 1]
+
+
+@pytest.mark.parametrize('section, values', [
+    ('workers', {'encode_workers': 'four'}),
+    ('workers', {'encode_workers': True}),
+    ('recognition', {'tolerance': [0.5]}),
+    ('recognition', {'encoding_model': 'lage'}),
+    ('recognition', {'index_backend': 'hnsw'}),
+    ('recognition', {'unknown_setting': 1}),
+])
+def test_invalid_file_values_fail_at_load_time(tmp_path, section, values):
+    with pytest.raises(ValueError):
+        load_config(write_config(tmp_path, {section: values}), environ={})
+
+
+def test_invalid_environment_values_fail_at_load_time(tmp_path):
+    path = str(tmp_path / 'missing.json')
+    with pytest.raises(ValueError, match='BIOAUTH_WORKERS_ENCODE_WORKERS'):
+        load_config(path, environ={'BIOAUTH_WORKERS_ENCODE_WORKERS': 'x'})
+    with pytest.raises(ValueError, match='detection_model'):
+        load_config(path, environ={'BIOAUTH_RECOGNITION_DETECTION_MODEL': 'yolo'})
+
+
+def test_unknown_section_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unknown configuration section'):
+        load_config(write_config(tmp_path, {'camera': {}}), environ={})
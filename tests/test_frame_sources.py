@@ -0,0 +1,28 @@
+# Import necessary libraries
+import time  # Measure how quickly a stopped read returns
+import threading  # Read on a background thread like the scheduler does
+from frame_sources import StreamSource  # Source under test
+
+
+def test_stop_interrupts_a_reconnecting_stream(tmp_path):
+    source = StreamSource(str(tmp_path / 'missing.mp4'), reconnect_delay=30)  # Never opens
+    result = []
+    reader = threading.Thread(target=lambda: result.append(source.read()))
+    reader.start()
+    time.sleep(0.2)  # Let read() fail once and start waiting to reconnect
+
+    start = time.perf_counter()
+    source.stop()
+    reader.join(timeout=5)
+    assert not reader.is_alive()
+    assert time.perf_counter() - start < 5
+    assert result == [(False, None)]
+    source.release()
+
+
+def test_max_reconnects_ends_the_stream(tmp_path):
+    source = StreamSource(str(tmp_path / 'missing.mp4'), reconnect_delay=0, max_reconnects=2)
+    assert source.read() == (False, None)
+    assert source.reconnects == 2
+    source.release()
+    assert source.read() == (False, None)
@@ -0,0 +1,106 @@
+# Import necessary libraries
+import numpy as np  # NumPy for synthetic encodings and the brute-force reference
+from gallery import FaceGallery  # Batched matcher under test
+from gallery_index import IVFIndex, make_index, gallery_digest  # Index backends under test
+
+
+def synthetic(size, people, dim=128, seed=0):
+    """
+    Random encodings clustered around one centre per person, at dlib-like distances.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(0.0, 0.9 / np.sqrt(2 * dim), (people, dim)).astype(np.float32)
+    person = np.arange(size) % people
+    encodings = centres[person] + rng.normal(0.0, 0.3 / np.sqrt(2 * dim), (size, dim)).astype(np.float32)
+    return encodings, [f'person_{i}' for i in person], centres
+
+
+def brute_force(encodings, names, query, tolerance):
+    """
+    Reference matcher: full distance scan, best identity and margin to the runner-up identity.
+    """
+    distances = np.linalg.norm(encodings.astype(np.float64) - query, axis=1)
+    best = int(np.argmin(distances))
+    others = [d for d, name in zip(distances, names) if name != names[best]]
+    margin = (min(others) if others else np.inf) - distances[best]
+    return (names[best] if distances[best] <= tolerance else None), distances[best], margin
+
+
+def test_exact_match_agrees_with_brute_force():
+    encodings, names, centres = synthetic(500, 50)
+    gallery = FaceGallery.from_encodings(encodings, names)
+    queries = np.vstack([centres[:10], np.random.default_rng(1).normal(0, 0.06, (10, 128))]).astype(np.float32)
+
+    for query, result in zip(queries, gallery.match(queries, tolerance=0.5)):
+        name, distance, margin = brute_force(encodings, names, query, 0.5)
+        assert result.name == name
+        assert result.matched == (name is not None)
+        assert np.isclose(result.distance, distance, atol=1e-4)
+        assert np.isclose(result.margin, margin, atol=1e-4)
+
+
+def test_unknown_faces_are_not_matched():
+    encodings, names, centres = synthetic(100, 10)
+    gallery = FaceGallery.from_encodings(encodings, names)
+    stranger = -centres[0] * 10  # Far from every person
+
+    result = gallery.match([stranger], tolerance=0.5)[0]
+    assert result.name is None and not result.matched
+    assert result.distance > 0.5
+
+    # The same face counts as a match once the tolerance covers its distance
+    assert gallery.match([stranger], tolerance=result.distance + 1e-3)[0].matched
+
+
+def test_empty_gallery_matches_nothing():
+    result = FaceGallery().match([np.zeros(128)])[0]
+    assert result.name is None and result.distance == float('inf')
+
+
+def test_ivf_agrees_with_exact_on_known_people():
+    encodings, names, centres = synthetic(4000, 400)
+    exact = FaceGallery.from_encodings(encodings, names)
+    index = make_index('ivf', n_probe=16, min_size=1000)
+    index.build(encodings)
+    assert index.centroids is not None
+    approximate = FaceGallery.from_encodings(encodings, names, index=index)
+
+    queries = centres[:50]
+    exact_names = [r.name for r in exact.match(queries)]
+    ivf_names = [r.name for r in approximate.match(queries)]
+    assert np.mean([a == b for a, b in zip(exact_names, ivf_names)]) >= 0.95
+
+
+def test_ivf_save_load_and_incremental_add(tmp_path):
+    encodings, names, centres = synthetic(3000, 300)
+    gallery = FaceGallery.from_encodings(encodings, names, index=IVFIndex(min_size=1000))
+    gallery.index.build(gallery.encodings)
+    path = str(tmp_path / 'index.npz')
+    gallery.index.save(path, gallery.encodings)
+
+    # New rows appended after the save are inserted into the restored index
+    extra, _, _ = synthetic(20, 1, seed=5)
+    gallery.add_many(extra, ['newcomer'] * len(extra))
+    restored = IVFIndex(min_size=1000)
+    assert restored.load(path, gallery.encodings)
+    assert len(restored._assignments) == len(gallery)
+    np.testing.assert_array_equal(restored.centroids, gallery.index.centroids)
+
+    reloaded = FaceGallery.from_encodings(gallery.encodings, gallery.names, index=restored)
+    assert reloaded.match(extra[:1])[0].name == 'newcomer'
+    assert gallery.match(extra[:1])[0].name == 'newcomer'  # The live index saw the add too
+    assert restored.nbytes > 0
+
+
+def test_ivf_load_rejects_a_different_gallery(tmp_path):
+    encodings, names, _ = synthetic(2000, 200)
+    index = IVFIndex(min_size=1000)
+    index.build(encodings)
+    path = str(tmp_path / 'index.npz')
+    index.save(path, encodings)
+
+    changed = encodings.copy()
+    changed[0] += 0.01
+    assert gallery_digest(changed) != gallery_digest(encodings)
+    assert not IVFIndex(min_size=1000).load(path, changed)
+    assert not IVFIndex(min_size=1000).load(str(tmp_path / 'missing.npz'), encodings)
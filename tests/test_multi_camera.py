@@ -0,0 +1,62 @@
+# Import necessary libraries
+import threading  # Blocking reads of the fake source
+import multi_camera  # Module under test; open_source is replaced
+from frame_sources import FrameSource  # Interface of the fake source
+
+
+class StubCore:
+    def new_stream(self):
+        return None
+
+    def analyze_frame(self, frame, stream):
+        return []
+
+
+class BlockingSource(FrameSource):
+    """Blocks in read() like a stream waiting to reconnect; stop() is optional."""
+
+    def __init__(self, interruptible):
+        super().__init__()
+        self.interruptible = interruptible
+        self.reading = threading.Event()
+        self.stopped = threading.Event()
+        self.released = False
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        self.reading.set()
+        self.stopped.wait(30)
+        return False, None
+
+    def stop(self):
+        if self.interruptible:
+            self.stopped.set()
+
+    def release(self):
+        self.released = True
+
+
+def start_scheduler(monkeypatch, source):
+    monkeypatch.setattr(multi_camera, 'open_source', lambda spec: source)
+    scheduler = multi_camera.MultiCameraScheduler(StubCore(), ['stream'])
+    scheduler.start()
+    assert source.reading.wait(5)
+    return scheduler
+
+
+def test_stop_interrupts_blocked_sources(monkeypatch):
+    source = BlockingSource(interruptible=True)
+    scheduler = start_scheduler(monkeypatch, source)
+    assert scheduler.stop(timeout=5) == []
+    assert source.released
+    assert scheduler.sources[0].finished
+
+
+def test_stop_gives_up_on_stuck_threads(monkeypatch, capsys):
+    source = BlockingSource(interruptible=False)
+    scheduler = start_scheduler(monkeypatch, source)
+    assert scheduler.stop(timeout=0.2) == ['capture-stream']
+    assert '[WARN]' in capsys.readouterr().out
+    source.stopped.set()  # Let the daemon thread finish
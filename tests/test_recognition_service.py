@@ -0,0 +1,66 @@
+# Import necessary libraries
+import json  # Request and response bodies
+import base64  # Images embedded in JSON requests
+import threading  # The test server runs on its own thread
+import urllib.request  # Client side of the API
+from http.server import ThreadingHTTPServer  # Server the handler is mounted on
+import cv2  # Encode the uploaded test image
+import numpy as np  # Synthetic image data
+import pytest  # Skip when the recognition dependencies are missing
+
+pytest.importorskip('face_recognition')  # Imported by face_core
+from recognition_service import RecognitionRequestHandler  # Handler under test
+
+
+class StubCore:
+    """Records the mark flag of every /identify call."""
+
+    def __init__(self):
+        self.marks = []
+
+    def identify(self, image, mark=False):
+        self.marks.append(mark)
+        return []
+
+
+@pytest.fixture
+def api():
+    core = StubCore()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RecognitionRequestHandler)
+    server.core = core
+    server.service = None
+    server.max_body_size = 1 << 20
+    server.verbose = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', core
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def post(url, body, content_type):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+IMAGE = cv2.imencode('.png', np.zeros((8, 8, 3), dtype=np.uint8))[1].tobytes()
+
+
+@pytest.mark.parametrize('value, expected', [(True, True), (1, True), ('true', True), (False, False), (None, False)])
+def test_identify_reads_mark_from_json(api, value, expected):
+    url, core = api
+    payload = {'image': base64.b64encode(IMAGE).decode()}
+    if value is not None:
+        payload['mark'] = value
+    assert post(f'{url}/identify', json.dumps(payload).encode(), 'application/json') == {'faces': []}
+    assert core.marks == [expected]
+
+
+@pytest.mark.parametrize('query, expected', [('mark=1', True), ('mark=true', True), ('mark=True', True),
+                                             ('mark=0', False), ('', False)])
+def test_identify_reads_mark_from_query_string(api, query, expected):
+    url, core = api
+    post(f'{url}/identify?{query}', IMAGE, 'image/png')
+    assert core.marks == [expected]